@@ -0,0 +1,364 @@
+"""
+RandomPitchPlayer 콜백 오디오 엔진
+하나의 연속 출력 스트림에서 음성/클릭/음 버퍼를 비트 일정의 정확한 샘플 위치에 믹싱
+
+타이머가 선행 버퍼의 다음 비트들을 미리 schedule_beat()로 넘기면, 엔진은 목표 시각을
+출력 프레임 번호로 바꿔 믹서에 등록하고 출력 콜백이 블록마다 해당 구간을 합성합니다.
+소리의 시작 위치는 tkinter 메인 루프나 after() 지연과 무관하게 샘플 단위로 정해집니다.
+
+backend:
+- "sounddevice": 실제 출력 스트림 (콜백 스레드에서 믹싱, 콜백마다 출력 시각 기준점 보정)
+- "buffer": 출력 장치 없이 render_blocks()로 직접 블록을 뽑는 테스트/오프라인 모드
+  (프레임 0 = start() 시각, 지연 0이므로 시작 위치를 샘플 단위로 검증 가능)
+"""
+import threading
+from clock_manager import get_clock
+from config import (AUDIO_BACKEND, AUDIO_SAMPLE_RATE, AUDIO_CHANNELS, AUDIO_BLOCK_SIZE, AUDIO_CLICK_ENABLED,
+                    ENABLE_CONSOLE_LOGS, RELEASE_MODE)
+
+# NumPy/sounddevice 임포트 (NumPy가 없으면 엔진 사용 불가, sounddevice가 없으면 buffer 모드만 가능)
+try:
+    import numpy as np
+    _numpy_available = True
+except ImportError:
+    _numpy_available = False
+
+try:
+    import sounddevice
+    _sounddevice_available = True
+except (ImportError, OSError):  # PortAudio 라이브러리가 없으면 OSError
+    _sounddevice_available = False
+
+
+def make_click(sample_rate, duration=0.015, frequency=2000.0, level=0.5):
+    """짧은 메트로놈 클릭 모노 버퍼 (지수 감쇠 사인파)"""
+    count = max(1, int(round(duration * sample_rate)))
+    t = np.arange(count) / sample_rate
+    click = level * np.sin(2.0 * np.pi * frequency * t) * np.exp(-t * 5.0 / duration)
+    return click.astype(np.float32)
+
+
+def to_frames(samples, channels):
+    """모노 버퍼를 (프레임 수, 채널 수) float32 배열로 변환 (이미 다채널이면 그대로)"""
+    samples = np.asarray(samples, dtype=np.float32)
+    if samples.ndim == 2 and samples.shape[1] == channels:
+        return samples
+    if samples.ndim == 2:
+        samples = samples.mean(axis=1)
+    return np.ascontiguousarray(np.repeat(samples[:, np.newaxis], channels, axis=1))
+
+
+def pcm16_to_frames(raw, source_channels, channels):
+    """16비트 인터리브 PCM 바이트를 (프레임 수, 채널 수) float32 배열로 변환"""
+    samples = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+    samples = samples[:len(samples) - len(samples) % source_channels].reshape(-1, source_channels)
+    return to_frames(samples, channels)
+
+
+def resample(frames, source_rate, target_rate):
+    """선형 보간 리샘플링 (클립 준비 시 한 번만 사용)"""
+    if source_rate == target_rate or len(frames) == 0:
+        return frames
+    count = max(1, int(round(len(frames) * target_rate / source_rate)))
+    positions = np.arange(count) * (source_rate / target_rate)
+    source_index = np.arange(len(frames))
+    if frames.ndim == 1:
+        return np.interp(positions, source_index, frames).astype(np.float32)
+    columns = [np.interp(positions, source_index, frames[:, channel]) for channel in range(frames.shape[1])]
+    return np.ascontiguousarray(np.stack(columns, axis=1), dtype=np.float32)
+
+
+def cached_pcm_source(get_raw, sample_rate, channels):
+    """get_raw(음정) → (PCM 바이트, 샘플레이트, 채널 수)를 엔진 형식으로 한 번만 변환해 두는 provider"""
+    cache = {}
+    
+    def provider(pitch):
+        frames = cache.get(pitch)
+        if frames is None:
+            clip = get_raw(pitch)
+            if clip is None:
+                return None
+            raw, source_rate, source_channels = clip
+            frames = resample(pcm16_to_frames(raw, source_channels, channels), source_rate, sample_rate)
+            cache[pitch] = frames
+        return frames
+    
+    provider.cache = cache
+    return provider
+
+
+class _Voice:
+    """믹서에 등록된 버퍼 하나 (start: 시작 프레임 번호)"""
+    
+    __slots__ = ('key', 'data', 'start', 'gain')
+    
+    def __init__(self, key, data, start, gain):
+        self.key = key
+        self.data = data
+        self.start = start
+        self.gain = gain
+
+
+class AudioMixer:
+    """절대 프레임 위치에 버퍼를 배치하고 블록 단위로 합성하는 믹서 (스레드 안전)"""
+    
+    def __init__(self, sample_rate=AUDIO_SAMPLE_RATE, channels=AUDIO_CHANNELS):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.position = 0  # 다음에 합성할 프레임 번호
+        self._voices = {}
+        self._lock = threading.Lock()
+        self.late_count = 0  # 등록 시점에 이미 시작 위치가 지나 있던 버퍼 수
+    
+    def add(self, key, data, start_frame, gain=1.0):
+        """버퍼 등록 (같은 키가 아직 시작 전이면 교체, 이미 재생 중이면 무시)
+        
+        시작 위치가 이미 지났으면 앞부분을 자르지 않고 다음 블록에서 바로 시작합니다.
+        """
+        with self._lock:
+            existing = self._voices.get(key)
+            if existing is not None and existing.start < self.position:
+                return False
+            if start_frame < self.position:
+                start_frame = self.position
+                self.late_count += 1
+            if existing is not None:
+                # 시각 재조정: 새 객체를 만들지 않고 제자리에서 교체
+                existing.data = data
+                existing.start = start_frame
+                existing.gain = gain
+            else:
+                self._voices[key] = _Voice(key, data, start_frame, gain)
+            return True
+    
+    def cancel(self, key):
+        """시작 전인 버퍼 취소"""
+        with self._lock:
+            voice = self._voices.get(key)
+            if voice is not None and voice.start >= self.position:
+                del self._voices[key]
+                return True
+            return False
+    
+    def cancel_from(self, frame):
+        """frame 이후에 시작하는 버퍼 모두 취소 (이미 재생 중인 버퍼는 끝까지 유지), 취소한 수 반환"""
+        with self._lock:
+            keys = [key for key, voice in self._voices.items() if voice.start >= max(frame, self.position)]
+            for key in keys:
+                del self._voices[key]
+            return len(keys)
+    
+    def clear(self):
+        """모든 버퍼 제거"""
+        with self._lock:
+            self._voices.clear()
+    
+    def render_into(self, out):
+        """out (프레임 수, 채널 수) 배열에 현재 위치부터의 블록 합성 후 위치 전진"""
+        out.fill(0.0)
+        frames = len(out)
+        with self._lock:
+            block_start = self.position
+            block_end = block_start + frames
+            finished = []
+            for voice in self._voices.values():
+                voice_end = voice.start + len(voice.data)
+                start = max(voice.start, block_start)
+                end = min(voice_end, block_end)
+                if start < end:
+                    segment = voice.data[start - voice.start:end - voice.start]
+                    if segment.ndim == 1:  # 모노 버퍼는 모든 채널에 동일하게
+                        segment = segment[:, np.newaxis]
+                    if voice.gain == 1.0:
+                        out[start - block_start:end - block_start] += segment
+                    else:
+                        out[start - block_start:end - block_start] += segment * voice.gain
+                if voice_end <= block_end:
+                    finished.append(voice.key)
+            for key in finished:
+                del self._voices[key]
+            self.position = block_end
+        np.clip(out, -1.0, 1.0, out=out)
+        return out
+    
+    def render(self, frames):
+        """새 배열에 블록 합성"""
+        return self.render_into(np.zeros((frames, self.channels), dtype=np.float32))
+    
+    def pending_count(self):
+        """등록되어 있는 (재생 중 포함) 버퍼 수"""
+        with self._lock:
+            return len(self._voices)
+
+
+class AudioEngine:
+    """비트 일정을 출력 프레임 위치로 바꿔 믹서에 등록하는 콜백 기반 오디오 엔진"""
+    
+    def __init__(self, clock=None, backend=AUDIO_BACKEND, sample_rate=AUDIO_SAMPLE_RATE,
+                 channels=AUDIO_CHANNELS, block_size=AUDIO_BLOCK_SIZE):
+        self.clock = clock or get_clock()
+        self.backend = backend
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.block_size = block_size
+        self.available = _numpy_available and (backend == "buffer" or _sounddevice_available)
+        
+        self.mixer = AudioMixer(sample_rate, channels) if _numpy_available else None
+        self.sources = []  # (이름, provider(음정) → 모노 또는 (프레임, 채널) 배열/None, lead(음정) → 앞당길 초/None)
+        self.stream = None
+        self.is_running = False
+        
+        # 출력 시각 기준점: 프레임 f가 들리는 시각 = time_offset + f / sample_rate
+        self.time_offset = 0.0
+        self._offset_initialized = False
+        self.offset_smoothing = 0.05
+        self.output_latency = 0.0
+        self.underrun_count = 0
+        
+        if not self.available and ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+            missing = "numpy" if not _numpy_available else "sounddevice"
+            print(f"[AUDIO] {missing} 라이브러리가 없어 콜백 오디오 엔진을 사용할 수 없음")
+        elif self.available and AUDIO_CLICK_ENABLED:
+            click = make_click(sample_rate)
+            self.add_source("click", lambda pitch: click)
+    
+    def add_source(self, name, provider, lead=None):
+        """비트마다 믹싱할 소스 추가 (provider(음정)은 미리 준비된 프레임 배열 또는 None 반환)
+        
+        lead(음정)이 주어지면 버퍼를 그만큼(초) 일찍 시작합니다 (음성 클립의 시작 여유를 비트 앞에 두기 위함).
+        """
+        self.sources = [source for source in self.sources if source[0] != name] + [(name, provider, lead)]
+    
+    def remove_source(self, name):
+        self.sources = [source for source in self.sources if source[0] != name]
+    
+    def warm_up(self, pitches):
+        """모든 소스의 버퍼를 미리 준비 (디코딩/리샘플링이 타이머 스레드의 첫 비트에서 일어나지 않도록), 준비된 버퍼 수 반환"""
+        count = 0
+        for pitch in pitches:
+            for _, provider, lead in self.sources:
+                if provider(pitch) is not None:
+                    count += 1
+                if lead is not None:
+                    lead(pitch)
+        return count
+    
+    def start(self):
+        """출력 시작 (buffer 모드는 현재 시각을 프레임 0으로 고정)"""
+        if self.is_running or not self.available:
+            return False
+        
+        self.mixer.clear()
+        self.mixer.position = 0
+        self.time_offset = self.clock.now()
+        self._offset_initialized = self.backend == "buffer"
+        
+        if self.backend == "sounddevice":
+            try:
+                self.stream = sounddevice.OutputStream(
+                    samplerate=self.sample_rate, channels=self.channels, dtype='float32',
+                    blocksize=self.block_size, latency='low', callback=self._callback
+                )
+                self.output_latency = self.stream.latency
+                self.stream.start()
+            except Exception as e:
+                if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+                    print(f"[AUDIO] 출력 스트림 열기 실패: {e}")
+                self.stream = None
+                self.available = False
+                return False
+        
+        self.is_running = True
+        if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+            print(f"[AUDIO] 오디오 엔진 시작 - {self.backend}, {self.sample_rate}Hz, 블록 {self.block_size}프레임")
+        return True
+    
+    def stop(self):
+        """출력 정지 및 예약된 버퍼 제거"""
+        self.is_running = False
+        if self.stream is not None:
+            try:
+                self.stream.stop()
+                self.stream.close()
+            except Exception as e:
+                if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+                    print(f"[AUDIO] 출력 스트림 정지 오류: {e}")
+            self.stream = None
+        if self.mixer is not None:
+            self.mixer.clear()
+    
+    def _callback(self, outdata, frames, time_info, status):
+        """출력 스트림 콜백 (오디오 스레드) - 블록 합성 및 출력 시각 기준점 보정"""
+        if status.output_underflow:
+            self.underrun_count += 1
+        
+        # 이번 블록 첫 프레임이 실제로 들리는 시각으로 기준점 갱신 (콜백 시각 흔들림은 평활화)
+        latency = time_info.outputBufferDacTime - time_info.currentTime
+        if latency <= 0:
+            latency = self.output_latency
+        measured = self.clock.now() + latency - self.mixer.position / self.sample_rate
+        if self._offset_initialized:
+            self.time_offset += self.offset_smoothing * (measured - self.time_offset)
+        else:
+            self.time_offset = measured
+            self._offset_initialized = True
+        
+        self.mixer.render_into(outdata)
+    
+    def time_to_frame(self, target_time):
+        """목표 시각에 소리가 들리도록 해야 하는 출력 프레임 번호"""
+        return int(round((target_time - self.time_offset) * self.sample_rate))
+    
+    def schedule_beat(self, sequence, pitch, target_time):
+        """비트 하나의 소스 버퍼들을 목표 시각 위치에 등록 (같은 비트를 다시 넘기면 시작 전일 때만 교체)"""
+        if not self.is_running:
+            return 0
+        start_frame = self.time_to_frame(target_time)
+        count = 0
+        for name, provider, lead in self.sources:
+            data = provider(pitch)
+            if data is None:
+                continue
+            frame = start_frame if lead is None else start_frame - int(round(lead(pitch) * self.sample_rate))
+            if self.mixer.add((sequence, name), data, frame):
+                count += 1
+        return count
+    
+    def clear(self):
+        """예약된 모든 버퍼 제거 (재생 정지 시)"""
+        if self.mixer is not None:
+            self.mixer.clear()
+    
+    def render_blocks(self, count):
+        """buffer 모드에서 블록 count개를 합성해 하나의 배열로 반환 (테스트/오프라인용)"""
+        blocks = [self.mixer.render(self.block_size) for _ in range(count)]
+        return np.concatenate(blocks) if blocks else np.zeros((0, self.channels), dtype=np.float32)
+    
+    def render_until(self, end_time):
+        """buffer 모드에서 end_time까지의 출력을 블록 단위로 합성해 반환"""
+        end_frame = self.time_to_frame(end_time)
+        remaining = max(0, end_frame - self.mixer.position)
+        return self.render_blocks(-(-remaining // self.block_size))
+    
+    def get_status(self):
+        """상태 정보 (디버그 출력용)"""
+        return {
+            'backend': self.backend,
+            'running': self.is_running,
+            'position': self.mixer.position if self.mixer is not None else 0,
+            'pending': self.mixer.pending_count() if self.mixer is not None else 0,
+            'late': self.mixer.late_count if self.mixer is not None else 0,
+            'underruns': self.underrun_count,
+            'output_latency_ms': self.output_latency * 1000.0
+        }
+
+
+# 전역 오디오 엔진 인스턴스
+_audio_engine_instance = None
+
+def get_audio_engine():
+    """오디오 엔진 싱글톤 인스턴스 반환"""
+    global _audio_engine_instance
+    if _audio_engine_instance is None:
+        _audio_engine_instance = AudioEngine()
+    return _audio_engine_instance
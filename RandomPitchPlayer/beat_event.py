@@ -0,0 +1,74 @@
+"""
+RandomPitchPlayer 비트 이벤트
+타이머 → UI 경로에서 재사용하는 고정 필드 비트 이벤트와 이벤트 풀
+
+비트마다 새 객체(namedtuple/dict)를 만들지 않고 풀에서 꺼내 값을 채운 뒤,
+마지막 소비자가 release()로 돌려줍니다. 돌려주지 않은 이벤트는 일반 객체처럼
+가비지 컬렉션되므로 release 누락은 성능에만 영향을 줍니다.
+"""
+from config import BEAT_EVENT_POOL_SIZE
+
+
+class BeatEvent:
+    """비트 하나의 음정/색상/목표 시각 (next_pitch: 다음 비트 음정 미리보기용)"""
+    
+    __slots__ = ('pitch', 'color', 'target_time', 'sequence', 'next_pitch', 'request_time',
+                 '_pool', '_pooled')
+    
+    def __init__(self, pool=None):
+        self.pitch = None
+        self.color = None
+        self.target_time = 0.0
+        self.sequence = 0
+        self.next_pitch = None
+        self.request_time = 0.0  # UI 출력 요청 시각 (렌더링 대기 측정용)
+        self._pool = pool
+        self._pooled = False
+    
+    def release(self):
+        """이벤트를 풀에 반환 (이후 이 객체를 참조하면 안 됨)"""
+        if self._pool is not None and not self._pooled:
+            self._pool.release(self)
+    
+    def __repr__(self):
+        return (f"BeatEvent(pitch={self.pitch!r}, target_time={self.target_time:.6f}, "
+                f"sequence={self.sequence}, next_pitch={self.next_pitch!r})")
+
+
+class BeatEventPool:
+    """미리 할당한 비트 이벤트를 재사용하는 풀 (타이머 스레드와 UI 스레드에서 동시 사용 가능)"""
+    
+    def __init__(self, size=BEAT_EVENT_POOL_SIZE):
+        self.size = size
+        self._free = [BeatEvent(self) for _ in range(size)]
+        for event in self._free:
+            event._pooled = True
+        self.allocated_count = 0  # 풀이 비어 새로 만든 이벤트 수
+    
+    def acquire(self, pitch, color, target_time, sequence, next_pitch):
+        """풀에서 이벤트를 꺼내 값 설정 (풀이 비었으면 새로 생성)"""
+        try:
+            # list.pop/append는 GIL 하에서 원자적이므로 별도 잠금 없이 사용
+            event = self._free.pop()
+        except IndexError:
+            event = BeatEvent(self)
+            self.allocated_count += 1
+        
+        event._pooled = False
+        event.pitch = pitch
+        event.color = color
+        event.target_time = target_time
+        event.sequence = sequence
+        event.next_pitch = next_pitch
+        event.request_time = 0.0
+        return event
+    
+    def release(self, event):
+        """이벤트 반환 (풀이 가득 차 있으면 버림)"""
+        event._pooled = True
+        if len(self._free) < self.size:
+            self._free.append(event)
+    
+    def available(self):
+        """풀에 남아 있는 이벤트 수"""
+        return len(self._free)
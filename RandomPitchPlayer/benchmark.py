@@ -0,0 +1,533 @@
+"""
+RandomPitchPlayer 성능 측정 도구
+타이밍 코어를 UI 없이 측정하는 벤치마크 모음
+
+사용법:
+    python benchmark.py simulate --bpm 300 --minutes 60
+    python benchmark.py multi --sessions 1,10,50,200 --seconds 10
+    python benchmark.py events --beats 1000000
+    python benchmark.py render --beats 300 --font-size 400   (디스플레이 필요)
+    python benchmark.py tts-call --repeats 200                (pygame 필요, SDL_AUDIODRIVER=dummy면 장치 없이 실행)
+    python benchmark.py audio --seconds 30 --bpm 300          (콜백 오디오 엔진 샘플 위치 검증, numpy 필요)
+    python benchmark.py calibrate --delay-ms 45               (지연 측정 검증, 녹음 장치 대신 WAV 파일 사용)
+"""
+import argparse
+import gc
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from collections import namedtuple
+
+from beat_event import BeatEventPool
+from clock_manager import MonotonicClock, VirtualClock
+from debug_manager import DebugManager
+from pitch_selector import PitchSelector
+from session_scheduler import SessionScheduler
+from timer_manager import TimerManager
+from timing_utils import TimingUtils
+from tempo_map import TempoMap
+
+
+def _quiet_debug_manager(clock):
+    """콘솔 출력을 끈 디버그 매니저 생성"""
+    debug_manager = DebugManager(clock=clock)
+    debug_manager.debug_mode = False
+    debug_manager.enable_logs = False
+    return debug_manager
+
+
+def simulate_session(bpm, minutes, program=None):
+    """가상 시계로 세션 전체를 빨리 감기 실행 (program: 템포 프로그램 표기)"""
+    clock = VirtualClock()
+    ui_queue = queue.Queue()
+    timer_manager = TimerManager(ui_queue, _quiet_debug_manager(clock), PitchSelector(),
+                                 scheduler_mode="precise", clock=clock)
+    
+    interval = 60.0 / bpm
+    tempo_map = TempoMap.from_spec(program) if program else TempoMap.constant(interval)
+    end_time = clock.now() + minutes * 60
+    
+    wall_start = time.perf_counter()
+    beats = timer_manager.run_until(end_time, interval, tempo_map)
+    wall_elapsed = time.perf_counter() - wall_start
+    
+    # 마지막 비트의 목표 시각 오차 확인
+    last_target = None
+    while not ui_queue.empty():
+        entry = ui_queue.get_nowait()
+        last_target = entry.target_time
+        entry.release()
+    
+    if program:
+        print(f"[SIM] 템포 프로그램 '{program}', {minutes}분 세션")
+    else:
+        print(f"[SIM] {bpm} BPM ({TimingUtils.get_bpm_description(bpm)}), {minutes}분 세션")
+    print(f"  비트 수: {beats}회")
+    print(f"  가상 경과 시간: {clock.now():.3f}초")
+    if last_target is not None:
+        print(f"  마지막 비트 목표시각: {last_target:.6f}초 (이론값: {tempo_map.beat_time(beats):.6f}초)")
+    print(f"  실제 소요 시간: {wall_elapsed:.3f}초 ({minutes * 60 / max(wall_elapsed, 1e-9):.0f}배속)")
+    return wall_elapsed
+
+
+def measure_multi_session(session_count, seconds, bpm, spread=0.5, worker_count=0):
+    """실제 시계로 여러 세션을 하나의 스케줄러에서 구동하고 출력 지연 측정
+    
+    세션마다 bpm ± spread 비율 범위의 템포와 서로 다른 시작 시각을 사용합니다.
+    """
+    clock = MonotonicClock()
+    lateness_ns = []
+    lateness_lock = threading.Lock()
+    
+    def on_beat(session_id, entry):
+        lateness = clock.now_ns() - int(entry.target_time * 1e9)
+        entry.release()
+        with lateness_lock:
+            lateness_ns.append(lateness)
+    
+    scheduler = SessionScheduler(on_beat=on_beat, clock=clock, worker_count=worker_count)
+    rng = random.Random(session_count)
+    base_interval = 60.0 / bpm
+    start_time = clock.now() + 0.1
+    for index in range(session_count):
+        session_bpm = bpm * rng.uniform(1.0 - spread, 1.0 + spread)
+        scheduler.add_session(index, 60.0 / session_bpm,
+                              start_time=start_time + rng.uniform(0.0, base_interval))
+    
+    threads_before = threading.active_count()
+    scheduler.start()
+    threads_running = threading.active_count()
+    time.sleep(seconds)
+    scheduler.shutdown()
+    
+    stats = TimingUtils.summarize_lateness(lateness_ns)
+    if stats is None:
+        return None
+    return {
+        'sessions': session_count,
+        'beats': stats['count'],
+        'mean_ms': stats['mean_ms'],
+        'std_ms': stats['std_ms'],
+        'p99_ms': stats['p99_ms'],
+        'max_ms': stats['max_ms'],
+        'wakeups': scheduler.waiter.wakeup_count,
+        'threads': threads_running - threads_before
+    }
+
+
+def multi_session_benchmark(session_counts, seconds, bpm, worker_count=0):
+    """세션 수 증가에 따른 지터 변화 측정"""
+    print(f"[MULTI] 기준 {bpm} BPM (±50%), 측정 {seconds}초, 작업자 {worker_count}개")
+    print(f"  {'세션':>6} {'비트':>8} {'평균ms':>8} {'표준편차':>8} {'p99ms':>8} {'최대ms':>8} {'깨어남':>8} {'스레드':>6}")
+    results = []
+    for session_count in session_counts:
+        result = measure_multi_session(session_count, seconds, bpm, worker_count=worker_count)
+        if result is None:
+            print(f"  {session_count:>6} 측정된 비트 없음")
+            continue
+        results.append(result)
+        print(f"  {result['sessions']:>6} {result['beats']:>8} {result['mean_ms']:>8.3f} "
+              f"{result['std_ms']:>8.3f} {result['p99_ms']:>8.3f} {result['max_ms']:>8.3f} "
+              f"{result['wakeups']:>8} {result['threads']:>6}")
+    return results
+
+
+def _count_gc_collections(func, *args):
+    """func 실행 중 발생한 세대별 가비지 컬렉션 횟수와 소요 시간 측정 (func 반환값도 함께 반환)"""
+    collections = [0, 0, 0]
+    
+    def on_gc(phase, info):
+        if phase == "start":
+            collections[info["generation"]] += 1
+    
+    gc.collect()
+    gc.callbacks.append(on_gc)
+    try:
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+    finally:
+        gc.callbacks.remove(on_gc)
+    return elapsed, collections, result
+
+
+def _legacy_event_path(beat_count):
+    """이전 방식: 비트마다 namedtuple 항목과 렌더링 대기용 dict 생성 (생성한 객체 수 반환)"""
+    Entry = namedtuple('Entry', ['pitch', 'color', 'target_time', 'sequence', 'next_pitch'])
+    ui_queue = queue.SimpleQueue()
+    pending_updates = {}
+    for sequence in range(beat_count):
+        ui_queue.put(Entry("C", "red", sequence * 0.2, sequence, "D"))
+        entry = ui_queue.get()
+        pending_updates[entry.sequence] = {
+            'pitch': entry.pitch,
+            'color': entry.color,
+            'target_time': entry.target_time,
+            'request_time': 0.0
+        }
+        del pending_updates[entry.sequence]
+    return beat_count * 2
+
+
+def _pooled_event_path(beat_count):
+    """현재 방식: 풀에서 꺼낸 BeatEvent를 그대로 전달하고 처리 후 반환 (풀 밖에서 생성한 객체 수 반환)"""
+    pool = BeatEventPool()
+    ui_queue = queue.SimpleQueue()
+    pending_updates = {}
+    for sequence in range(beat_count):
+        ui_queue.put(pool.acquire("C", "red", sequence * 0.2, sequence, "D"))
+        entry = ui_queue.get()
+        entry.request_time = 0.0
+        pending_updates[entry.sequence] = entry
+        pending_updates.pop(entry.sequence).release()
+    return pool.allocated_count
+
+
+def event_allocation_benchmark(beat_count):
+    """타이머→UI 비트 이벤트 경로의 할당/GC 비교"""
+    print(f"[EVENTS] 비트 {beat_count}회 (300 BPM 기준 {beat_count / 300 / 60:.1f}시간)")
+    for name, path in (("namedtuple+dict", _legacy_event_path), ("BeatEvent 풀", _pooled_event_path)):
+        elapsed, collections, created = _count_gc_collections(path, beat_count)
+        print(f"  {name:<16} {elapsed * 1e9 / beat_count:8.1f} ns/비트, 비트당 객체 생성 {created / beat_count:g}개, "
+              f"GC 횟수 (0/1/2세대): {collections[0]}/{collections[1]}/{collections[2]}")
+
+
+def _render_beats(root, show, beats, bpm):
+    """비트마다 show(음정, 색상) 후 update_idletasks까지 걸린 시간(나노초) 측정 (BPM 간격으로 진행)"""
+    from config import SCALES, SCALE_COLORS
+    costs = []
+    interval_ms = max(1, int(round(60000.0 / bpm)))
+    
+    def step(index=0):
+        if index >= beats:
+            root.quit()
+            return
+        pitch = SCALES[index % len(SCALES)]
+        start = time.perf_counter_ns()
+        show(pitch, SCALE_COLORS[pitch])
+        root.update_idletasks()
+        costs.append(time.perf_counter_ns() - start)
+        root.after(interval_ms, step, index + 1)
+    
+    root.after(interval_ms, step)
+    root.mainloop()
+    return costs
+
+
+def render_benchmark(beats, bpm, font_size):
+    """Label 방식과 캔버스 글리프 캐시 방식의 비트당 렌더링 비용 비교"""
+    import tkinter as tk
+    import tkinter.font as tkFont
+    from pitch_canvas import PitchGlyphCanvas
+    
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"[RENDER] 디스플레이를 열 수 없습니다: {e}")
+        return None
+    root.geometry("1280x800")
+    
+    results = {}
+    try:
+        # 기존 방식: 큰 폰트 Label 텍스트 변경
+        label_font = tkFont.Font(family="Arial", size=font_size, weight="bold")
+        label = tk.Label(root, text="준비", font=label_font)
+        label.pack(expand=True)
+        root.update()
+        results['label'] = _render_beats(root, lambda pitch, color: label.config(text=pitch, fg=color), beats, bpm)
+        label.destroy()
+        
+        # 캔버스 방식: 미리 만든 글리프 표시 전환
+        glyph_canvas = PitchGlyphCanvas(root, "Arial", font_size)
+        glyph_canvas.pack(expand=True, fill=tk.BOTH)
+        root.update()
+        results['canvas'] = _render_beats(root, glyph_canvas.show_pitch, beats, bpm)
+    finally:
+        root.destroy()
+    
+    print(f"[RENDER] {bpm} BPM, 비트 {beats}회, 폰트 크기 {font_size}")
+    for mode, costs in results.items():
+        costs.sort()
+        count = len(costs)
+        print(f"  {mode:<7} 평균 {sum(costs) / count / 1000:8.1f}us, "
+              f"p99 {costs[min(count - 1, int(count * 0.99))] / 1000:8.1f}us, 최대 {costs[-1] / 1000:8.1f}us")
+    return results
+
+
+class _PlayProbe:
+    """채널의 play() 호출 시각을 기록하는 대리 객체 (나머지 메소드는 원래 채널로 전달)"""
+    
+    def __init__(self, channel, marks):
+        self.channel = channel
+        self.marks = marks
+    
+    def play(self, *args, **kwargs):
+        self.marks.append(time.perf_counter_ns())
+        return self.channel.play(*args, **kwargs)
+    
+    def __getattr__(self, name):
+        return getattr(self.channel, name)
+
+
+def _time_calls(func, pitches, repeats, stop, marks):
+    """func(음정) 호출 시간과 호출부터 재생 시작(marks에 기록된 play() 시각)까지의 시간(나노초) 측정
+    
+    호출마다 stop()으로 재생을 정지하며, 정지 시간은 제외합니다.
+    """
+    costs = []
+    to_play = []
+    for index in range(repeats):
+        pitch = pitches[index % len(pitches)]
+        del marks[:]
+        start = time.perf_counter_ns()
+        func(pitch)
+        costs.append(time.perf_counter_ns() - start)
+        if marks:
+            to_play.append(marks[0] - start)
+        stop()
+    return costs, to_play
+
+
+def tts_call_benchmark(repeats):
+    """메인 스레드 음성 안내 호출 비용 비교 (파일 로드+디코딩 vs 미리 디코딩한 Sound 재생)
+    
+    호출 전체 시간과 호출부터 channel.play()/music.play()가 불리기까지의 시간을 따로 측정합니다.
+    오디오 장치가 없어도 SDL_AUDIODRIVER=dummy로 실행할 수 있습니다 (출력 장치 지연은 포함되지 않음).
+    """
+    from config import SCALES
+    from tts_manager import TTSManager
+    
+    manager = TTSManager()
+    if not manager.is_tts_available():
+        print("[TTS-CALL] pygame 또는 오디오 장치를 사용할 수 없습니다 (장치 없이 측정하려면 SDL_AUDIODRIVER=dummy)")
+        return None
+    import pygame
+    
+    marks = []
+    music_play = pygame.mixer.music.play
+    
+    def probed_music_play(*args, **kwargs):
+        marks.append(time.perf_counter_ns())
+        return music_play(*args, **kwargs)
+    
+    channels = manager.channels
+    manager.channels = [_PlayProbe(channel, marks) for channel in channels]
+    pygame.mixer.music.play = probed_music_play
+    
+    try:
+        pitches = [pitch for pitch in SCALES if manager.wait_until_ready(pitch, timeout=30.0)]
+        if not pitches:
+            print("[TTS-CALL] 준비된 음성 클립이 없습니다")
+            return None
+        
+        def stop():
+            for channel in channels:
+                channel.stop()
+            pygame.mixer.music.stop()
+        
+        results = {
+            'music.load': _time_calls(lambda pitch: manager._play_music_file(manager.audio_cache[pitch]),
+                                      pitches, repeats, stop, marks),
+            'Sound': _time_calls(manager._play_clip, pitches, repeats, stop, marks),
+        }
+        decoded = sum(1 for pitch in pitches if pitch in manager.sound_cache)
+    finally:
+        pygame.mixer.music.play = music_play
+        manager.channels = channels
+        manager.cleanup()
+    
+    print(f"[TTS-CALL] 호출 {repeats}회, 클립 {len(pitches)}개 (메모리 디코딩 {decoded}개), "
+          f"SDL 오디오 드라이버 {os.environ.get('SDL_AUDIODRIVER', '기본')}")
+    for mode, (costs, to_play) in results.items():
+        for label, values in (("호출 전체", costs), ("재생 시작까지", to_play)):
+            if not values:
+                continue
+            values.sort()
+            count = len(values)
+            print(f"  {mode:<10} {label:<7} 평균 {sum(values) / count / 1000:8.1f}us, "
+                  f"p99 {values[min(count - 1, int(count * 0.99))] / 1000:8.1f}us, 최대 {values[-1] / 1000:8.1f}us")
+    return results
+
+
+def audio_schedule_check(seconds, bpm, program=None, block_size=256):
+    """콜백 오디오 엔진을 buffer 모드 + 가상 시계로 실행하여 비트 시작 위치를 샘플 단위로 검증
+    
+    비트마다 1샘플 임펄스를 믹싱하고, 타이머가 UI 큐에 비트를 넣을 때마다 그 시각까지 출력을
+    합성합니다 (실시간 콜백이 시계를 따라가는 상황과 같음). 합성된 버퍼에서 찾은 임펄스 위치를
+    목표 시각으로 계산한 프레임 번호와 비교합니다.
+    """
+    from audio_engine import AudioEngine, _numpy_available
+    if not _numpy_available:
+        print("[AUDIO] numpy가 없어 검증할 수 없습니다")
+        return None
+    import numpy as np
+    
+    clock = VirtualClock()
+    engine = AudioEngine(clock=clock, backend="buffer", channels=1, block_size=block_size)
+    engine.sources = []
+    impulse = np.ones(1, dtype=np.float32)
+    engine.add_source("impulse", lambda pitch: impulse)
+    
+    blocks = []
+    targets = []
+    
+    class RenderingQueue(queue.Queue):
+        """비트가 발행될 때마다 현재 시각까지 출력 합성 (실시간 출력 콜백 흉내)"""
+        
+        def put(self, entry, block=True, timeout=None):
+            targets.append(entry.target_time)
+            blocks.append(engine.render_until(clock.now()))
+            entry.release()
+    
+    timer_manager = TimerManager(RenderingQueue(), _quiet_debug_manager(clock), PitchSelector(),
+                                 scheduler_mode="precise", clock=clock, audio_engine=engine)
+    interval = 60.0 / bpm
+    tempo_map = TempoMap.from_spec(program) if program else TempoMap.constant(interval)
+    end_time = clock.now() + seconds
+    
+    engine.start()
+    wall_start = time.perf_counter()
+    timer_manager.run_until(end_time, interval, tempo_map)
+    engine.clear()  # 종료 시각 이후로 미리 예약된 비트 제거 (정지 시와 동일)
+    blocks.append(engine.render_until(end_time))
+    wall_elapsed = time.perf_counter() - wall_start
+    
+    output = np.concatenate(blocks)[:, 0]
+    onsets = np.flatnonzero(output > 0.5)
+    expected = np.array([engine.time_to_frame(target) for target in targets])
+    count = min(len(onsets), len(expected))
+    errors = onsets[:count] - expected[:count]
+    
+    print(f"[AUDIO] {seconds}초 세션, 비트 {len(targets)}회, 블록 {block_size}프레임, {engine.sample_rate}Hz")
+    print(f"  검출된 시작 위치: {len(onsets)}개 (예상 {len(expected)}개), 늦게 예약된 비트: {engine.mixer.late_count}개")
+    if count:
+        print(f"  시작 위치 오차: 최대 {int(np.abs(errors).max())}샘플, 평균 {float(errors.mean()):.3f}샘플")
+    print(f"  실제 소요 시간: {wall_elapsed:.3f}초 ({seconds / max(wall_elapsed, 1e-9):.0f}배속)")
+    if len(onsets) != len(expected):
+        print("[AUDIO] 검출된 시작 위치 수가 비트 수와 다릅니다")
+        return None
+    return errors
+
+
+def calibration_check(delay_ms, noise=0.05, wav_path=None, sample_rate=22050):
+    """WAV 파일을 녹음 장치 대신 사용하여 출력 지연 측정 검증
+    
+    wav_path가 없으면 클릭 트레인을 delay_ms만큼 늦추고 잡음과 반사음을 섞은 녹음을 만들어 씁니다.
+    같은 지연에 사람의 반응 흔들림(표준편차 20ms)을 더한 탭 측정 결과도 함께 출력합니다.
+    """
+    import latency_calibration
+    if not latency_calibration._numpy_available:
+        print("[CALIB] numpy가 없어 검증할 수 없습니다")
+        return None
+    import os
+    import tempfile
+    import numpy as np
+    from clip_processing import write_wav
+    
+    calibrator = latency_calibration.LatencyCalibrator(clock=VirtualClock(), sample_rate=sample_rate)
+    temp_path = None
+    if wav_path is None:
+        train, _ = latency_calibration.make_click_train(sample_rate, calibrator.clicks, calibrator.period)
+        delay = int(round(delay_ms / 1000.0 * sample_rate))
+        echo = int(0.013 * sample_rate)
+        captured = np.zeros(len(train) + delay + echo + sample_rate // 2, dtype=np.float32)
+        captured[delay:delay + len(train)] += 0.5 * train
+        captured[delay + echo:delay + echo + len(train)] += 0.2 * train  # 벽 반사음
+        captured += noise * np.random.default_rng(1).standard_normal(len(captured)).astype(np.float32)
+        fd, temp_path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        write_wav(temp_path, captured, sample_rate)
+        wav_path = temp_path
+    
+    try:
+        result = calibrator.measure_audio(latency_calibration.WavCapture(wav_path), play_audio=False)
+    finally:
+        if temp_path is not None:
+            os.remove(temp_path)
+    
+    targets = calibrator.tap_targets(0.0)
+    rng = random.Random(2)
+    taps = [target + delay_ms / 1000.0 + rng.gauss(0.0, 0.02) for target in targets]
+    tap_result = calibrator.measure_taps(targets, taps)
+    
+    error_ms = (result['latency'] * 1000.0) - delay_ms
+    print(f"[CALIB] 루프백 (WAV): 추정 {result['latency'] * 1000:.2f}ms, 실제 {delay_ms:.2f}ms, "
+          f"오차 {error_ms:+.3f}ms, 신뢰도 {result['confidence']:.1f}")
+    if tap_result is not None:
+        print(f"[CALIB] 탭 (흔들림 20ms): 추정 {tap_result['latency'] * 1000:.2f}ms, 탭 {tap_result['taps']}회, "
+              f"편차 {tap_result['spread'] * 1000:.1f}ms")
+    return error_ms
+
+
+def main(argv=None):
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="RandomPitchPlayer 성능 측정 도구")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    simulate_parser = subparsers.add_parser("simulate", help="가상 시계로 세션 빨리 감기")
+    simulate_parser.add_argument("--bpm", type=float, default=300)
+    simulate_parser.add_argument("--minutes", type=float, default=60)
+    simulate_parser.add_argument("--program", default=None, help="템포 프로그램 (예: \"60->180@5m, 180@2m\")")
+    
+    multi_parser = subparsers.add_parser("multi", help="다중 세션 스케줄러 지터 측정")
+    multi_parser.add_argument("--sessions", default="1,10,50,200", help="세션 수 목록 (쉼표 구분)")
+    multi_parser.add_argument("--seconds", type=float, default=10)
+    multi_parser.add_argument("--bpm", type=float, default=120)
+    multi_parser.add_argument("--workers", type=int, default=0, help="콜백 작업자 풀 크기 (0=타이머 스레드에서 처리)")
+    
+    events_parser = subparsers.add_parser("events", help="비트 이벤트 할당/GC 마이크로벤치마크")
+    events_parser.add_argument("--beats", type=int, default=1000000)
+    
+    render_parser = subparsers.add_parser("render", help="음정 표시 방식별 렌더링 비용 비교 (디스플레이 필요)")
+    render_parser.add_argument("--beats", type=int, default=300)
+    render_parser.add_argument("--bpm", type=float, default=300)
+    render_parser.add_argument("--font-size", type=int, default=400)
+    
+    tts_parser = subparsers.add_parser("tts-call", help="메인 스레드 음성 안내 호출 비용 비교 (오디오 장치 필요)")
+    tts_parser.add_argument("--repeats", type=int, default=200)
+    
+    audio_parser = subparsers.add_parser("audio", help="콜백 오디오 엔진 비트 시작 위치 샘플 단위 검증")
+    audio_parser.add_argument("--seconds", type=float, default=30)
+    audio_parser.add_argument("--bpm", type=float, default=300)
+    audio_parser.add_argument("--program", default=None, help="템포 프로그램 (예: \"60->180@5m, 180@2m\")")
+    audio_parser.add_argument("--block-size", type=int, default=256)
+    
+    calibrate_parser = subparsers.add_parser("calibrate", help="출력 지연 측정 검증 (녹음 장치 대신 WAV 파일 사용)")
+    calibrate_parser.add_argument("--delay-ms", type=float, default=45.0, help="합성 녹음에 넣을 지연 (밀리초)")
+    calibrate_parser.add_argument("--noise", type=float, default=0.05, help="합성 녹음 잡음 크기")
+    calibrate_parser.add_argument("--wav", default=None, help="합성 대신 사용할 녹음 WAV 파일 (재생 시작과 동시에 녹음 시작)")
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == "simulate":
+        simulate_session(args.bpm, args.minutes, args.program)
+    elif args.command == "multi":
+        session_counts = [int(value) for value in args.sessions.split(",") if value.strip()]
+        multi_session_benchmark(session_counts, args.seconds, args.bpm, args.workers)
+    elif args.command == "events":
+        event_allocation_benchmark(args.beats)
+    elif args.command == "render":
+        if render_benchmark(args.beats, args.bpm, args.font_size) is None:
+            return 1
+    elif args.command == "tts-call":
+        if tts_call_benchmark(args.repeats) is None:
+            return 1
+    elif args.command == "audio":
+        errors = audio_schedule_check(args.seconds, args.bpm, args.program, args.block_size)
+        if errors is None or len(errors) == 0 or errors.any():
+            return 1
+    elif args.command == "calibrate":
+        error_ms = calibration_check(args.delay_ms, args.noise, args.wav)
+        if error_ms is None or (args.wav is None and abs(error_ms) > 1.0):
+            return 1
+    else:
+        parser.print_help()
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
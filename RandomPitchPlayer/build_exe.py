@@ -24,6 +24,7 @@ APP_NAME = "RandomPitchPlayer"
 APP_VERSION = "1.0"
 MAIN_SCRIPT = "main.py"
 ICON_FILE = "icon.ico"  # 아이콘 파일 (선택사항)
+VOICE_PACK_FILE = "voices.rpvp"  # 음성 팩 (config의 VOICE_PACK_FILE과 같아야 함, 없으면 빌드 전에 생성)
 
 # 빌드 디렉토리
 BUILD_DIR = "build"
@@ -106,6 +107,22 @@ def create_icon():
         print(f"✅ 아이콘 파일: {ICON_FILE}")
         return ICON_FILE
 
+def prepare_voice_pack():
+    """EXE에 포함할 음성 팩 준비 (없으면 voice_pack.py로 생성, 실패해도 빌드는 계속)"""
+    if os.path.exists(VOICE_PACK_FILE):
+        print(f"✅ 음성 팩: {VOICE_PACK_FILE}")
+        return VOICE_PACK_FILE
+    
+    print(f"🔊 음성 팩 '{VOICE_PACK_FILE}' 생성 중...")
+    try:
+        subprocess.run([sys.executable, 'voice_pack.py', 'build', '--output', VOICE_PACK_FILE], check=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"⚠️  음성 팩 생성 실패: {e}")
+        print("   음성 팩 없이 빌드합니다 (첫 실행 시 음성 합성)")
+        return None
+    print(f"✅ 음성 팩 생성 완료: {VOICE_PACK_FILE}")
+    return VOICE_PACK_FILE
+
 def build_exe():
     """PyInstaller를 사용하여 EXE 파일 빌드"""
     print("🔨 EXE 파일 빌드 시작...")
@@ -137,6 +154,11 @@ def build_exe():
         '--noconsole',  # 콘솔 창 완전히 숨김
     ])
     
+    # 음성 팩 포함 (시작 시 음성 합성/디코딩 없이 바로 사용)
+    pack_path = prepare_voice_pack()
+    if pack_path:
+        cmd.extend(['--add-data', f'{pack_path};.'])
+    
     # 메인 스크립트 추가
     cmd.append(MAIN_SCRIPT)
     
@@ -0,0 +1,149 @@
+"""
+RandomPitchPlayer 음성 클립 전처리
+디코딩한 음성 클립(16비트 PCM)을 NumPy로 가공하는 함수 모음
+
+- time_compress: 음높이를 유지한 채 클립을 빠르게 만드는 WSOLA 시간 압축
+  (프레임마다 자연스럽게 이어지는 위치를 상호상관으로 찾아 겹쳐 더하므로 목소리 톤이 변하지 않음)
+- speed_bucket: 클립 길이와 비트 간격으로 필요한 속도 단계 선택
+- trim_silence: 합성 엔진이 붙이는 앞뒤 무음을 잘라내고 음성 시작 위치(온셋)를 구함
+  (프레임별 RMS를 한 번에 계산해 최대 대비 임계값을 넘는 첫/마지막 프레임을 찾음)
+
+모든 처리는 재생 전에 한 번만 수행하고 결과는 클립 저장소에 캐시합니다.
+"""
+import wave
+from config import (TTS_WSOLA_FRAME_MS, TTS_WSOLA_TOLERANCE_MS, TTS_TRIM_THRESHOLD_DB, TTS_TRIM_LEAD_MS,
+                    TTS_TRIM_FADE_MS)
+
+# NumPy 임포트 (없으면 클립 전처리만 비활성화)
+try:
+    import numpy as np
+    _numpy_available = True
+except ImportError:
+    _numpy_available = False
+
+
+def is_available():
+    """클립 전처리 사용 가능 여부 (NumPy 필요)"""
+    return _numpy_available
+
+
+def pcm16_to_mono(raw, channels):
+    """16비트 인터리브 PCM 바이트를 float32 모노 버퍼(-1.0 ~ 1.0)로 변환"""
+    samples = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+    samples = samples[:len(samples) - len(samples) % channels]
+    return samples.reshape(-1, channels).mean(axis=1)
+
+
+def mono_to_pcm16(samples, channels):
+    """float32 모노 버퍼를 16비트 인터리브 PCM 바이트로 변환 (채널 수만큼 복제)"""
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+    if channels > 1:
+        pcm = np.repeat(pcm[:, np.newaxis], channels, axis=1)
+    return np.ascontiguousarray(pcm).tobytes()
+
+
+def write_wav(path, samples, sample_rate, channels=1):
+    """float32 모노 버퍼를 16비트 WAV 파일로 기록"""
+    with wave.open(path, 'wb') as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(mono_to_pcm16(samples, channels))
+
+
+def time_compress(samples, speed, sample_rate, frame_ms=TTS_WSOLA_FRAME_MS, tolerance_ms=TTS_WSOLA_TOLERANCE_MS):
+    """WSOLA 시간 압축 (speed배 빠르게, 음높이 유지) - float32 모노 버퍼 반환
+    
+    출력은 고정 간격(프레임 절반)으로 한 닝 창 프레임씩 겹쳐 더하고, 입력은 speed배 간격으로 읽되
+    ±tolerance 범위에서 직전 프레임의 자연스러운 연장과 상호상관이 가장 큰 위치를 골라 위상을 맞춥니다.
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    if speed == 1.0 or len(samples) == 0:
+        return samples.copy()
+    
+    frame = max(2, int(sample_rate * frame_ms / 1000) // 2 * 2)
+    hop_out = frame // 2
+    hop_in = hop_out * speed
+    tolerance = int(sample_rate * tolerance_ms / 1000)
+    window = np.hanning(frame).astype(np.float32)
+    
+    output_length = int(len(samples) / speed)
+    frame_count = output_length // hop_out + 1
+    
+    # 탐색 범위가 버퍼 밖으로 나가지 않도록 앞뒤를 0으로 채움
+    padding = tolerance + frame + int(hop_in) + 1
+    padded = np.concatenate([np.zeros(tolerance, dtype=np.float32), samples,
+                             np.zeros(padding, dtype=np.float32)])
+    output = np.zeros(frame_count * hop_out + frame, dtype=np.float32)
+    weight = np.zeros_like(output)
+    
+    position = tolerance
+    for index in range(frame_count):
+        nominal = tolerance + int(index * hop_in)
+        if index > 0:
+            # 직전 프레임을 그대로 이어 읽었을 때의 구간과 가장 닮은 후보 위치 선택
+            natural = padded[position + hop_out:position + hop_out + frame]
+            region = padded[nominal - tolerance:nominal + tolerance + frame]
+            correlation = np.correlate(region, natural, mode='valid')
+            position = nominal - tolerance + int(np.argmax(correlation))
+        else:
+            position = nominal
+        
+        start = index * hop_out
+        output[start:start + frame] += padded[position:position + frame] * window
+        weight[start:start + frame] += window
+    
+    output /= np.maximum(weight, 1e-3)
+    return output[:output_length]
+
+
+def speed_bucket(length, interval, buckets, fit_ratio):
+    """길이 length(초) 클립이 간격의 fit_ratio 안에 들어가는 가장 느린 속도 단계 (없으면 가장 빠른 단계)"""
+    available = interval * fit_ratio
+    for speed in buckets:
+        if length / speed <= available:
+            return speed
+    return buckets[-1]
+
+
+def find_speech_bounds(samples, sample_rate, threshold_db=TTS_TRIM_THRESHOLD_DB, frame_ms=5):
+    """음성 구간의 (시작, 끝) 샘플 위치 - 짧은 프레임별 RMS가 최대 대비 threshold_db 이상인 첫/마지막 프레임
+    
+    전부 무음이면 None을 반환합니다.
+    """
+    frame = max(1, int(sample_rate * frame_ms / 1000))
+    count = len(samples) // frame
+    if count == 0:
+        return None
+    
+    frames = np.asarray(samples[:count * frame], dtype=np.float64).reshape(count, frame)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    peak = rms.max()
+    if peak <= 0.0:
+        return None
+    
+    active = np.flatnonzero(rms >= peak * 10.0 ** (threshold_db / 20.0))
+    return int(active[0] * frame), int(min(len(samples), (active[-1] + 1) * frame))
+
+
+def trim_silence(samples, sample_rate, lead_ms=TTS_TRIM_LEAD_MS, fade_ms=TTS_TRIM_FADE_MS):
+    """앞뒤 무음을 잘라낸 버퍼와 잘라낸 버퍼 기준 음성 시작 위치(초) 반환
+    
+    음성 앞에는 lead_ms만큼 남겨 자음 앞 숨소리를 보존하고, 앞뒤 가장자리는 짧게 페이드하여 클릭을 막습니다.
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    bounds = find_speech_bounds(samples, sample_rate)
+    if bounds is None:
+        return samples.copy(), 0.0
+    
+    onset, offset = bounds
+    lead = min(onset, int(sample_rate * lead_ms / 1000))
+    end = min(len(samples), offset + int(sample_rate * fade_ms / 1000))
+    trimmed = samples[onset - lead:end].copy()
+    
+    if lead > 0:
+        trimmed[:lead] *= np.linspace(0.0, 1.0, lead, dtype=np.float32)
+    fade = end - offset
+    if fade > 0:
+        trimmed[-fade:] *= np.linspace(1.0, 0.0, fade, dtype=np.float32)
+    return trimmed, lead / sample_rate
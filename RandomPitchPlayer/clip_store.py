@@ -0,0 +1,155 @@
+"""
+RandomPitchPlayer 음성 클립 저장소 (Clip Store)
+실행 간에 유지되는 내용 주소 기반 디스크 캐시 - (텍스트, 언어, 엔진, 엔진 버전, 오디오 형식)의 해시를 키로 사용
+
+- 쓰기는 같은 디렉토리의 임시 파일에 기록한 뒤 os.replace로 교체하므로 여러 인스턴스가 동시에 써도 깨지지 않음
+- 전체 크기가 상한을 넘으면 가장 오래 사용하지 않은 파일부터 삭제 (LRU, 파일 수정 시각 기준)
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from config import TTS_CACHE_DIR, TTS_CACHE_MAX_MB, ENABLE_CONSOLE_LOGS, RELEASE_MODE
+
+
+def default_cache_dir():
+    """사용자별 기본 캐시 디렉토리 (Windows: LOCALAPPDATA, 그 외: XDG_CACHE_HOME 또는 ~/.cache)"""
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME')
+    if not base:
+        base = os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'RandomPitchPlayer', 'tts_cache')
+
+
+class ClipStore:
+    """내용 주소 기반 음성 클립 디스크 캐시"""
+    
+    TEMP_PREFIX = ".tmp-"
+    STALE_TEMP_SECONDS = 3600  # 비정상 종료로 남은 임시 파일 정리 기준
+    
+    def __init__(self, root_dir=None, max_bytes=None):
+        self.root_dir = root_dir or TTS_CACHE_DIR or default_cache_dir()
+        self.max_bytes = max_bytes if max_bytes is not None else int(TTS_CACHE_MAX_MB * 1024 * 1024)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.root_dir, exist_ok=True)
+    
+    @staticmethod
+    def make_key(text, language, engine, engine_version, audio_format):
+        """클립 키 생성 (입력이 같으면 항상 같은 키)"""
+        payload = json.dumps([text, language, engine, str(engine_version), audio_format],
+                             ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def derive_key(base_key, *params):
+        """저장된 클립을 가공한 파생 클립의 키 (원본 키 + 가공 방식/매개변수)"""
+        payload = json.dumps([base_key] + [str(param) for param in params], separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def path_for(self, key, extension):
+        """키에 해당하는 파일 경로"""
+        return os.path.join(self.root_dir, f"{key}.{extension}")
+    
+    def get(self, key, extension):
+        """캐시된 파일 경로 반환 (없으면 None), 사용 시각 갱신"""
+        path = self.path_for(key, extension)
+        try:
+            os.utime(path, None)  # LRU 순서 갱신
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+    
+    def store(self, key, extension, writer):
+        """writer(임시 경로)로 파일을 만든 뒤 원자적으로 캐시에 등록하고 최종 경로 반환"""
+        return self.store_batch([key], extension, lambda temp_paths: writer(temp_paths[0]))[0]
+    
+    def store_batch(self, keys, extension, writer):
+        """writer(임시 경로 목록)로 여러 파일을 한 번에 만든 뒤 각각 원자적으로 등록하고 최종 경로 목록 반환"""
+        temp_paths = []
+        try:
+            for _ in keys:
+                fd, temp_path = tempfile.mkstemp(prefix=self.TEMP_PREFIX, suffix=f".{extension}", dir=self.root_dir)
+                os.close(fd)
+                temp_paths.append(temp_path)
+            
+            writer(temp_paths)
+            paths = []
+            for key, temp_path in zip(keys, temp_paths):
+                with open(temp_path, 'rb+') as f:
+                    os.fsync(f.fileno())
+                path = self.path_for(key, extension)
+                os.replace(temp_path, path)
+                paths.append(path)
+        except Exception:
+            for temp_path in temp_paths:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+            raise
+        
+        self.evict()
+        return paths
+    
+    def store_bytes(self, key, extension, data):
+        """바이트 데이터를 원자적으로 캐시에 등록"""
+        def write(temp_path):
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+        return self.store(key, extension, write)
+    
+    def total_size(self):
+        """캐시 전체 크기 (바이트)"""
+        return sum(size for _, size, _ in self._list_entries())
+    
+    def _list_entries(self):
+        """(경로, 크기, 수정 시각) 목록 (쓰기 중인 임시 파일 제외)"""
+        entries = []
+        try:
+            names = os.listdir(self.root_dir)
+        except OSError:
+            return entries
+        stale_before = time.time() - self.STALE_TEMP_SECONDS
+        for name in names:
+            path = os.path.join(self.root_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue  # 다른 인스턴스가 방금 삭제한 경우
+            if name.startswith(self.TEMP_PREFIX):
+                if stat.st_mtime < stale_before:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+    
+    def evict(self):
+        """전체 크기가 상한을 넘으면 가장 오래 사용하지 않은 파일부터 삭제 (삭제한 파일 수 반환)"""
+        with self._lock:
+            entries = self._list_entries()
+            total = sum(size for _, size, _ in entries)
+            if total <= self.max_bytes:
+                return 0
+            
+            removed = 0
+            for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+                total -= size
+            
+            if removed and ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+                print(f"[CACHE] 클립 캐시 정리 - {removed}개 삭제, 현재 {total / 1024:.0f}KB")
+            return removed
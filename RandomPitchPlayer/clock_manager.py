@@ -0,0 +1,167 @@
+"""
+RandomPitchPlayer 시계 관리자
+모든 컴포넌트가 공유하는 단조 시계 인터페이스와 가상 시계 (빨리 감기 시뮬레이션용)
+"""
+import threading
+import time
+import platform
+from config import TIMER_SPIN_THRESHOLD_MS, TIMER_MAX_SPIN_THRESHOLD_MS
+
+# Windows 타이머 해상도 조절 (timeBeginPeriod) 사용 가능 여부
+_winmm = None
+try:
+    if platform.system() == 'Windows':
+        import ctypes
+        _winmm = ctypes.windll.winmm
+except Exception:
+    _winmm = None
+
+
+class MonotonicClock:
+    """실제 시간을 따르는 단조 시계 (NTP 보정, 서머타임 변경의 영향을 받지 않음)"""
+    
+    is_virtual = False
+    
+    def now(self):
+        """현재 시각 반환 (초 단위, time.perf_counter 기준)"""
+        return time.perf_counter()
+    
+    def now_ns(self):
+        """현재 시각 반환 (나노초 단위)"""
+        return time.perf_counter_ns()
+    
+    def sleep(self, seconds):
+        """지정한 시간만큼 대기"""
+        if seconds > 0:
+            time.sleep(seconds)
+    
+    def wait(self, stop_event, timeout):
+        """이벤트 대기 (이벤트가 설정되면 True 반환)"""
+        return stop_event.wait(max(0.0, timeout))
+    
+    def spin_until(self, deadline, stop_event=None):
+        """목표 시각까지 스핀 대기 (정지 요청 시 False 반환)"""
+        while time.perf_counter() < deadline:
+            if stop_event is not None and stop_event.is_set():
+                return False
+            time.sleep(0)  # 다른 스레드에 양보
+        return True
+
+
+class VirtualClock:
+    """수동으로 진행시키는 가상 시계 (대기 호출 시 시간을 즉시 앞당김)"""
+    
+    is_virtual = True
+    
+    def __init__(self, start_time=0.0):
+        self._now = float(start_time)
+        self._lock = threading.Lock()
+    
+    def now(self):
+        """현재 가상 시각 반환 (초 단위)"""
+        return self._now
+    
+    def now_ns(self):
+        """현재 가상 시각 반환 (나노초 단위)"""
+        return int(self._now * 1e9)
+    
+    def advance(self, seconds):
+        """가상 시각을 지정한 시간만큼 진행"""
+        if seconds > 0:
+            with self._lock:
+                self._now += seconds
+    
+    def advance_to(self, target_time):
+        """가상 시각을 목표 시각까지 진행 (과거 시각이면 무시)"""
+        with self._lock:
+            if target_time > self._now:
+                self._now = target_time
+    
+    def sleep(self, seconds):
+        """실제로 대기하지 않고 가상 시각만 진행"""
+        self.advance(seconds)
+    
+    def wait(self, stop_event, timeout):
+        """이벤트가 이미 설정되지 않았다면 가상 시각을 진행"""
+        if stop_event.is_set():
+            return True
+        self.advance(timeout)
+        return stop_event.is_set()
+    
+    def spin_until(self, deadline, stop_event=None):
+        """가상 시각을 목표 시각까지 즉시 진행"""
+        if stop_event is not None and stop_event.is_set():
+            return False
+        self.advance_to(deadline)
+        return True
+
+
+class PreciseWaiter:
+    """목표 시각 직전까지 이벤트 대기 후 짧게 스핀하는 정밀 대기 도우미 (스핀 구간 자동 보정)"""
+    
+    def __init__(self, clock, min_spin_ms=TIMER_SPIN_THRESHOLD_MS, max_spin_ms=TIMER_MAX_SPIN_THRESHOLD_MS):
+        self.clock = clock
+        self.min_spin_threshold = min_spin_ms / 1000.0
+        self.max_spin_threshold = max_spin_ms / 1000.0
+        self.spin_threshold = self.min_spin_threshold
+        self.sleep_overshoot_avg = 0.0
+        self.wakeup_count = 0
+    
+    def reset_stats(self):
+        """깨어남 횟수 초기화 (보정값은 유지)"""
+        self.wakeup_count = 0
+    
+    def wait_until(self, deadline, wake_event):
+        """목표 시각까지 대기 (wake_event로 깨어나면 False 반환)"""
+        remaining = deadline - self.clock.now()
+        
+        # 1단계: 스핀 구간 직전까지 이벤트 대기 (정지/변경 요청 시 즉시 깨어남)
+        if remaining > self.spin_threshold:
+            sleep_target = deadline - self.spin_threshold
+            self.wakeup_count += 1
+            if self.clock.wait(wake_event, remaining - self.spin_threshold):
+                return False
+            self._calibrate_spin(self.clock.now() - sleep_target)
+        
+        # 2단계: 남은 구간은 스핀으로 마무리
+        return self.clock.spin_until(deadline, wake_event)
+    
+    def _calibrate_spin(self, overshoot):
+        """대기 초과 시간을 반영하여 스핀 구간 보정"""
+        self.sleep_overshoot_avg = 0.9 * self.sleep_overshoot_avg + 0.1 * max(0.0, overshoot)
+        self.spin_threshold = max(self.min_spin_threshold,
+                                  min(self.max_spin_threshold, 2.0 * self.sleep_overshoot_avg))
+
+
+def begin_high_resolution():
+    """Windows 타이머 해상도를 1ms로 설정"""
+    if _winmm is not None:
+        try:
+            _winmm.timeBeginPeriod(1)
+        except Exception:
+            pass
+
+def end_high_resolution():
+    """Windows 타이머 해상도 복원"""
+    if _winmm is not None:
+        try:
+            _winmm.timeEndPeriod(1)
+        except Exception:
+            pass
+
+
+# 전역 시계 인스턴스
+_clock_instance = None
+
+def get_clock():
+    """공유 시계 인스턴스 반환 (기본값: 단조 시계)"""
+    global _clock_instance
+    if _clock_instance is None:
+        _clock_instance = MonotonicClock()
+    return _clock_instance
+
+def set_clock(clock):
+    """공유 시계 교체 (시뮬레이션 시 VirtualClock 주입용)"""
+    global _clock_instance
+    _clock_instance = clock
+    return clock
\ No newline at end of file
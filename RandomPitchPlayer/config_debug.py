@@ -6,6 +6,7 @@ RandomPitchPlayer 개발/디버그용 설정 파일
 1. 릴리즈 배포 시: config_release.py를 config.py로 복사
 2. 개발/디버그 시: config_debug.py를 config.py로 복사
 """
+import sys
 
 # 빌드 모드 설정 - 디버그 모드
 RELEASE_MODE = False  # 디버그 모드 활성화
@@ -41,6 +42,7 @@ DEFAULT_BPM = 60        # 기본 BPM (분당 60비트 = 1초마다)
 MIN_BPM = 30           # 최소 BPM (2초 간격)
 MAX_BPM = 300          # 최대 BPM (0.2초 간격)
 BPM_MODE_ENABLED = True # BPM 모드 기본 활성화
+TEMPO_PROGRAM = ""      # 기본 템포 프로그램 (예: "60->180@5m, 180@2m", 빈 문자열 = 사용 안 함)
 
 # 지속 시간 설정 (Duration Settings)
 DEFAULT_DURATION_MINUTES = 5    # 기본 지속 시간 (분)
@@ -58,10 +60,27 @@ POWER_THREAD_UPDATE_MS = 30000  # 전원 상태 유지 갱신 간격 (30초)
 
 # TTS (Text-to-Speech) 설정
 TTS_ENABLED = True              # TTS 기능 활성화
-TTS_RATE = 150                  # 말하기 속도 (기본: 200, 범위: 50-300)
+TTS_RATE = 150                  # 말하기 속도 (pyttsx3 엔진, 기본: 200, 범위: 50-300)
 TTS_VOLUME = 0.8                # TTS 볼륨 (0.0 ~ 1.0)
 TTS_VOICE_INDEX = 0             # 음성 인덱스 (0: 기본, 1: 대안)
 TTS_LANGUAGE_KOREAN = False     # 한국어 음성 사용 여부 (False: 영어)
+TTS_ENGINE = "auto"             # 음성 합성 엔진 ("auto": gTTS → pyttsx3 → 내장 합성기, "gtts", "pyttsx3", "builtin")
+TTS_NETWORK_TIMEOUT = 2.0       # gTTS 서버 연결 확인 제한 시간 (초, 오프라인이면 다음 엔진으로 전환)
+TTS_PREGEN_WORKERS = 4          # 음정별 오디오 미리 생성 동시 작업 수
+TTS_RESERVED_CHANNELS = 2       # 음성 안내 전용 예약 mixer 채널 수 (번갈아 재생)
+TTS_CROSSFADE_MS = 30           # 이전 안내가 남아 있을 때 페이드아웃 시간 (밀리초)
+TTS_CACHE_DIR = ""              # 음성 클립 캐시 경로 (빈 문자열: 사용자 캐시 디렉토리)
+TTS_CACHE_MAX_MB = 50           # 음성 클립 캐시 최대 크기 (MB, 초과 시 오래 사용하지 않은 클립부터 삭제)
+TTS_SPEED_BUCKETS = (1.0, 1.15, 1.3, 1.5, 1.75, 2.0)  # 빠른 템포용 시간 압축 속도 단계 (음높이 유지, 1.0 = 원본)
+TTS_FIT_RATIO = 0.9             # 음성 클립이 차지할 수 있는 비트 간격 비율 (넘으면 더 빠른 단계 사용)
+TTS_WSOLA_FRAME_MS = 30         # 시간 압축 프레임 길이 (밀리초)
+TTS_WSOLA_TOLERANCE_MS = 8      # 시간 압축 시 이어 붙일 위치 탐색 범위 (밀리초)
+TTS_TRIM_ENABLED = True         # 음성 클립 앞뒤 무음 제거 (음성 시작이 비트에 맞도록 시작 위치도 기록)
+TTS_TRIM_THRESHOLD_DB = -40     # 무음 판정 기준 (최대 RMS 대비 dB)
+TTS_TRIM_LEAD_MS = 10           # 음성 시작 앞에 남겨 둘 여유 (밀리초, 자음 앞 숨소리 보존)
+TTS_TRIM_FADE_MS = 15           # 음성 끝 뒤에 남겨 페이드아웃할 길이 (밀리초)
+VOICE_PACK_ENABLED = True       # 미리 만든 음성 팩이 있으면 합성 없이 사용 (python voice_pack.py build로 생성)
+VOICE_PACK_FILE = "voices.rpvp" # 음성 팩 파일 (상대 경로는 프로그램 폴더 기준, EXE에 함께 포함됨)
 
 # 음정별 TTS 텍스트 매핑
 TTS_PITCH_TEXTS = {
@@ -85,17 +104,67 @@ TTS_PITCH_TEXTS_EN = {
     'B': 'B'        # B
 }
 
+# 음정별 주파수 매핑 (Hz) - 4옥타브 기준
+PITCH_FREQUENCIES = {
+    'C': 261.63,   # C4 (도)
+    'D': 293.66,   # D4 (레)
+    'E': 329.63,   # E4 (미)
+    'F': 349.23,   # F4 (파)
+    'G': 392.00,   # G4 (솔)
+    'A': 440.00,   # A4 (라) - 표준 주파수
+    'B': 493.88    # B4 (시)
+}
+
+# 음 재생 설정 (NumPy 합성, PITCH_FREQUENCIES 사용)
+TONE_ENABLED = False            # 비트마다 음정 소리 재생 여부
+TONE_TIMBRE = "sine"            # 음색 ("sine", "organ", "clarinet", "bright")
+TONE_DURATION = 0.35            # 음 길이 (초)
+TONE_VOLUME = 0.5               # 음 볼륨 (0.0 ~ 1.0)
+TONE_ADSR = (0.01, 0.08, 0.7, 0.12)  # 엔벨로프 (attack 초, decay 초, sustain 레벨, release 초)
+
+# 오디오 출력 방식
+AUDIO_ENGINE = "mixer"          # "mixer": pygame 채널 + after() 예약 (기존), "callback": 연속 출력 스트림에 샘플 단위 예약
+AUDIO_BACKEND = "sounddevice"   # 콜백 엔진 출력 ("sounddevice": 실제 장치, "buffer": 장치 없이 버퍼로 합성 - 테스트용)
+AUDIO_SAMPLE_RATE = 22050       # 콜백 엔진 샘플레이트 (음성 클립 디코딩 형식과 같으면 리샘플링 없음)
+AUDIO_CHANNELS = 2              # 콜백 엔진 출력 채널 수
+AUDIO_BLOCK_SIZE = 256          # 콜백 한 번에 합성하는 프레임 수 (작을수록 지연 감소, CPU 증가)
+AUDIO_CLICK_ENABLED = True      # 콜백 엔진에서 비트마다 클릭 소리 믹싱
+
+# 오프라인 렌더링 설정 (연습용 음원 파일 생성)
+OFFLINE_RENDER_BLOCK_SIZE = 4096   # 한 번에 합성해 파일에 기록하는 프레임 수
+OFFLINE_RENDER_PREROLL = 0.25      # 첫 비트 앞 여유 (초, 음성 클립 시작 여유가 잘리지 않도록)
+OFFLINE_RENDER_CLIP_TIMEOUT = 10.0 # 렌더링 전 음성 클립 준비 대기 시간 (초)
+
 # 폰트 설정 (음정 표시를 더 크게)
 DEFAULT_FONT_SIZE = 240  # 음정 표시 폰트 크기
 MIN_FONT_SIZE = 120      
 MAX_FONT_SIZE = 400      
 FONT_SCALE_FACTOR = 0.20 # 창 크기 대비 폰트 크기 비율
+PITCH_DISPLAY_MODE = "label"  # 음정 표시 방식: "label" (기존 Label) 또는 "canvas" (미리 만든 글리프 전환)
+                              # canvas는 아직 실제 디스플레이에서 측정하지 않음 - 기본값 변경 전 benchmark.py render로 비교할 것
+SHOW_NEXT_PITCH_PREVIEW = False  # 다음 음정 미리보기 표시 여부
 KOREAN_FONTS = ['맑은 고딕', 'Malgun Gothic', '굴림', 'Gulim', 'Arial Unicode MS']
 
 # 타이밍 설정
 TIMER_SLEEP_MS = 1
-UI_QUEUE_CHECK_MS = 2
-RENDER_CHECK_MS = 5
+TIMER_SCHEDULER_MODE = "precise"  # 타이머 방식 ("precise": 대기+스핀, "polling": 1ms 폴링)
+TIMER_SPIN_THRESHOLD_MS = 2.0     # 목표 시각 직전 스핀 대기 구간 (밀리초, 최소값)
+TIMER_MAX_SPIN_THRESHOLD_MS = 20.0  # 보정된 스핀 구간의 상한 (밀리초, Windows 기본 타이머 해상도 고려)
+TIMER_JITTER_SAMPLES = 500        # 지터 통계에 사용할 최근 비트 수
+LOOKAHEAD_BUFFER_SIZE = 16        # 미리 계산해 두는 다음 비트 수 (선행 버퍼 크기)
+BEAT_EVENT_POOL_SIZE = 64        # 재사용 비트 이벤트 풀 크기 (타이머→UI 경로의 비트별 객체 생성 방지)
+TTS_SCHEDULE_DELAY_MS = 50       # 보정이 꺼져 있을 때 화면 출력 후 음성 안내까지의 지연 (밀리초)
+
+# 지연 보상 설정 (Latency Compensation)
+LATENCY_COMPENSATION_ENABLED = True  # 측정된 출력 지연만큼 트리거를 앞당김
+LATENCY_MAX_OFFSET_MS = 100      # 보정 오프셋 상한 (밀리초)
+LATENCY_SMOOTHING = 0.2          # 지연 추정치 갱신 비율 (지수 이동 평균)
+LATENCY_OUTLIER_MS = 400         # 이 값보다 큰 지연 측정값은 추정에서 제외 (밀리초)
+LATENCY_CALIBRATION_FILE = ""    # 장치별 출력 지연 측정값 저장 파일 (빈 문자열: 사용자 설정 디렉토리)
+LATENCY_CALIBRATION_CLICKS = 16  # 측정 한 번에 출력하는 클릭/깜빡임 수
+LATENCY_CALIBRATION_PERIOD = 0.6 # 클릭/깜빡임 간격 (초)
+LATENCY_CALIBRATION_MAX_MS = 500 # 측정 가능한 최대 지연 (상호상관 탐색 범위, 장치 오프셋 상한)
+LATENCY_CALIBRATION_POLL_MS = 50 # 루프백 측정 결과 확인 간격 (밀리초, 메인 스레드 폴링)
 FONT_UPDATE_DELAY_MS = 500
 INTERVAL_UPDATE_FREQUENCY = 0.5
 
@@ -108,4 +177,4 @@ RESIZE_THRESHOLD = 50
 FONT_SIZE_CHANGE_THRESHOLD = 5
 
 # 디버그 모드 실행 알림
-print("RandomPitchPlayer - 개발/디버그 모드로 실행 중...")
\ No newline at end of file
+print("RandomPitchPlayer - 개발/디버그 모드로 실행 중...", file=sys.stderr)  # 헤드리스 실행 시 표준 출력의 이벤트 기록과 섞이지 않도록
\ No newline at end of file
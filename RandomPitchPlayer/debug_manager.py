@@ -2,14 +2,15 @@
 RandomPitchPlayer 디버그 및 성능 분석 관리자
 타이밍 로그, 지연 분석, 성능 측정 담당
 """
-import time
+from clock_manager import get_clock
 from config import DEBUG_MODE, MAX_TIMING_LOGS, ENABLE_CONSOLE_LOGS, ENABLE_PERFORMANCE_ANALYSIS, RELEASE_MODE
 
 
 class DebugManager:
     """RandomPitchPlayer 디버깅 및 성능 분석을 관리하는 클래스"""
     
-    def __init__(self):
+    def __init__(self, clock=None):
+        self.clock = clock or get_clock()
         self.debug_mode = DEBUG_MODE
         self.enable_logs = ENABLE_CONSOLE_LOGS
         self.enable_performance = ENABLE_PERFORMANCE_ANALYSIS
@@ -32,14 +33,16 @@ class DebugManager:
             self.interval_delays = []
             self.pending_updates = {}
         
+        # 음성 안내 결과 횟수 (재생 / 기한 초과·새 요청으로 누락 / 새 안내로 중단)
+        self.announcement_counts = {'played': 0, 'dropped': 0, 'preempted': 0}
+        
         self.start_time = 0
-        self.render_check_count = 0
     
     def start_session(self):
         """디버깅 세션 시작"""
         if not RELEASE_MODE:
             self.clear_all_data()
-            self.start_time = time.time()
+            self.start_time = self.clock.now()
             if self.enable_logs:
                 print(f"\n[START] RandomPitchPlayer 세션 시작")
     
@@ -53,15 +56,18 @@ class DebugManager:
         self.target_display_times.clear()
         self.display_intervals.clear()
         self.interval_delays.clear()
+        for entry in self.pending_updates.values():
+            entry.release()
         self.pending_updates.clear()
-        self.render_check_count = 0
+        for outcome in self.announcement_counts:
+            self.announcement_counts[outcome] = 0
     
     def log_timing_event(self, event_type, expected_time=None, actual_time=None, sequence=None):
         """타이밍 이벤트 로그 기록"""
         if RELEASE_MODE or not self.debug_mode:
             return
             
-        timestamp = time.time()
+        timestamp = self.clock.now()
         log_entry = {
             'type': event_type,
             'timestamp': timestamp,
@@ -103,24 +109,35 @@ class DebugManager:
             if self.enable_logs:
                 print(f"[PLAY] {pitch_text} 첫 출력")
     
-    def add_pending_update(self, sequence, pitch, color, target_time):
-        """대기 중인 업데이트 추가"""
+    def add_pending_update(self, entry):
+        """대기 중인 업데이트 추가 (비트 이벤트를 그대로 보관, 완료 시 풀에 반환)"""
         if RELEASE_MODE:
+            entry.release()
             return
             
-        self.pending_updates[sequence] = {
-            'pitch': pitch,
-            'color': color,
-            'target_time': target_time,
-            'request_time': time.time()
-        }
+        entry.request_time = self.clock.now()
+        self.pending_updates[entry.sequence] = entry
     
     def complete_pending_update(self, sequence):
         """대기 중인 업데이트 완료 처리"""
         if RELEASE_MODE or sequence not in self.pending_updates:
             return
             
-        del self.pending_updates[sequence]
+        self.pending_updates.pop(sequence).release()
+    
+    def record_announcement(self, outcome, pitch):
+        """음성 안내 결과 기록 (TTS 작업 스레드에서도 호출됨)"""
+        if RELEASE_MODE:
+            return
+        
+        self.announcement_counts[outcome] += 1
+        if self.enable_logs and outcome != 'played':
+            state_text = "누락" if outcome == 'dropped' else "중단"
+            print(f"[VOICE] {pitch} 음성 안내 {state_text} (누적: {self.announcement_counts[outcome]}회)")
+    
+    def get_announcement_stats(self):
+        """음성 안내 결과 횟수 복사본"""
+        return dict(self.announcement_counts)
     
     def get_debug_summary(self):
         """디버그 요약 정보 반환"""
@@ -133,10 +150,15 @@ class DebugManager:
         last_delay = self.interval_delays[-1]
         avg_delay = sum(self.interval_delays[-5:]) / min(5, len(self.interval_delays))
         pending_count = len(self.pending_updates)
+        summary = f"지연: {last_delay:.3f}s | 평균: {avg_delay:.3f}s | 대기중: {pending_count}"
         
-        return f"지연: {last_delay:.3f}s | 평균: {avg_delay:.3f}s | 대기중: {pending_count}"
+        dropped = self.announcement_counts['dropped']
+        preempted = self.announcement_counts['preempted']
+        if dropped or preempted:
+            summary += f" | 음성 누락: {dropped} 중단: {preempted}"
+        return summary
     
-    def print_comprehensive_analysis(self, current_interval):
+    def print_comprehensive_analysis(self, current_interval, jitter_stats=None, latency_status=None):
         """종합 성능 분석 결과 출력"""
         if RELEASE_MODE or not self.enable_performance:
             return
@@ -156,6 +178,15 @@ class DebugManager:
             self._print_interval_analysis()
         
         self._print_recent_details()
+        
+        if jitter_stats:
+            self._print_jitter_analysis(jitter_stats)
+        
+        if latency_status:
+            self._print_latency_compensation(latency_status)
+        
+        if any(self.announcement_counts.values()):
+            self._print_announcement_analysis()
     
     def _print_delay_analysis(self):
         """지연 분석 출력"""
@@ -181,15 +212,55 @@ class DebugManager:
         if delays_over_500ms:
             print(f"  심각한 지연들: {[f'{d:.3f}s' for d in delays_over_500ms]}")
     
+    def _print_jitter_analysis(self, jitter_stats):
+        """타이머 트리거 지터 분석 출력"""
+        if RELEASE_MODE:
+            return
+            
+        print(f"\n[JITTER] 타이머 트리거 지터 분석 ({jitter_stats['mode']} 방식):")
+        print(f"  측정 비트 수: {jitter_stats['count']}회")
+        print(f"  평균 지연: {jitter_stats['mean_ms']:.3f}ms")
+        print(f"  표준 편차: {jitter_stats['std_ms']:.3f}ms")
+        print(f"  99% 지연: {jitter_stats['p99_ms']:.3f}ms")
+        print(f"  최대 지연: {jitter_stats['max_ms']:.3f}ms")
+        print(f"  타이머 깨어남 횟수: {jitter_stats['wakeups']}회")
+        print(f"  보정된 스핀 구간: {jitter_stats['spin_threshold_ms']:.2f}ms")
+    
+    def _print_latency_compensation(self, latency_status):
+        """출력별 지연 보상 상태 출력"""
+        if RELEASE_MODE:
+            return
+            
+        state_text = "활성화" if latency_status['enabled'] else "비활성화"
+        print(f"\n[COMP] 지연 보상 상태 ({state_text}, 상한: {latency_status['max_offset_ms']:.0f}ms):")
+        for output, info in latency_status['outputs'].items():
+            print(f"  {output}: 오프셋 {info['offset_ms']:.1f}ms (+장치 {info['device_ms']:.1f}ms), 추정 지연 {info['estimate_ms']:.1f}ms, "
+                  f"최근 오차 {info['last_error_ms']:.1f}ms, 샘플 {info['samples']}개")
+        print(f"  제외된 이상치: {latency_status['rejected']}개")
+    
+    def _print_announcement_analysis(self):
+        """음성 안내 누락/중단 분석 출력"""
+        if RELEASE_MODE:
+            return
+        
+        counts = self.announcement_counts
+        requested = counts['played'] + counts['dropped']
+        print(f"\n[VOICE] 음성 안내 분석:")
+        print(f"  재생: {counts['played']}회")
+        print(f"  누락 (기한 초과 또는 새 요청에 밀림): {counts['dropped']}회")
+        print(f"  중단 (새 안내로 끊김): {counts['preempted']}회")
+        if requested:
+            print(f"  누락 비율: {counts['dropped'] / requested * 100:.1f}%")
+    
     def _print_pending_updates(self):
         """대기 중인 업데이트 정보 출력"""
         if RELEASE_MODE:
             return
             
         print(f"\n[WAIT] 현재 대기 중인 렌더링:")
-        for seq, info in self.pending_updates.items():
-            wait_time = time.time() - info['request_time']
-            print(f"  순서 {seq}: {info['pitch']} (대기시간: {wait_time:.3f}s)")
+        for seq, entry in self.pending_updates.items():
+            wait_time = self.clock.now() - entry.request_time
+            print(f"  순서 {seq}: {entry.pitch} (대기시간: {wait_time:.3f}s)")
     
     def _print_interval_analysis(self):
         """간격 분석 출력"""
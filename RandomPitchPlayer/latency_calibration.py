@@ -0,0 +1,524 @@
+"""
+RandomPitchPlayer 출력 지연 측정 (Latency Calibration)
+스피커/화면이 target_time보다 얼마나 늦게 출력되는지 장치별로 측정하여 저장
+
+- 음성(루프백): mixer로 클릭 트레인을 재생하면서 입력 장치로 녹음하고, 원본과 녹음의 상호상관
+  최대 위치로 출력 지연을 추정 (테스트에서는 WAV 파일을 녹음 장치 대신 사용)
+- 음성/화면(탭): 클릭 소리 또는 화면 깜빡임에 맞춰 사용자가 탭한 시각과 목표 시각 차이의 중앙값
+  (루프백 측정값이 있으면 음성 탭 결과와의 차이를 사용자의 반응 편차로 보고 화면 결과에서 뺌)
+
+측정값은 장치(호스트, 출력 장치, 화면 크기)별로 설정 파일에 저장되고,
+다음 실행부터 LatencyCompensator의 장치 오프셋으로 적용되어 스케줄러가 그만큼 일찍 출력합니다.
+"""
+import json
+import os
+import platform
+import queue
+import tempfile
+import threading
+import time
+import wave
+import tkinter as tk
+from clock_manager import get_clock
+from config import (AUDIO_SAMPLE_RATE, LATENCY_CALIBRATION_FILE, LATENCY_CALIBRATION_CLICKS,
+                    LATENCY_CALIBRATION_PERIOD, LATENCY_CALIBRATION_MAX_MS, LATENCY_CALIBRATION_POLL_MS,
+                    ENABLE_CONSOLE_LOGS, RELEASE_MODE)
+
+# NumPy/sounddevice/pygame 임포트 (NumPy가 없으면 루프백 측정 불가, sounddevice가 없으면 WAV 파일만 가능)
+try:
+    import numpy as np
+    from audio_engine import make_click, resample
+    _numpy_available = True
+except ImportError:
+    _numpy_available = False
+
+try:
+    import sounddevice
+    _sounddevice_available = True
+except (ImportError, OSError):  # PortAudio 라이브러리가 없으면 OSError
+    _sounddevice_available = False
+
+try:
+    import pygame
+    _pygame_available = True
+except ImportError:
+    _pygame_available = False
+
+
+def default_settings_path():
+    """사용자별 기본 설정 파일 경로 (Windows: APPDATA, 그 외: XDG_CONFIG_HOME 또는 ~/.config)"""
+    base = os.environ.get('APPDATA') or os.environ.get('XDG_CONFIG_HOME')
+    if not base:
+        base = os.path.join(os.path.expanduser('~'), '.config')
+    return os.path.join(base, 'RandomPitchPlayer', 'latency_calibration.json')
+
+
+def device_key(master=None):
+    """현재 출력 장치 조합의 키 (호스트 | 오디오 출력 장치 | 화면 크기)"""
+    audio_device = os.environ.get('SDL_AUDIODRIVER', 'default')
+    if _sounddevice_available:
+        try:
+            audio_device = sounddevice.query_devices(kind='output')['name']
+        except Exception:
+            pass
+    screen = "unknown"
+    if master is not None:
+        screen = f"{master.winfo_screenwidth()}x{master.winfo_screenheight()}"
+    return f"{platform.node()}|{audio_device}|{screen}"
+
+
+def make_click_train(sample_rate, count=LATENCY_CALIBRATION_CLICKS, period=LATENCY_CALIBRATION_PERIOD,
+                     lead=0.2):
+    """클릭 트레인 모노 버퍼와 클릭 시작 시각 목록 (버퍼 시작 기준, 초)"""
+    click = make_click(sample_rate, duration=0.01, level=0.8)
+    click_times = [lead + index * period for index in range(count)]
+    samples = np.zeros(int((lead + count * period) * sample_rate), dtype=np.float32)
+    for click_time in click_times:
+        start = int(round(click_time * sample_rate))
+        samples[start:start + len(click)] += click
+    return samples, click_times
+
+
+def estimate_latency(reference, captured, sample_rate, max_latency=LATENCY_CALIBRATION_MAX_MS / 1000.0):
+    """상호상관으로 captured가 reference보다 늦은 시간(초)과 신뢰도(최대값 / 상관값 RMS) 추정
+    
+    FFT로 전체 상호상관을 한 번에 계산하고 0 ~ max_latency 지연 범위에서 최대값을 찾은 뒤,
+    인접 세 값의 포물선 보간으로 샘플 이하 위치까지 구합니다.
+    """
+    reference = np.asarray(reference, dtype=np.float64)
+    captured = np.asarray(captured, dtype=np.float64)
+    size = 1 << int(np.ceil(np.log2(len(reference) + len(captured))))
+    correlation = np.fft.irfft(np.fft.rfft(captured, size) * np.conj(np.fft.rfft(reference, size)), size)
+    
+    max_lag = min(len(captured), int(max_latency * sample_rate) + 1)
+    window = correlation[:max_lag]
+    lag = int(np.argmax(window))
+    offset = 0.0
+    if 0 < lag < max_lag - 1:
+        left, center, right = window[lag - 1], window[lag], window[lag + 1]
+        curvature = left - 2.0 * center + right
+        if curvature < 0:
+            offset = 0.5 * (left - right) / curvature
+    
+    rms = np.sqrt(np.mean(window * window))
+    confidence = float(window[lag] / rms) if rms > 0 else 0.0
+    return (lag + offset) / sample_rate, confidence
+
+
+def estimate_tap_offset(target_times, tap_times, period=LATENCY_CALIBRATION_PERIOD):
+    """탭 시각과 가장 가까운 목표 시각 차이의 (중앙값, 일치한 탭 수, 중앙 절대 편차) - 초 단위
+    
+    목표에서 반 주기 이상 떨어진 탭(두 번 누름, 놓친 비트)은 제외하므로 측정 범위는 ±period/2입니다.
+    """
+    if not target_times or not tap_times:
+        return None, 0, None
+    targets = np.asarray(target_times, dtype=np.float64)
+    taps = np.asarray(tap_times, dtype=np.float64)
+    nearest = targets[np.abs(taps[:, np.newaxis] - targets[np.newaxis, :]).argmin(axis=1)]
+    
+    differences = taps - nearest
+    differences = differences[np.abs(differences) < period / 2]
+    if len(differences) == 0:
+        return None, 0, None
+    median = float(np.median(differences))
+    return median, len(differences), float(np.median(np.abs(differences - median)))
+
+
+def read_wav(path):
+    """WAV 파일을 (float32 모노 버퍼, 샘플레이트)로 읽기 (8/16/32비트 PCM)"""
+    with wave.open(path, 'rb') as wav_file:
+        channels = wav_file.getnchannels()
+        width = wav_file.getsampwidth()
+        sample_rate = wav_file.getframerate()
+        raw = wav_file.readframes(wav_file.getnframes())
+    
+    if width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width == 2:
+        samples = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+    elif width == 4:
+        samples = np.frombuffer(raw, dtype=np.int32).astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"지원하지 않는 WAV 샘플 크기: {width}바이트")
+    samples = samples[:len(samples) - len(samples) % channels]
+    return samples.reshape(-1, channels).mean(axis=1), sample_rate
+
+
+class WavCapture:
+    """녹음 장치 대용 WAV 파일 (파일 첫 샘플이 클릭 트레인 재생 시작 start_offset초 전에 녹음되었다고 가정)"""
+    
+    name = "wav"
+    
+    def __init__(self, path, start_offset=0.0):
+        self.path = path
+        self.start_offset = start_offset
+    
+    def record(self, duration, sample_rate, play):
+        """play()로 재생을 시작하고 (녹음 버퍼, 녹음 시작부터 재생 시작까지의 시간) 반환"""
+        play()
+        samples, source_rate = read_wav(self.path)
+        return resample(samples, source_rate, sample_rate), self.start_offset
+
+
+class SoundDeviceCapture:
+    """sounddevice 입력 장치 녹음 (루프백 케이블 또는 스피커 앞 마이크)"""
+    
+    name = "sounddevice"
+    
+    def __init__(self, device=None, clock=None):
+        self.device = device
+        self.clock = clock or get_clock()
+    
+    @staticmethod
+    def is_available():
+        """sounddevice 사용 가능 여부"""
+        return _sounddevice_available
+    
+    def record(self, duration, sample_rate, play):
+        """녹음을 시작한 뒤 play()로 재생하고 (녹음 버퍼, 녹음 시작부터 재생 시작까지의 시간) 반환
+        
+        녹음 시작 시각은 첫 입력 블록의 첫 샘플이 입력 장치에 들어온 시각(콜백 시각 - 입력 지연)이므로,
+        추정한 지연에는 입력 장치 지연이 포함되지 않고 출력 지연만 남습니다.
+        """
+        total = int(duration * sample_rate)
+        recording = np.zeros(total, dtype=np.float32)
+        state = {'written': 0, 'start': None}
+        started = threading.Event()
+        finished = threading.Event()
+        
+        def callback(indata, frames, time_info, status):
+            if state['start'] is None:
+                # 호스트가 입력 시각을 주지 않으면 스트림의 입력 지연으로 대체
+                input_latency = time_info.currentTime - time_info.inputBufferAdcTime
+                if input_latency <= 0:
+                    input_latency = stream_latency
+                state['start'] = self.clock.now() - input_latency
+                started.set()
+            written = state['written']
+            count = min(frames, total - written)
+            recording[written:written + count] = indata[:count, 0]
+            state['written'] = written + count
+            if state['written'] >= total:
+                finished.set()
+                raise sounddevice.CallbackStop
+        
+        stream = sounddevice.InputStream(samplerate=sample_rate, channels=1, dtype='float32',
+                                         device=self.device, callback=callback)
+        stream_latency = stream.latency
+        try:
+            stream.start()
+            started.wait(1.0)
+            play_time = play()
+            finished.wait(duration + 1.0)
+        finally:
+            stream.close()
+        
+        capture_start = state['start'] if state['start'] is not None else play_time
+        return recording, play_time - capture_start
+
+
+class LatencyCalibrator:
+    """클릭 트레인 루프백과 탭 측정으로 출력별 지연을 추정하는 클래스"""
+    
+    def __init__(self, clock=None, sample_rate=AUDIO_SAMPLE_RATE, clicks=LATENCY_CALIBRATION_CLICKS,
+                 period=LATENCY_CALIBRATION_PERIOD):
+        self.clock = clock or get_clock()
+        self.sample_rate = sample_rate
+        self.clicks = clicks
+        self.period = period
+        self.max_latency = LATENCY_CALIBRATION_MAX_MS / 1000.0
+        self.click_sound = None
+    
+    def measure_audio(self, capture, play_audio=True):
+        """클릭 트레인을 재생하며 녹음하여 음성 출력 지연 추정 ({'latency', 'confidence', ...} 또는 None)"""
+        if not _numpy_available:
+            return None
+        train, _ = make_click_train(self.sample_rate, self.clicks, self.period)
+        duration = len(train) / self.sample_rate + self.max_latency
+        
+        def play():
+            if play_audio:
+                self._play_buffer(train)
+            return self.clock.now()
+        
+        captured, capture_offset = capture.record(duration, self.sample_rate, play)
+        lag, confidence = estimate_latency(train, captured, self.sample_rate, self.max_latency + capture_offset)
+        latency = lag - capture_offset
+        
+        if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+            print(f"[CALIB] 루프백 측정 ({capture.name}) - 음성 지연 {latency * 1000:.1f}ms, 신뢰도 {confidence:.1f}")
+        return {'latency': latency, 'confidence': confidence, 'source': capture.name}
+    
+    def _play_buffer(self, samples):
+        """float32 모노 버퍼를 pygame mixer로 재생 (음성 안내와 같은 출력 경로)"""
+        if not _pygame_available:
+            return False
+        if pygame.mixer.get_init() is None:
+            pygame.mixer.pre_init(frequency=self.sample_rate, size=-16, channels=2, buffer=512)
+            pygame.mixer.init()
+        mixer_rate, _, channels = pygame.mixer.get_init()
+        samples = resample(samples, self.sample_rate, mixer_rate)
+        pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+        if channels > 1:
+            pcm = np.repeat(pcm[:, np.newaxis], channels, axis=1)
+        pygame.mixer.Sound(buffer=np.ascontiguousarray(pcm).tobytes()).play()
+        return True
+    
+    def play_click(self):
+        """탭 측정용 클릭 한 번 재생 (버퍼는 처음 한 번만 만듦)"""
+        if not (_pygame_available and _numpy_available):
+            return False
+        if self.click_sound is None:
+            if pygame.mixer.get_init() is None:
+                pygame.mixer.pre_init(frequency=self.sample_rate, size=-16, channels=2, buffer=512)
+                pygame.mixer.init()
+            mixer_rate, _, channels = pygame.mixer.get_init()
+            pcm = (make_click(mixer_rate, duration=0.01, level=0.8) * 32767).astype(np.int16)
+            if channels > 1:
+                pcm = np.repeat(pcm[:, np.newaxis], channels, axis=1)
+            self.click_sound = pygame.mixer.Sound(buffer=np.ascontiguousarray(pcm).tobytes())
+        self.click_sound.play()
+        return True
+    
+    def tap_targets(self, start_time):
+        """탭 측정 목표 시각 목록 (start_time부터 period 간격)"""
+        return [start_time + index * self.period for index in range(self.clicks)]
+    
+    def measure_taps(self, target_times, tap_times):
+        """탭 측정 결과 ({'latency', 'taps', 'spread'} 또는 None)"""
+        offset, count, spread = estimate_tap_offset(target_times, tap_times, self.period)
+        if offset is None or count < max(3, self.clicks // 2):
+            return None
+        return {'latency': offset, 'taps': count, 'spread': spread}
+    
+    def combine(self, audio_loopback=None, audio_taps=None, display_taps=None):
+        """측정 결과로 장치 오프셋 계산 ({'audio': 초, 'display': 초}, 측정하지 않은 출력은 제외)
+        
+        루프백 측정은 사람의 반응 편차가 없으므로 음성 값으로 우선 사용하고,
+        음성 탭 결과와의 차이(반응 편차)를 화면 탭 결과에서 뺍니다.
+        """
+        offsets = {}
+        bias = 0.0
+        if audio_loopback is not None:
+            offsets['audio'] = audio_loopback['latency']
+            if audio_taps is not None:
+                bias = audio_taps['latency'] - audio_loopback['latency']
+        elif audio_taps is not None:
+            offsets['audio'] = audio_taps['latency']
+        if display_taps is not None:
+            offsets['display'] = display_taps['latency'] - bias
+        return {output: max(0.0, min(self.max_latency, value)) for output, value in offsets.items()}
+
+
+class CalibrationStore:
+    """장치별 출력 지연 측정값 설정 파일 (JSON, 원자적 교체로 저장)"""
+    
+    def __init__(self, path=None):
+        self.path = path or LATENCY_CALIBRATION_FILE or default_settings_path()
+    
+    def load(self):
+        """전체 측정값 ({장치 키: {'audio_ms', 'display_ms', 'updated'}}, 파일이 없거나 손상되면 빈 dict)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+    
+    def get(self, key):
+        """장치의 측정값 (없으면 None)"""
+        return self.load().get(key)
+    
+    def save(self, key, offsets):
+        """장치 측정값 저장 (offsets: {'audio': 초, 'display': 초}, 기존 값 중 측정하지 않은 출력은 유지)"""
+        data = self.load()
+        entry = data.get(key, {})
+        for output, value in offsets.items():
+            entry[f"{output}_ms"] = round(value * 1000.0, 2)
+        entry['updated'] = time.strftime('%Y-%m-%d %H:%M:%S')
+        data[key] = entry
+        
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.path)
+        except Exception:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        return entry
+
+
+def apply_saved_calibration(compensator, master=None, store=None):
+    """저장된 현재 장치의 측정값을 지연 보상기의 장치 오프셋으로 적용 (적용했으면 True)"""
+    entry = (store or CalibrationStore()).get(device_key(master))
+    if not entry:
+        return False
+    compensator.set_device_offsets(
+        display=entry.get('display_ms', 0.0) / 1000.0,
+        audio=entry.get('audio_ms', 0.0) / 1000.0
+    )
+    if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+        print(f"[CALIB] 저장된 장치 지연 적용 - 화면 {entry.get('display_ms', 0.0):.1f}ms, "
+              f"음성 {entry.get('audio_ms', 0.0):.1f}ms ({entry.get('updated', '?')})")
+    return True
+
+
+class CalibrationWindow:
+    """지연 측정 창 (소리/깜빡임에 맞춘 탭 측정, 루프백 측정, 저장)"""
+    
+    def __init__(self, master, compensator, calibrator=None, store=None, on_saved=None):
+        self.master = master
+        self.compensator = compensator
+        self.calibrator = calibrator or LatencyCalibrator()
+        self.store = store or CalibrationStore()
+        self.on_saved = on_saved
+        self.clock = self.calibrator.clock
+        
+        self.results = {}  # 'audio_loopback' / 'audio_taps' / 'display_taps' → 측정 결과
+        self.targets = []
+        self.taps = []
+        self.trial = None
+        self.jobs = []
+        self.loopback_results = queue.Queue()  # 루프백 측정 스레드 → 메인 스레드 결과 전달
+        self.loopback_job = None
+        
+        self.loopback_available = SoundDeviceCapture.is_available() and _numpy_available
+        
+        self.window = tk.Toplevel(master)
+        self.window.title("출력 지연 측정")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        
+        self.flash = tk.Canvas(self.window, width=320, height=160, bg="black", highlightthickness=0)
+        self.flash.pack(padx=10, pady=10)
+        self.flash.bind('<Button-1>', self._on_tap)
+        self.window.bind('<space>', self._on_tap)
+        
+        self.status_label = tk.Label(self.window, text="측정 방식을 선택하세요 (스페이스바 또는 클릭으로 탭)",
+                                     font=("Arial", 10))
+        self.status_label.pack(pady=5)
+        self.result_label = tk.Label(self.window, text="", font=("Arial", 10))
+        self.result_label.pack(pady=5)
+        
+        button_frame = tk.Frame(self.window)
+        button_frame.pack(pady=10)
+        self.buttons = [
+            tk.Button(button_frame, text="소리 탭", width=8, command=lambda: self._start_taps('audio_taps')),
+            tk.Button(button_frame, text="깜빡임 탭", width=8, command=lambda: self._start_taps('display_taps')),
+            tk.Button(button_frame, text="루프백", width=8, command=self._start_loopback,
+                      state=tk.NORMAL if self.loopback_available else tk.DISABLED),
+            tk.Button(button_frame, text="저장", width=8, command=self._save),
+        ]
+        for button in self.buttons:
+            button.pack(side=tk.LEFT, padx=3)
+    
+    def _set_busy(self, busy):
+        """측정 중에는 버튼 비활성화 (루프백은 녹음 장치가 있을 때만 활성화)"""
+        for button in self.buttons:
+            available = button.cget('text') != "루프백" or self.loopback_available
+            button.config(state=tk.NORMAL if available and not busy else tk.DISABLED)
+    
+    def _start_taps(self, trial):
+        """클릭 소리 또는 화면 깜빡임을 일정 간격으로 출력하고 탭 시각 수집"""
+        self.trial = trial
+        self.taps = []
+        self.targets = self.calibrator.tap_targets(self.clock.now() + 1.0)
+        self._set_busy(True)
+        self.status_label.config(text="깜빡임에 맞춰 탭하세요" if trial == 'display_taps' else "소리에 맞춰 탭하세요")
+        
+        for target in self.targets:
+            delay_ms = max(0, int((target - self.clock.now()) * 1000))
+            self.jobs.append(self.window.after(delay_ms, self._emit_cue))
+        finish_ms = int((self.targets[-1] + self.calibrator.period - self.clock.now()) * 1000)
+        self.jobs.append(self.window.after(finish_ms, self._finish_taps))
+    
+    def _emit_cue(self):
+        """목표 시각의 클릭 또는 깜빡임 출력"""
+        if self.trial == 'audio_taps':
+            self.calibrator.play_click()
+        else:
+            self.flash.config(bg="white")
+            self.window.after(80, lambda: self.flash.config(bg="black"))
+    
+    def _on_tap(self, event=None):
+        """탭 시각 기록 (측정 중일 때만)"""
+        if self.trial is not None:
+            self.taps.append(self.clock.now())
+    
+    def _finish_taps(self):
+        """탭 측정 완료 처리"""
+        self.jobs = []
+        result = self.calibrator.measure_taps(self.targets, self.taps)
+        trial, self.trial = self.trial, None
+        self._set_busy(False)
+        if result is None:
+            self.status_label.config(text=f"탭이 부족합니다 ({len(self.taps)}회) - 다시 측정하세요")
+            return
+        self.results[trial] = result
+        self.status_label.config(text=f"측정 완료 - 탭 {result['taps']}회, 편차 {result['spread'] * 1000:.0f}ms")
+        self._show_results()
+    
+    def _start_loopback(self):
+        """루프백 측정 (녹음이 끝날 때까지 걸리므로 별도 스레드에서 실행, Tk 호출은 메인 스레드에서만)"""
+        self._set_busy(True)
+        self.status_label.config(text="클릭 트레인 재생 및 녹음 중...")
+        
+        def run():
+            result = self.calibrator.measure_audio(SoundDeviceCapture(clock=self.clock))
+            self.loopback_results.put(result)
+        threading.Thread(target=run, daemon=True).start()
+        self.loopback_job = self.window.after(LATENCY_CALIBRATION_POLL_MS, self._poll_loopback)
+    
+    def _poll_loopback(self):
+        """루프백 측정 결과가 도착했는지 확인 (메인 스레드에서 주기적으로 실행)"""
+        try:
+            result = self.loopback_results.get_nowait()
+        except queue.Empty:
+            self.loopback_job = self.window.after(LATENCY_CALIBRATION_POLL_MS, self._poll_loopback)
+            return
+        self.loopback_job = None
+        self._finish_loopback(result)
+    
+    def _finish_loopback(self, result):
+        """루프백 측정 완료 처리 (메인 스레드)"""
+        self._set_busy(False)
+        if result is None or result['confidence'] < 5.0:
+            self.status_label.config(text="녹음에서 클릭을 찾지 못했습니다 - 입력 장치를 확인하세요")
+            return
+        self.results['audio_loopback'] = result
+        self.status_label.config(text=f"루프백 측정 완료 - 신뢰도 {result['confidence']:.1f}")
+        self._show_results()
+    
+    def _show_results(self):
+        """지금까지의 측정으로 계산한 장치 오프셋 표시"""
+        offsets = self.calibrator.combine(**self.results)
+        text = " / ".join(f"{'화면' if output == 'display' else '음성'} {value * 1000:.1f}ms"
+                          for output, value in sorted(offsets.items()))
+        self.result_label.config(text=f"추정 지연: {text}")
+    
+    def _save(self):
+        """현재 장치의 측정값 저장 후 보상기에 즉시 적용"""
+        offsets = self.calibrator.combine(**self.results)
+        if not offsets:
+            self.status_label.config(text="저장할 측정값이 없습니다")
+            return
+        entry = self.store.save(device_key(self.master), offsets)
+        self.compensator.set_device_offsets(**offsets)
+        self.status_label.config(text="저장 완료 - 다음 재생부터 적용됩니다")
+        if self.on_saved:
+            self.on_saved(entry)
+    
+    def close(self):
+        """예약된 출력 취소 후 창 닫기"""
+        for job in self.jobs:
+            self.window.after_cancel(job)
+        self.jobs = []
+        if self.loopback_job is not None:
+            self.window.after_cancel(self.loopback_job)
+            self.loopback_job = None
+        self.window.destroy()
@@ -0,0 +1,130 @@
+"""
+RandomPitchPlayer 지연 보상기 (Latency Compensator)
+출력별(화면/음성) 트리거→출력 지연을 추정하여 트리거 시각을 앞당기는 위상 고정 보정
+
+실행 중 측정하는 지연은 소프트웨어가 출력을 넘긴 시각까지입니다. 그 뒤의 장치 지연
+(스피커/디스플레이)은 latency_calibration에서 측정해 저장한 장치 오프셋으로 더해집니다.
+"""
+import threading
+from config import (LATENCY_COMPENSATION_ENABLED, LATENCY_MAX_OFFSET_MS, LATENCY_SMOOTHING,
+                    LATENCY_OUTLIER_MS)
+
+
+class LatencyCompensator:
+    """출력별 지연 추정치를 유지하고 제한된 범위 내에서 보정 오프셋을 제공하는 클래스"""
+    
+    OUTPUTS = ('display', 'audio')
+    
+    def __init__(self, enabled=LATENCY_COMPENSATION_ENABLED, max_offset_ms=LATENCY_MAX_OFFSET_MS,
+                 smoothing=LATENCY_SMOOTHING):
+        self.enabled = enabled
+        self.max_offset = max_offset_ms / 1000.0
+        self.outlier_limit = LATENCY_OUTLIER_MS / 1000.0
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+        
+        # 출력별 상태: 지연 추정치(지수 이동 평균), 적용 오프셋, 샘플 수, 최근 오차
+        self.estimates = {output: None for output in self.OUTPUTS}
+        self.offsets = {output: 0.0 for output in self.OUTPUTS}
+        self.sample_counts = {output: 0 for output in self.OUTPUTS}
+        self.last_errors = {output: 0.0 for output in self.OUTPUTS}
+        self.rejected_count = 0
+        
+        # 장치 지연 측정값 (출력 장치 자체의 지연, 실행 중 측정값과 별도로 유지되며 reset()으로 지우지 않음)
+        self.device_offsets = {output: 0.0 for output in self.OUTPUTS}
+    
+    def set_device_offsets(self, display=None, audio=None):
+        """측정해 둔 장치 지연 적용 (초, None인 출력은 유지)"""
+        with self._lock:
+            if display is not None:
+                self.device_offsets['display'] = max(0.0, display)
+            if audio is not None:
+                self.device_offsets['audio'] = max(0.0, audio)
+    
+    def reset(self):
+        """측정값 및 오프셋 초기화"""
+        with self._lock:
+            for output in self.OUTPUTS:
+                self.estimates[output] = None
+                self.offsets[output] = 0.0
+                self.sample_counts[output] = 0
+                self.last_errors[output] = 0.0
+            self.rejected_count = 0
+    
+    def record(self, output, target_time, observed_time, applied_offset=None):
+        """출력 시각 측정값 반영
+        
+        applied_offset: 해당 비트를 트리거할 때 적용했던 전체 오프셋 (생략 시 현재 오프셋)
+        """
+        with self._lock:
+            if applied_offset is None:
+                applied_offset = self._total_offset(output)
+            
+            # 목표 대비 오차 (양수 = 늦음), 트리거 시각 기준 실제 지연 (장치 지연만큼 앞당긴 부분도 되돌려 계산)
+            error = observed_time - target_time
+            latency = error + applied_offset
+            
+            # 렌더링 정지 등 이상치는 추정에서 제외
+            if latency < 0 or latency > self.outlier_limit:
+                self.rejected_count += 1
+                return
+            
+            estimate = self.estimates[output]
+            if estimate is None:
+                estimate = latency
+            else:
+                estimate += self.smoothing * (latency - estimate)
+            
+            self.estimates[output] = estimate
+            self.last_errors[output] = error
+            self.sample_counts[output] += 1
+            
+            if self.enabled:
+                self.offsets[output] = max(0.0, min(self.max_offset, estimate))
+    
+    def _total_offset(self, output):
+        """측정 오프셋 + 장치 오프셋 (꺼져 있으면 0)"""
+        if not self.enabled:
+            return 0.0
+        return self.offsets.get(output, 0.0) + self.device_offsets.get(output, 0.0)
+    
+    def get_offset(self, output):
+        """출력별 현재 보정 오프셋 반환 (초, 장치 지연 포함)"""
+        return self._total_offset(output)
+    
+    def get_lead_time(self):
+        """타이머가 목표 시각보다 앞서 트리거해야 하는 시간 (모든 출력 중 최대값)"""
+        if not self.enabled:
+            return 0.0
+        return max(self._total_offset(output) for output in self.OUTPUTS)
+    
+    def get_output_time(self, output, target_time):
+        """출력별로 실제 출력을 시작해야 하는 시각"""
+        return target_time - self.get_offset(output)
+    
+    def get_status(self):
+        """현재 보정 상태 반환 (밀리초 단위)"""
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'max_offset_ms': self.max_offset * 1000.0,
+                'rejected': self.rejected_count,
+                'outputs': {
+                    output: {
+                        'offset_ms': self.offsets[output] * 1000.0,
+                        'device_ms': self.device_offsets[output] * 1000.0,
+                        'estimate_ms': (self.estimates[output] or 0.0) * 1000.0,
+                        'last_error_ms': self.last_errors[output] * 1000.0,
+                        'samples': self.sample_counts[output]
+                    }
+                    for output in self.OUTPUTS
+                }
+            }
+    
+    def get_summary_text(self):
+        """디버그 UI용 요약 문자열"""
+        if not self.enabled:
+            return "보정: 꺼짐"
+        display_ms = self._total_offset('display') * 1000.0
+        audio_ms = self._total_offset('audio') * 1000.0
+        return f"보정: 화면 {display_ms:.1f}ms / 음성 {audio_ms:.1f}ms"
@@ -3,16 +3,28 @@ RandomPitchPlayer - 랜덤 음정 플레이어
 BPM 메트로놈 기능을 포함한 메인 애플리케이션
 """
 import tkinter as tk
+import sys
 import time
 import queue
+
+# 헤드리스 실행: 표준 출력은 이벤트(JSON Lines) 전용, 모듈 임포트 중의 로그부터 표준 오류로 보냄
+_headless_stdout = None
+if __name__ == "__main__" and '--headless' in sys.argv[1:]:
+    _headless_stdout, sys.stdout = sys.stdout, sys.stderr
 from config import *
 from pitch_selector import PitchSelector
 from debug_manager import DebugManager
 from timer_manager import TimerManager
-from ui_manager import UIManager
+from ui_manager import UIManager, UIEventQueue
 from timing_utils import TimingUtils
 from power_manager import get_power_manager
 from tts_manager import get_tts_manager
+from tone_engine import get_tone_engine
+from audio_engine import get_audio_engine, cached_pcm_source
+from clock_manager import get_clock
+from latency_compensator import LatencyCompensator
+from latency_calibration import CalibrationWindow, apply_saved_calibration
+from tempo_map import TempoMap, TempoMapError
 
 
 class RandomPitchPlayer:
@@ -20,18 +32,28 @@ class RandomPitchPlayer:
     
     def __init__(self, master):
         self.master = master
+        self.clock = get_clock()  # 공유 단조 시계
         
-        # UI 큐
-        self.ui_queue = queue.Queue()
+        # UI 큐 (타이머 스레드가 항목을 넣으면 메인 루프를 가상 이벤트로 깨움)
+        self.ui_queue = UIEventQueue()
         
         # 컴포넌트 초기화
-        self.debug_manager = DebugManager()
+        self.debug_manager = DebugManager(clock=self.clock)
         self.pitch_selector = PitchSelector()
-        self.ui_manager = UIManager(master, self.debug_manager)
-        self.timer_manager = TimerManager(self.ui_queue, self.debug_manager, self.pitch_selector)
+        self.latency_compensator = LatencyCompensator()  # 출력별 지연 보상
+        apply_saved_calibration(self.latency_compensator, master)  # 저장된 장치 지연 측정값 적용
+        self.calibration_window = None
+        self.ui_manager = UIManager(master, self.debug_manager, clock=self.clock)
+        self.audio_engine = self._create_audio_engine()  # 콜백 오디오 엔진 (AUDIO_ENGINE="callback"일 때만)
+        self.timer_manager = TimerManager(self.ui_queue, self.debug_manager, self.pitch_selector, clock=self.clock,
+                                          latency_compensator=self.latency_compensator,
+                                          audio_engine=self.audio_engine)
         self.power_manager = get_power_manager()  # 전원 매니저 추가
         self.tts_manager = get_tts_manager()      # TTS 매니저 추가
         self.tts_manager.set_master(master)       # tkinter 마스터 설정
+        self.tts_manager.set_debug_manager(self.debug_manager)  # 음성 안내 누락/중단 횟수 기록
+        self.tone_engine = get_tone_engine()      # 음정 소리 합성 엔진
+        self._setup_audio_sources()
         
         # 상태 변수
         self.is_running = False
@@ -48,20 +70,50 @@ class RandomPitchPlayer:
         self._setup_ui_commands()
         self._start_background_tasks()
     
+    def _create_audio_engine(self):
+        """콜백 오디오 엔진 생성 (설정이 꺼져 있거나 사용할 수 없으면 None - 기존 mixer 재생 방식 사용)"""
+        if AUDIO_ENGINE != "callback":
+            return None
+        audio_engine = get_audio_engine()
+        if not audio_engine.available:
+            if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+                print("[MAIN] 콜백 오디오 엔진 사용 불가 - 기존 mixer 재생 방식 사용")
+            return None
+        return audio_engine
+    
+    def _setup_audio_sources(self):
+        """콜백 오디오 엔진에 음 버퍼와 음성 클립 소스 등록"""
+        if self.audio_engine is None:
+            return
+        sample_rate = self.audio_engine.sample_rate
+        voice = cached_pcm_source(self.tts_manager.get_clip_raw, sample_rate, self.audio_engine.channels)
+        self.audio_engine.add_source("tone", lambda pitch: self.tone_engine.get_buffer(pitch, sample_rate))
+        self.audio_engine.add_source("voice", lambda pitch: voice(pitch) if TTS_ENABLED else None,
+                                     lead=self.tts_manager.get_onset_offset)
+    
     def _setup_ui_commands(self):
-        """UI 명령어 설정"""
+        """UI 명령어 및 템포 설정 변경 알림 설정"""
         self.ui_manager.set_button_commands(
             start_command=self.start_playing,
             stop_command=self.stop_playing,
-            debug_command=self.print_debug_info if not RELEASE_MODE else None
+            debug_command=self.print_debug_info if not RELEASE_MODE else None,
+            calibrate_command=self.open_calibration
         )
+        self.ui_manager.tempo_settings.subscribe(self._on_tempo_settings_changed)
+    
+    def open_calibration(self):
+        """출력 지연 측정 창 열기 (재생 중에는 측정 출력이 섞이므로 열지 않음)"""
+        if self.is_running:
+            return
+        if self.calibration_window is not None and self.calibration_window.window.winfo_exists():
+            self.calibration_window.window.lift()
+            return
+        self.calibration_window = CalibrationWindow(self.master, self.latency_compensator)
     
     def _start_background_tasks(self):
         """백그라운드 작업 시작"""
-        self._check_ui_queue()
+        self.ui_queue.bind(self.master, self._check_ui_queue)
         self._check_duration_timer()  # 지속 시간 체크 추가
-        if not RELEASE_MODE:  # 릴리즈 모드에서는 렌더링 체크 비활성화
-            self._check_rendering_completion()
     
     def start_playing(self):
         """음정 재생 시작"""
@@ -72,17 +124,31 @@ class RandomPitchPlayer:
         self.debug_manager.start_session()
         self.pitch_selector.reset()
         
-        # 간격값, BPM, 지속 시간 설정
-        self.current_interval = self.ui_manager.get_interval_value()
-        self.current_bpm = self.ui_manager.get_current_bpm()
+        # 간격값, BPM, 지속 시간 설정 (범위 밖 입력은 제한된 값으로 입력란에도 반영)
+        self.ui_manager.commit_tempo_entries()
+        settings = self.ui_manager.get_tempo_settings()
+        self.current_interval = settings.interval
+        self.current_bpm = settings.bpm
         self.duration_minutes = self.ui_manager.get_duration_minutes()
         
         if self.current_interval <= 0:
             self.ui_manager.set_display_text("오류", "black")
             return
         
+        # 템포 프로그램 (가속/감속 램프, 구간 반복) 해석
+        tempo_program = self.ui_manager.get_tempo_program()
+        tempo_map = None
+        if tempo_program:
+            try:
+                tempo_map = TempoMap.from_spec(tempo_program)
+            except TempoMapError as e:
+                if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+                    print(f"[APP] 템포 프로그램 오류: {e}")
+                self.ui_manager.set_display_text("오류", "black")
+                return
+        
         # 지속 시간 설정
-        self.session_start_time = time.time()
+        self.session_start_time = self.clock.now()
         self.is_duration_limited = self.duration_minutes > 0
         
         if self.is_duration_limited:
@@ -101,8 +167,27 @@ class RandomPitchPlayer:
             # UI 상태 업데이트
             self.ui_manager.update_power_status_display()
         
-        # 타이머 시작
-        self.timer_manager.start_timer(self.current_interval)
+        # 음정 소리 버퍼와 음성 클립 변환 결과를 미리 준비 (타이머 스레드의 첫 비트에서 합성/디코딩하지 않도록)
+        if self.audio_engine is not None:
+            self.tone_engine.prepare(sample_rate=self.audio_engine.sample_rate)
+            self.audio_engine.warm_up(SCALES)
+        else:
+            self.tone_engine.prepare()
+        
+        # 타이머 시작 (콜백 오디오 엔진은 타이머가 첫 비트를 예약하기 전에 시작)
+        if self.audio_engine is not None:
+            self.audio_engine.start()
+        self.timer_manager.start_timer(self.current_interval, tempo_map)
+        
+        # 곧 필요한 음정 순서대로 음성 오디오 생성 우선순위 조정 (첫 음정이 가장 먼저)
+        if TTS_ENABLED:
+            self.tts_manager.prioritize(
+                [self.timer_manager.first_entry.pitch] + self.timer_manager.lookahead.upcoming_pitches()
+            )
+            # 가장 빠른 템포에서도 안내가 비트 안에 끝나도록 시간 압축 버전 미리 생성
+            self.tts_manager.prepare_tempo(
+                tempo_map.min_interval() if tempo_map is not None else self.current_interval
+            )
         
         # 첫 번째 음정 표시
         self._display_first_pitch()
@@ -112,7 +197,10 @@ class RandomPitchPlayer:
             mode = self.ui_manager.get_current_mode()
             duration_text = f"{self.duration_minutes}분" if self.is_duration_limited else "무제한"
             
-            if mode == "bpm":
+            if tempo_map is not None:
+                print(f"[APP] RandomPitchPlayer 시작 - 템포 프로그램: {tempo_program} "
+                      f"({len(tempo_map.sections)}개 구간, {tempo_map.total_duration:.0f}초), 지속시간: {duration_text}")
+            elif mode == "bpm":
                 tempo_desc = TimingUtils.get_bpm_description(self.current_bpm)
                 print(f"[APP] RandomPitchPlayer 시작 - BPM: {self.current_bpm} ({tempo_desc}) = {self.current_interval:.3f}초 간격, 지속시간: {duration_text}")
             else:
@@ -124,6 +212,8 @@ class RandomPitchPlayer:
         
         # 타이머 정지
         self.timer_manager.stop_timer()
+        if self.audio_engine is not None:
+            self.audio_engine.stop()
         
         # 전원 관리 정지 (시스템 기본 절전 설정으로 복원)
         self.power_manager.stop_power_management()
@@ -150,43 +240,57 @@ class RandomPitchPlayer:
         
         # 디버그 정보 자동 출력 (릴리즈 모드에서는 출력하지 않음)
         if ENABLE_PERFORMANCE_ANALYSIS and not RELEASE_MODE:
-            self.debug_manager.print_comprehensive_analysis(self.current_interval)
+            self.debug_manager.print_comprehensive_analysis(
+                self.current_interval, self.timer_manager.get_jitter_stats(),
+                self.latency_compensator.get_status()
+            )
     
     def print_debug_info(self):
         """디버그 정보 출력 (릴리즈 모드에서는 아무것도 하지 않음)"""
         if not RELEASE_MODE:
-            self.debug_manager.print_comprehensive_analysis(self.current_interval)
+            self.debug_manager.print_comprehensive_analysis(
+                self.current_interval, self.timer_manager.get_jitter_stats(),
+                self.latency_compensator.get_status()
+            )
     
     def _display_first_pitch(self):
         """첫 번째 음정 표시"""
-        first_pitch = self.pitch_selector.get_next_pitch()
-        first_color = SCALE_COLORS[first_pitch]
+        first_entry = self.timer_manager.first_entry
+        first_pitch = first_entry.pitch
         
-        actual_time = self.ui_manager.update_pitch_display(first_pitch, first_color)
-        self.debug_manager.record_display_event(first_pitch, time.time(), actual_time, self.current_interval)
+        actual_time = self.ui_manager.update_pitch_display(first_pitch, first_entry.color, first_entry.next_pitch)
+        if self.audio_engine is None:
+            self.tone_engine.play(first_pitch)
+        self.debug_manager.record_display_event(first_pitch, first_entry.target_time, actual_time, self.current_interval)
+        self.timer_manager.release_first_entry()
         
-        # TTS 음성 안내 추가 - 메인 스레드에서 처리하도록 지연 실행
-        if TTS_ENABLED:
+        # TTS 음성 안내 추가 - 메인 스레드에서 처리하도록 지연 실행 (콜백 오디오 엔진은 타이머가 미리 예약)
+        if TTS_ENABLED and self.audio_engine is None:
             try:
                 if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                     print(f"[MAIN] 첫 음정 TTS 예약 - 음정: {first_pitch}")
                 # tkinter.after를 사용하여 메인 스레드에서 TTS 처리
-                self.master.after(50, lambda: self._delayed_tts(first_pitch))
+                self.master.after(TTS_SCHEDULE_DELAY_MS, lambda: self._delayed_tts(first_pitch))
                 if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                     print(f"[MAIN] 첫 음정 TTS 예약 완료")
             except Exception as e:
                 if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                     print(f"[MAIN] TTS 음성 안내 오류 (첫 음정): {e}")
                     print(f"[MAIN] 오류 타입: {type(e).__name__}")
-        else:
+        elif not TTS_ENABLED:
             if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                 print(f"[MAIN] TTS가 비활성화되어 있음 (TTS_ENABLED: {TTS_ENABLED})")
         
         if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
             print(f"[PLAY] {first_pitch} 첫 출력")
     
-    def _delayed_tts(self, pitch):
-        """지연된 TTS 처리 (메인 스레드에서 실행)"""
+    def _delayed_tts(self, pitch, target_time=None):
+        """지연된 TTS 처리 (메인 스레드에서 실행, target_time이 있으면 음성 출력 지연 측정)"""
+        # 다음 비트 전에 시작하지 못하는 안내는 TTS 매니저가 누락 처리
+        deadline = None
+        if target_time is not None:
+            deadline = target_time + self.timer_manager.get_current_interval()
+        
         if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
             print(f"[TTS] _delayed_tts 호출됨 - 음정: {pitch}")
             print(f"[TTS] TTS 매니저 상태 - enabled: {self.tts_manager.tts_enabled if self.tts_manager else None}")
@@ -201,7 +305,10 @@ class RandomPitchPlayer:
             try:
                 if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                     print(f"[TTS] speak_pitch_sync_main_thread 호출 시작")
-                self.tts_manager.speak_pitch_sync_main_thread(pitch)
+                output_time = self.tts_manager.speak_pitch_sync_main_thread(pitch, deadline)
+                if target_time is not None and output_time is not None:
+                    # 채널 재생 시작 시각 + mixer 버퍼 지연 + 음성 시작 위치로 지연 측정 (누락된 안내는 기록하지 않음)
+                    self.latency_compensator.record('audio', target_time, output_time)
                 if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                     print(f"[TTS] speak_pitch_sync_main_thread 호출 완료")
             except Exception as e:
@@ -214,7 +321,7 @@ class RandomPitchPlayer:
                 try:
                     if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                         print(f"[MAIN] 대안으로 비동기 TTS 시도")
-                    self.tts_manager.speak_pitch_async(pitch)
+                    self.tts_manager.speak_pitch_async(pitch, deadline)
                 except Exception as e2:
                     if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                         print(f"[MAIN] 비동기 TTS 오류: {e2}")
@@ -223,60 +330,29 @@ class RandomPitchPlayer:
             try:
                 if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                     print(f"[TTS] speak_pitch_sync_main_thread 없음, 비동기 방식 사용")
-                self.tts_manager.speak_pitch_async(pitch)
+                self.tts_manager.speak_pitch_async(pitch, deadline)
             except Exception as e:
                 if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                     print(f"[MAIN] TTS 음성 안내 오류: {e}")
     
     def _check_ui_queue(self):
-        """UI 큐 처리"""
+        """UI 큐 처리 (타이머 스레드의 가상 이벤트로 호출됨)"""
         processed_count = 0
         
         try:
             while processed_count < MAX_PROCESSED_UPDATES:
                 # 큐에서 UI 업데이트 요청 가져오기 (논블로킹)
-                update_data = self.ui_queue.get_nowait()
-                
-                selected_pitch = update_data['pitch']
-                pitch_color = update_data['color']
-                target_time = update_data['target_time']
-                sequence = update_data['sequence']
+                entry = self.ui_queue.get_nowait()
                 
                 if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
-                    print(f"[UPDATE] {selected_pitch} UI업데이트 요청 - 목표시간: {target_time:.3f}")
-                
-                # UI 업데이트 수행
-                actual_time = self.ui_manager.update_pitch_display(selected_pitch, pitch_color)
+                    print(f"[UPDATE] {entry.pitch} UI업데이트 요청 - 목표시간: {entry.target_time:.3f}")
                 
-                # TTS 음성 안내 추가 - 메인 스레드에서 처리하도록 지연 실행
-                if TTS_ENABLED:
-                    try:
-                        if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
-                            print(f"[MAIN] UI 큐 TTS 예약 - 음정: {selected_pitch}")
-                        # tkinter.after를 사용하여 메인 스레드에서 TTS 처리
-                        self.master.after(50, lambda p=selected_pitch: self._delayed_tts(p))
-                        if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
-                            print(f"[MAIN] UI 큐 TTS 예약 완료")
-                    except Exception as e:
-                        if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
-                            print(f"[MAIN] TTS 음성 안내 오류 (큐 처리): {e}")
-                            print(f"[MAIN] 오류 타입: {type(e).__name__}")
+                # 지연 보상이 적용된 화면 출력 시각까지 남은 시간 (보상으로 일찍 트리거된 경우)
+                display_delay = self.latency_compensator.get_output_time('display', entry.target_time) - self.clock.now()
+                if display_delay > 0.001:
+                    self.master.after(int(display_delay * 1000), lambda e=entry: self._show_entry(e))
                 else:
-                    if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
-                        print(f"[MAIN] TTS가 비활성화되어 있음 (TTS_ENABLED: {TTS_ENABLED})")
-                
-                # 렌더링 완료 대기 목록에 추가 (릴리즈 모드에서는 건너뜀)
-                if not RELEASE_MODE:
-                    self.debug_manager.add_pending_update(sequence, selected_pitch, pitch_color, target_time)
-                
-                # 간격값 및 BPM 업데이트
-                new_interval = self.ui_manager.get_interval_value()
-                new_bpm = self.ui_manager.get_current_bpm()
-                
-                if new_interval != self.current_interval:
-                    self.current_interval = new_interval
-                    self.current_bpm = new_bpm
-                    self.timer_manager.update_interval(new_interval)
+                    self._show_entry(entry)
                 
                 processed_count += 1
                     
@@ -286,52 +362,95 @@ class RandomPitchPlayer:
             if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                 print(f"[ERROR] UI 큐 처리 오류: {e}")
         
-        # UI 큐 체크 반복
-        self.master.after(UI_QUEUE_CHECK_MS, self._check_ui_queue)
+        # 한 번에 처리하지 못한 항목은 유휴 시점에 이어서 처리
+        self.ui_queue.request_drain()
     
-    def _check_rendering_completion(self):
-        """렌더링 완료 확인 (릴리즈 모드에서는 실행되지 않음)"""
-        if RELEASE_MODE:
+    def _on_tempo_settings_changed(self, settings, old_settings):
+        """템포 설정 변경 알림 처리 (입력 변경 시 한 번만 호출, 재생 중이면 타이머에 즉시 반영)"""
+        if not self.is_running or settings.interval == self.current_interval:
             return
-            
+        
+        self.current_interval = settings.interval
+        self.current_bpm = settings.bpm
+        self.timer_manager.update_interval(settings.interval)
+        if TTS_ENABLED:
+            self.tts_manager.prepare_tempo(settings.interval)
+    
+    def _show_entry(self, entry):
+        """비트 항목 화면 출력 및 음성 안내 예약 (처리 후 이벤트는 풀에 반환)"""
         if not self.is_running:
-            self.master.after(RENDER_CHECK_MS, self._check_rendering_completion)
+            entry.release()
+            return
+        
+        selected_pitch = entry.pitch
+        target_time = entry.target_time
+        sequence = entry.sequence
+        color = entry.color
+        next_pitch = entry.next_pitch
+        
+        # 렌더링 완료 대기 목록에 추가 (릴리즈 모드에서는 바로 풀에 반환되므로 이후 entry 사용 금지)
+        self.debug_manager.add_pending_update(entry)
+        
+        # UI 업데이트 수행 - 실제 그리기가 끝난 시각은 콜백으로 측정
+        self.ui_manager.update_pitch_display(
+            selected_pitch, color, next_pitch,
+            on_rendered=lambda render_time: self._on_pitch_rendered(sequence, target_time, render_time)
+        )
+        
+        # 음정 소리 재생 (캐시된 버퍼를 mixer에 넘기기만 함, 콜백 오디오 엔진은 타이머가 미리 예약)
+        if self.audio_engine is None:
+            self.tone_engine.play(selected_pitch)
+        
+        # TTS 음성 안내 추가 - 메인 스레드에서 처리하도록 지연 실행 (콜백 오디오 엔진은 타이머가 미리 예약)
+        if TTS_ENABLED and self.audio_engine is None:
+            try:
+                if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+                    print(f"[MAIN] UI 큐 TTS 예약 - 음정: {selected_pitch}")
+                # 보상 모드에서는 음성 출력 지연과 클립의 음성 시작 여유만큼 앞당긴 시각에, 아니면 고정 지연 후 실행
+                if self.latency_compensator.enabled:
+                    output_time = self.latency_compensator.get_output_time('audio', target_time)
+                    audio_delay = output_time - self.tts_manager.get_onset_offset(selected_pitch) - self.clock.now()
+                    delay_ms = max(0, int(audio_delay * 1000))
+                else:
+                    delay_ms = TTS_SCHEDULE_DELAY_MS
+                self.master.after(delay_ms, lambda p=selected_pitch, t=target_time: self._delayed_tts(p, t))
+                if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+                    print(f"[MAIN] UI 큐 TTS 예약 완료")
+            except Exception as e:
+                if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+                    print(f"[MAIN] TTS 음성 안내 오류 (큐 처리): {e}")
+                    print(f"[MAIN] 오류 타입: {type(e).__name__}")
+        elif not TTS_ENABLED:
+            if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+                print(f"[MAIN] TTS가 비활성화되어 있음 (TTS_ENABLED: {TTS_ENABLED})")
+    
+    def _on_pitch_rendered(self, sequence, target_time, render_time):
+        """음정 표시가 실제로 그려진 직후 호출 (표시 갱신에서 예약한 after_idle 콜백)"""
+        self.latency_compensator.record('display', target_time, render_time)
+        
+        if RELEASE_MODE:
+            return
+        
+        pending_entry = self.debug_manager.pending_updates.get(sequence)
+        if pending_entry is None:
             return
         
         try:
-            completed_updates = []
-            
-            for sequence, update_info in self.debug_manager.pending_updates.items():
-                expected_text = update_info['pitch']
-                target_time = update_info['target_time']
-                
-                # 실제 화면에 반영되었는지 확인
-                if self.ui_manager.check_rendering_completion(expected_text):
-                    # 렌더링 완료! 실제 출력 시간 기록
-                    actual_render_time = time.time()
-                    self.debug_manager.record_display_event(
-                        expected_text, target_time, actual_render_time, self.current_interval
-                    )
-                    completed_updates.append(sequence)
-                    
-                    if ENABLE_CONSOLE_LOGS:
-                        print(f"[DONE] {expected_text} 렌더링 완료 확인 - 화면반영시간: {actual_render_time:.3f}")
-            
-            # 완료된 업데이트 제거
-            for sequence in completed_updates:
-                self.debug_manager.complete_pending_update(sequence)
+            self.debug_manager.record_display_event(
+                pending_entry.pitch, target_time, render_time, self.current_interval
+            )
+            if ENABLE_CONSOLE_LOGS:
+                print(f"[DONE] {pending_entry.pitch} 렌더링 완료 - 화면반영시간: {render_time:.6f}")
+            self.debug_manager.complete_pending_update(sequence)
             
             # 디버그 정보 업데이트 (BPM 정보 포함)
             if ENABLE_DEBUG_UI:
-                debug_text = self.debug_manager.get_debug_summary()
+                debug_text = f"{self.debug_manager.get_debug_summary()} | {self.latency_compensator.get_summary_text()}"
                 self.ui_manager.update_debug_info(debug_text)
                 
         except Exception as e:
             if ENABLE_CONSOLE_LOGS:
-                print(f"[ERROR] 렌더링 확인 오류: {e}")
-        
-        # 렌더링 완료 확인 반복
-        self.master.after(RENDER_CHECK_MS, self._check_rendering_completion)
+                print(f"[ERROR] 렌더링 완료 처리 오류: {e}")
     
     def _duration_completed(self):
         """지속 시간 완료 처리"""
@@ -346,7 +465,7 @@ class RandomPitchPlayer:
     def _check_duration_timer(self):
         """지속 시간 확인 및 남은 시간 업데이트"""
         if self.is_running and self.is_duration_limited:
-            current_time = time.time()
+            current_time = self.clock.now()
             
             if current_time >= self.duration_end_time:
                 # 지속 시간 완료
@@ -364,6 +483,7 @@ class RandomPitchPlayer:
         try:
             # 먼저 재생 정지
             self.stop_playing()
+            self.ui_queue.close()
             
             # TTS 리소스 우선 정리 (COM 객체 문제 방지)
             if hasattr(self, 'tts_manager') and hasattr(self.tts_manager, 'cleanup'):
@@ -377,6 +497,10 @@ class RandomPitchPlayer:
                     if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                         print(f"[MAIN] TTS 리소스 정리 오류 (무시됨): {e}")
             
+            # 음 합성 캐시 정리
+            if hasattr(self, 'tone_engine'):
+                self.tone_engine.cleanup()
+            
             # 전원 관리 리소스 정리
             if hasattr(self, 'power_manager') and hasattr(self.power_manager, 'cleanup'):
                 try:
@@ -405,7 +529,11 @@ MusicScaleApp = RandomPitchPlayer
 
 
 def main():
-    """메인 함수"""
+    """메인 함수 (--headless 인자가 있으면 tkinter 없이 헤드리스 세션 실행)"""
+    if '--headless' in sys.argv[1:]:
+        from session import main as headless_main
+        return headless_main([arg for arg in sys.argv[1:] if arg != '--headless'], event_stream=_headless_stdout)
+    
     root = tk.Tk()
     app = RandomPitchPlayer(root)
     
@@ -0,0 +1,286 @@
+"""
+RandomPitchPlayer 오프라인 세션 렌더링
+연습용 음원 파일(WAV/FLAC)을 실시간보다 훨씬 빠르게 만들어 내는 렌더러
+
+- 가상 시계로 TimerManager.run_until을 실행하여 실제 재생과 같은 PitchSelector/비트 일정을 사용
+- 콜백 오디오 엔진을 buffer 모드로 두고, 비트가 발행될 때마다 그 시각까지 고정 크기 블록을 합성해
+  곧바로 파일에 기록 (세션 길이와 관계없이 메모리에는 선행 버퍼 범위의 클립만 남음)
+- 음성 클립은 비트 간격에 맞는 시간 압축 버전을 골라 믹싱하고, 음 소리/클릭도 같은 엔진 소스로 합성
+- 음원과 같은 이름의 JSON 파일에 비트별 음정과 시각(초, 프레임)을 스트리밍으로 기록
+"""
+import json
+import os
+import time
+import wave
+from config import (SCALES, PITCH_FREQUENCIES, DEFAULT_DURATION_MINUTES, TONE_ENABLED, TONE_TIMBRE,
+                    TONE_DURATION, TONE_VOLUME, AUDIO_SAMPLE_RATE, AUDIO_CHANNELS, AUDIO_CLICK_ENABLED, TTS_SPEED_BUCKETS, TTS_FIT_RATIO,
+                    OFFLINE_RENDER_BLOCK_SIZE, OFFLINE_RENDER_PREROLL, OFFLINE_RENDER_CLIP_TIMEOUT,
+                    ENABLE_CONSOLE_LOGS, RELEASE_MODE)
+from audio_engine import AudioEngine, cached_pcm_source, make_click, _numpy_available
+from clock_manager import VirtualClock
+from debug_manager import DebugManager
+from pitch_selector import PitchSelector
+from timer_manager import TimerManager
+from tempo_map import TempoMap
+import clip_processing
+
+if _numpy_available:
+    import numpy as np
+
+# soundfile 임포트 (없으면 FLAC 출력만 비활성화, WAV는 표준 라이브러리로 기록)
+try:
+    import soundfile
+    _soundfile_available = True
+except ImportError:
+    _soundfile_available = False
+
+
+class RenderError(Exception):
+    """렌더링을 시작할 수 없을 때 발생 (출력 형식 미지원, 라이브러리 없음 등)"""
+    pass
+
+
+def is_available():
+    """오프라인 렌더링 사용 가능 여부 (NumPy 필요)"""
+    return _numpy_available
+
+
+def sidecar_path(path):
+    """음원 파일과 같은 이름의 JSON 경로 (practice.wav → practice.json)"""
+    return os.path.splitext(path)[0] + ".json"
+
+
+class AudioFileWriter:
+    """float32 (프레임, 채널) 블록을 16비트 PCM 음원 파일에 이어 쓰는 기록기 (형식은 확장자로 결정)"""
+    
+    def __init__(self, path, sample_rate, channels):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frames_written = 0
+        self.format = os.path.splitext(path)[1].lower().lstrip(".")
+        
+        if self.format == "wav":
+            self._file = wave.open(path, 'wb')
+            self._file.setnchannels(channels)
+            self._file.setsampwidth(2)
+            self._file.setframerate(sample_rate)
+        elif self.format == "flac":
+            if not _soundfile_available:
+                raise RenderError("FLAC 출력에는 soundfile 라이브러리가 필요합니다 (WAV는 추가 라이브러리 없이 가능)")
+            self._file = soundfile.SoundFile(path, 'w', samplerate=sample_rate, channels=channels,
+                                             format='FLAC', subtype='PCM_16')
+        else:
+            raise RenderError(f"지원하지 않는 출력 형식: {path} (.wav 또는 .flac)")
+    
+    def write(self, block):
+        """블록 하나 기록 (-1.0 ~ 1.0 범위로 잘라 16비트로 변환)"""
+        if len(block) == 0:
+            return
+        pcm = (np.clip(block, -1.0, 1.0) * 32767).astype(np.int16)
+        if self.format == "wav":
+            self._file.writeframes(np.ascontiguousarray(pcm).tobytes())
+        else:
+            self._file.write(pcm)
+        self.frames_written += len(block)
+    
+    def close(self):
+        """파일 닫기 (WAV 헤더의 프레임 수는 이때 갱신됨)"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SidecarWriter:
+    """비트별 음정/시각 목록을 JSON 파일에 스트리밍 기록 (비트를 메모리에 모으지 않음)"""
+    
+    def __init__(self, path, **header):
+        self.path = path
+        self.count = 0
+        self._file = open(path, 'w', encoding='utf-8')
+        fields = "".join(f"  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},\n"
+                         for key, value in header.items())
+        self._file.write("{\n" + fields + '  "beats": [')
+    
+    def add_beat(self, sequence, pitch, seconds, frame, bpm):
+        """비트 하나 기록 (seconds/frame: 음원 시작 기준, bpm: 그 비트 시점의 템포)"""
+        separator = "," if self.count else ""
+        beat = {'sequence': sequence, 'pitch': pitch, 'time': round(seconds, 6), 'frame': frame, 'bpm': round(bpm, 3)}
+        self._file.write(f"{separator}\n    {json.dumps(beat, ensure_ascii=False)}")
+        self.count += 1
+    
+    def close(self, **footer):
+        """비트 목록을 닫고 요약 필드를 붙여 파일 닫기"""
+        if self._file is None:
+            return
+        fields = "".join(f",\n  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)}"
+                         for key, value in footer.items())
+        self._file.write("\n  ]" + fields + "\n}\n")
+        self._file.close()
+        self._file = None
+
+
+class _VoiceSource:
+    """음성 클립 소스 - 현재 비트 간격에 들어가는 시간 압축 버전을 골라 엔진 형식으로 캐시
+    
+    실시간 재생은 백그라운드에서 만든 버전 중 준비된 것을 고르지만, 렌더링은 결과가 매번 같아야 하므로
+    필요한 (음정, 속도) 버전을 그 자리에서 만들어 캐시합니다 (음정 수 × 속도 단계 수를 넘지 않음).
+    """
+    
+    def __init__(self, tts_manager, timer_manager, sample_rate, channels):
+        self.tts_manager = tts_manager
+        self.timer_manager = timer_manager
+        self.sample_rate = sample_rate
+        self.base = cached_pcm_source(tts_manager.get_clip_raw, sample_rate, channels)
+        self.cache = {}  # (음정, 속도) → (프레임, 채널) 배열
+    
+    def _speed(self, frames):
+        """현재 비트 간격에 맞는 속도 단계"""
+        interval = self.timer_manager.get_current_interval()
+        return clip_processing.speed_bucket(len(frames) / self.sample_rate, interval, TTS_SPEED_BUCKETS,
+                                            TTS_FIT_RATIO)
+    
+    def frames(self, pitch):
+        """엔진 provider: 현재 간격에 맞는 클립 프레임 (클립이 없으면 None)"""
+        frames = self.base(pitch)
+        if frames is None:
+            return None
+        speed = self._speed(frames)
+        if speed == 1.0:
+            return frames
+        key = (pitch, speed)
+        compressed = self.cache.get(key)
+        if compressed is None:
+            mono = clip_processing.time_compress(frames.mean(axis=1), speed, self.sample_rate)
+            compressed = np.ascontiguousarray(np.repeat(mono[:, np.newaxis], frames.shape[1], axis=1))
+            self.cache[key] = compressed
+        return compressed
+    
+    def lead(self, pitch):
+        """엔진 lead: 음성 시작 위치 (시간 압축 버전은 온셋도 속도만큼 짧아짐)"""
+        frames = self.base(pitch)
+        onset = self.tts_manager.get_onset_offset(pitch)
+        if frames is None or onset == 0.0:
+            return onset
+        return onset / self._speed(frames)
+
+
+class SessionRenderer:
+    """가상 시계로 세션 전체를 음원 파일과 비트 목록 JSON으로 렌더링"""
+    
+    def __init__(self, interval, tempo_map=None, duration_minutes=DEFAULT_DURATION_MINUTES, tts_manager=None, tone=TONE_ENABLED,
+                 click=AUDIO_CLICK_ENABLED, sample_rate=AUDIO_SAMPLE_RATE, channels=AUDIO_CHANNELS,
+                 block_size=OFFLINE_RENDER_BLOCK_SIZE, preroll=OFFLINE_RENDER_PREROLL):
+        if not _numpy_available:
+            raise RenderError("오프라인 렌더링에는 numpy 라이브러리가 필요합니다")
+        
+        self.interval = interval
+        self.tempo_map = tempo_map or TempoMap.constant(interval)
+        self.duration_minutes = duration_minutes
+        self.preroll = preroll
+        self.clock = VirtualClock()
+        
+        debug_manager = DebugManager(clock=self.clock)
+        debug_manager.debug_mode = False
+        debug_manager.enable_logs = False
+        self.pitch_selector = PitchSelector()
+        self.engine = AudioEngine(clock=self.clock, backend="buffer", sample_rate=sample_rate,
+                                  channels=channels, block_size=block_size)
+        self.timer_manager = TimerManager(self, debug_manager, self.pitch_selector,
+                                          scheduler_mode="precise", clock=self.clock,
+                                          audio_engine=self.engine)
+        self._setup_sources(tts_manager, tone, click)
+        
+        self.writer = None
+        self.sidecar = None
+        self.program_start = 0.0  # 템포 맵 시작 시각 (가상 시계 기준)
+    
+    def _setup_sources(self, tts_manager, tone, click):
+        """엔진 소스 구성 (실시간 재생과 같은 음 버퍼/음성 클립/클릭)"""
+        sample_rate = self.engine.sample_rate
+        self.engine.sources = []
+        if tone:
+            tone_cache = {}
+            
+            def tone_buffer(pitch):
+                samples = tone_cache.get(pitch)
+                if samples is None and pitch in PITCH_FREQUENCIES:
+                    from tone_engine import render_tone
+                    samples = render_tone(PITCH_FREQUENCIES[pitch], TONE_DURATION, TONE_TIMBRE, sample_rate)
+                    samples = tone_cache[pitch] = samples * TONE_VOLUME
+                return samples
+            self.engine.add_source("tone", tone_buffer)
+        if tts_manager is not None:
+            voice = _VoiceSource(tts_manager, self.timer_manager, sample_rate, self.engine.channels)
+            self.engine.add_source("voice", voice.frames, lead=voice.lead)
+        if click:
+            click_buffer = make_click(sample_rate)
+            self.engine.add_source("click", lambda pitch: click_buffer)
+    
+    def put(self, entry, block=True, timeout=None):
+        """TimerManager의 UI 큐 역할 - 비트 시각까지 합성해 기록하고 비트 목록에 추가"""
+        self.writer.write(self.engine.render_until(self.clock.now()))
+        frame = self.engine.time_to_frame(entry.target_time)
+        bpm = self.timer_manager.tempo_map.bpm_at(entry.target_time - self.program_start)
+        self.sidecar.add_beat(entry.sequence, entry.pitch, frame / self.engine.sample_rate, frame, bpm)
+        entry.release()
+    
+    def render(self, path):
+        """세션 전체를 path(.wav/.flac)와 같은 이름의 JSON으로 렌더링 후 요약 반환"""
+        self.writer = AudioFileWriter(path, self.engine.sample_rate, self.engine.channels)
+        self.sidecar = SidecarWriter(
+            sidecar_path(path),
+            audio=os.path.basename(path),
+            sample_rate=self.engine.sample_rate,
+            channels=self.engine.channels,
+            program=self.tempo_map.describe(),
+            duration_minutes=self.duration_minutes,
+            preroll=self.preroll,
+            sources=[source[0] for source in self.engine.sources]
+        )
+        
+        wall_start = time.perf_counter()
+        try:
+            self.pitch_selector.reset()
+            self.engine.start()
+            self.clock.advance(self.preroll)  # 첫 비트의 음성 앞 여유가 음원 시작 전으로 잘리지 않도록
+            self.program_start = self.clock.now()
+            end_time = self.program_start + self.duration_minutes * 60
+            self.timer_manager.run_until(end_time, self.interval, self.tempo_map)
+            self._finish(end_time)
+        finally:
+            self.writer.close()
+            seconds = self.writer.frames_written / self.engine.sample_rate
+            wall_elapsed = time.perf_counter() - wall_start
+            self.sidecar.close(frames=self.writer.frames_written, seconds=round(seconds, 6))
+            self.engine.stop()
+        
+        summary = {
+            'path': path,
+            'sidecar': self.sidecar.path,
+            'beats': self.sidecar.count,
+            'seconds': seconds,
+            'wall_elapsed': wall_elapsed,
+            'speed': seconds / max(wall_elapsed, 1e-9),
+            'late': self.engine.mixer.late_count
+        }
+        if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+            print(f"[RENDER] {path} - 비트 {summary['beats']}회, {seconds:.1f}초 분량을 "
+                  f"{wall_elapsed:.2f}초에 렌더링 ({summary['speed']:.0f}배속)")
+        return summary
+    
+    def _finish(self, end_time):
+        """종료 시각 이후로 미리 예약된 비트를 지우고, 이미 시작한 클립은 끝까지 기록"""
+        self.writer.write(self.engine.render_until(end_time))
+        self.engine.mixer.cancel_from(self.engine.time_to_frame(end_time))
+        while self.engine.mixer.pending_count():
+            self.writer.write(self.engine.mixer.render(self.engine.block_size))
+
+
+def prepare_voice(tts_manager, timeout=OFFLINE_RENDER_CLIP_TIMEOUT):
+    """모든 음정 클립이 준비될 때까지 대기 (준비되지 않은 음정은 렌더링에서 빠짐), 준비된 음정 수 반환"""
+    ready = [pitch for pitch in SCALES if tts_manager.wait_until_ready(pitch, timeout)]
+    if len(ready) < len(SCALES) and ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+        missing = ", ".join(pitch for pitch in SCALES if pitch not in ready)
+        print(f"[RENDER] 음성 클립 준비 실패: {missing}")
+    return len(ready)
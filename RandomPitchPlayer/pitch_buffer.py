@@ -0,0 +1,153 @@
+"""
+RandomPitchPlayer 음정 선행 버퍼 (Lookahead Buffer)
+다음 N개 비트의 음정/색상/목표 시각을 미리 계산해 두는 링 버퍼
+"""
+import threading
+from config import SCALE_COLORS, LOOKAHEAD_BUFFER_SIZE, BEAT_EVENT_POOL_SIZE
+from tempo_map import TempoMap
+from beat_event import BeatEventPool
+
+
+class PitchLookaheadBuffer:
+    """다음 비트들을 미리 계산해 두는 고정 크기 링 버퍼"""
+    
+    def __init__(self, pitch_selector, size=LOOKAHEAD_BUFFER_SIZE):
+        self.pitch_selector = pitch_selector
+        self.size = max(2, size)
+        
+        # 비트 이벤트 풀 (버퍼 항목 + 소비자가 아직 돌려주지 않은 항목을 감당할 크기)
+        self.event_pool = BeatEventPool(max(BEAT_EVENT_POOL_SIZE, self.size * 2))
+        
+        # 링 버퍼 저장소
+        self._entries = [None] * self.size
+        self._head = 0   # 다음에 발행할 항목 인덱스
+        self._count = 0  # 버퍼에 남은 항목 수
+        self._lock = threading.Lock()
+        
+        # 목표 시각 계산 기준 (anchor_time + tempo_map.beat_time(sequence - anchor_sequence))
+        self.tempo_map = TempoMap.constant(1.0)
+        self.anchor_time = 0.0
+        self.anchor_sequence = 0
+        self.next_sequence = 0
+        
+        # 마지막으로 발행한 비트 (이벤트 객체는 소비자가 풀에 반환하므로 값만 보관)
+        self.last_published_time = None
+        self.last_published_sequence = None
+        
+        # 한 박자 앞서 선택해 둔 음정 (미리보기용)
+        self._upcoming_pitch = None
+    
+    def reset(self, start_time, tempo_map):
+        """버퍼 초기화 후 채우기 (sequence 0 = start_time)"""
+        with self._lock:
+            self.tempo_map = tempo_map
+            self.anchor_time = start_time
+            self.anchor_sequence = 0
+            self.next_sequence = 0
+            self.last_published_time = None
+            self.last_published_sequence = None
+            self._release_pending_locked()
+            self._head = 0
+            self._count = 0
+            self._upcoming_pitch = self.pitch_selector.get_next_pitch()
+            self._fill_locked()
+    
+    def fill(self):
+        """빈 슬롯을 새 항목으로 채우기 (발행 직후, 마감 시각이 아닌 시점에 호출)
+        
+        새로 채운 비트의 (sequence, 음정, 목표 시각) 목록을 반환합니다.
+        """
+        with self._lock:
+            return self._fill_locked()
+    
+    def _fill_locked(self):
+        """잠금을 보유한 상태에서 빈 슬롯 채우기 (새로 채운 비트 목록 반환)"""
+        filled = []
+        while self._count < self.size:
+            pitch = self._upcoming_pitch
+            self._upcoming_pitch = self.pitch_selector.get_next_pitch()
+            sequence = self.next_sequence
+            self.next_sequence += 1
+            
+            index = (self._head + self._count) % self.size
+            self._entries[index] = self.event_pool.acquire(
+                pitch, SCALE_COLORS[pitch], self._target_time(sequence), sequence, self._upcoming_pitch
+            )
+            self._count += 1
+            filled.append((sequence, pitch, self._entries[index].target_time))
+        return filled
+    
+    def _release_pending_locked(self):
+        """발행되지 않은 항목을 풀에 반환 (잠금 보유 상태에서 호출)"""
+        for offset in range(self._count):
+            index = (self._head + offset) % self.size
+            self._entries[index].release()
+            self._entries[index] = None
+    
+    def _target_time(self, sequence):
+        """시퀀스 번호에 해당하는 목표 시각 (누적 오차 없는 닫힌 형태)"""
+        return self.anchor_time + self.tempo_map.beat_time(sequence - self.anchor_sequence)
+    
+    def peek(self):
+        """다음 발행 예정 항목 반환 (없으면 None)"""
+        entry = self._entries[self._head]
+        return entry if self._count else None
+    
+    def peek_time(self):
+        """다음 발행 예정 항목의 목표 시각"""
+        entry = self.peek()
+        return entry.target_time if entry is not None else None
+    
+    def publish(self):
+        """다음 항목을 발행하고 인덱스만 전진 (마감 시각의 유일한 작업)
+        
+        발행된 이벤트의 소유권은 소비자에게 넘어가며, 마지막 소비자가 release()를 호출합니다.
+        """
+        with self._lock:
+            if not self._count:
+                self._fill_locked()
+            entry = self._entries[self._head]
+            self._entries[self._head] = None
+            self._head = (self._head + 1) % self.size
+            self._count -= 1
+            self.last_published_time = entry.target_time
+            self.last_published_sequence = entry.sequence
+            return entry
+    
+    def retime(self, tempo_map):
+        """템포 변경 시 다음 비트 이후 항목들의 목표 시각 재계산 (다음 비트는 예정 시각 유지)"""
+        with self._lock:
+            head_entry = self._entries[self._head] if self._count else None
+            if head_entry is not None:
+                self.anchor_time = head_entry.target_time
+                self.anchor_sequence = head_entry.sequence
+            elif self.last_published_time is not None:
+                self.anchor_time = self.last_published_time
+                self.anchor_sequence = self.last_published_sequence
+            self.tempo_map = tempo_map
+            
+            # 아직 발행되지 않은 항목이므로 제자리에서 갱신
+            for offset in range(self._count):
+                entry = self._entries[(self._head + offset) % self.size]
+                entry.target_time = self._target_time(entry.sequence)
+    
+    def current_interval(self):
+        """다음 비트까지의 현재 템포 간격 (초)"""
+        with self._lock:
+            sequence = self._entries[self._head].sequence if self._count else self.next_sequence
+            return self.tempo_map.interval_at_beat(sequence - self.anchor_sequence)
+    
+    def upcoming_beats(self):
+        """앞으로 발행될 비트의 (sequence, 음정, 목표 시각) 목록 (이벤트 객체는 넘기지 않음)"""
+        with self._lock:
+            beats = []
+            for offset in range(self._count):
+                entry = self._entries[(self._head + offset) % self.size]
+                beats.append((entry.sequence, entry.pitch, entry.target_time))
+            return beats
+    
+    def upcoming_pitches(self, limit=None):
+        """앞으로 발행될 음정 목록 (순서대로)"""
+        with self._lock:
+            count = self._count if limit is None else min(limit, self._count)
+            return [self._entries[(self._head + offset) % self.size].pitch for offset in range(count)]
@@ -0,0 +1,151 @@
+"""
+RandomPitchPlayer 음정 글리프 캔버스
+음정별 텍스트 항목을 미리 만들어 두고 비트마다 표시 상태만 바꾸는 캔버스 표시 방식
+
+큰 폰트의 Label은 텍스트를 바꿀 때마다 크기를 다시 측정하고 창 전체 배치를 다시 계산합니다.
+캔버스 방식은 음정/색상별 항목을 현재 폰트 크기로 미리 만들어 두므로 비트마다 숨김/표시만 전환하고,
+바뀐 영역만 다시 그립니다. 폰트 크기가 바뀌면 유휴 시간에 한 항목씩 새로 만들어 교체합니다.
+
+Label 방식 대비 비용은 아직 측정되지 않았으므로 기본값은 "label"입니다
+(디스플레이가 있는 환경에서 `python benchmark.py render`로 비교).
+"""
+import tkinter as tk
+import tkinter.font as tkFont
+from config import SCALES, SCALE_COLORS, ENABLE_CONSOLE_LOGS, RELEASE_MODE
+
+
+class PitchGlyphCanvas:
+    """음정별 텍스트 항목 캐시를 가진 표시용 캔버스"""
+    
+    def __init__(self, master, font_family, font_size, pitches=None, colors=None):
+        self.master = master
+        self.font_family = font_family
+        self.font_size = font_size
+        self.pitches = list(pitches or SCALES)
+        self.colors = colors or SCALE_COLORS
+        
+        self.canvas = tk.Canvas(master, highlightthickness=0, bd=0, bg=master.cget('bg'))
+        self.center = (0, 0)
+        
+        # 현재 사용 중인 캐시 (음정 → 캔버스 항목 ID)
+        self.font = self._create_font(font_size)
+        self.glyph_items = {}
+        self.message_item = None  # 준비/STOP/오류 등 임의 텍스트용 항목
+        self.visible_item = None
+        
+        # 백그라운드 재생성 상태 (완료될 때까지 기존 캐시로 표시)
+        self._rebuild_font = None
+        self._rebuild_items = {}
+        self._rebuild_queue = []
+        self._rebuild_job = None
+        self.rebuild_count = 0
+        
+        self._build_all()
+        self.canvas.bind('<Configure>', self._on_resize)
+    
+    def pack(self, **kwargs):
+        self.canvas.pack(**kwargs)
+    
+    def _create_font(self, size):
+        return tkFont.Font(family=self.font_family, size=size, weight="bold")
+    
+    def _create_glyph(self, pitch, font):
+        """음정 항목 하나 생성 (숨김 상태)"""
+        return self.canvas.create_text(
+            self.center[0], self.center[1], text=pitch, font=font,
+            fill=self.colors.get(pitch, "black"), anchor="center", state="hidden"
+        )
+    
+    def _build_all(self):
+        """현재 폰트로 전체 캐시를 즉시 생성"""
+        self.glyph_items = {pitch: self._create_glyph(pitch, self.font) for pitch in self.pitches}
+        self.message_item = self.canvas.create_text(
+            self.center[0], self.center[1], text="", font=self.font, fill="black",
+            anchor="center", state="hidden"
+        )
+    
+    def show_pitch(self, pitch, color=None):
+        """음정 표시 (캐시된 항목의 표시 상태만 전환, 캐시에 없는 조합은 메시지 항목 사용)"""
+        item = self.glyph_items.get(pitch)
+        if item is None or (color is not None and color != self.colors.get(pitch)):
+            self.show_text(pitch, color or "black")
+            return
+        self._swap_visible(item)
+    
+    def show_text(self, text, color="black"):
+        """임의 텍스트 표시"""
+        self.canvas.itemconfigure(self.message_item, text=text, fill=color)
+        self._swap_visible(self.message_item)
+    
+    def _swap_visible(self, item):
+        """보이는 항목 교체"""
+        if item == self.visible_item:
+            return
+        if self.visible_item is not None:
+            self.canvas.itemconfigure(self.visible_item, state="hidden")
+        self.canvas.itemconfigure(item, state="normal")
+        self.visible_item = item
+    
+    def _on_resize(self, event):
+        """캔버스 크기 변경 시 모든 항목을 중앙으로 이동"""
+        self.center = (event.width // 2, event.height // 2)
+        for item in self.canvas.find_all():
+            self.canvas.coords(item, self.center[0], self.center[1])
+    
+    def rebuild(self, font_size):
+        """폰트 크기 변경 시 캐시 무효화 후 유휴 시간에 재생성 (완료 전까지 기존 캐시로 표시)"""
+        if font_size == self.font_size and self._rebuild_font is None:
+            return
+        
+        self._cancel_rebuild()
+        self.font_size = font_size
+        self._rebuild_font = self._create_font(font_size)
+        self._rebuild_items = {}
+        self._rebuild_queue = list(self.pitches)
+        self._rebuild_job = self.master.after_idle(self._rebuild_step)
+    
+    def _rebuild_step(self):
+        """유휴 시간마다 음정 항목 하나씩 생성, 모두 생성되면 교체"""
+        self._rebuild_job = None
+        if self._rebuild_queue:
+            pitch = self._rebuild_queue.pop(0)
+            self._rebuild_items[pitch] = self._create_glyph(pitch, self._rebuild_font)
+            self._rebuild_job = self.master.after_idle(self._rebuild_step)
+            return
+        self._finish_rebuild()
+    
+    def _finish_rebuild(self):
+        """새 캐시로 교체하고 이전 항목 삭제"""
+        visible_pitch = None
+        for pitch, item in self.glyph_items.items():
+            if item == self.visible_item:
+                visible_pitch = pitch
+        
+        old_items = list(self.glyph_items.values())
+        self.glyph_items = self._rebuild_items
+        self.font = self._rebuild_font
+        self.canvas.itemconfigure(self.message_item, font=self.font)
+        self._rebuild_items = {}
+        self._rebuild_font = None
+        
+        # 보이던 음정은 새 항목으로 이어서 표시
+        if visible_pitch is not None:
+            self.visible_item = None
+            self._swap_visible(self.glyph_items[visible_pitch])
+        for item in old_items:
+            self.canvas.delete(item)
+        
+        self.rebuild_count += 1
+        if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+            print(f"[CANVAS] 글리프 캐시 재생성 완료 - 폰트 크기: {self.font_size}")
+    
+    def _cancel_rebuild(self):
+        """진행 중인 재생성 취소"""
+        if self._rebuild_job is not None:
+            self.master.after_cancel(self._rebuild_job)
+            self._rebuild_job = None
+        for item in self._rebuild_items.values():
+            self.canvas.delete(item)
+        self._rebuild_items = {}
+        self._rebuild_queue = []
+        self._rebuild_font = None
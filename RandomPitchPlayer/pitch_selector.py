@@ -12,6 +12,12 @@ class PitchSelector:
     def __init__(self):
         self.pitches = SCALES.copy()
         self.last_selected_pitch = None
+        
+        # 음정별 "이전 음정을 제외한 후보" 목록 (선택할 때마다 목록을 새로 만들지 않도록 미리 계산)
+        self._alternatives = {
+            pitch: [other for other in self.pitches if other != pitch] or self.pitches
+            for pitch in self.pitches
+        }
     
     def get_next_pitch(self):
         """중복을 방지하는 다음 음정 선택"""
@@ -20,9 +26,7 @@ class PitchSelector:
             selected = random.choice(self.pitches)
         else:
             # 이전 음정을 제외한 나머지에서 선택
-            available_pitches = [pitch for pitch in self.pitches if pitch != self.last_selected_pitch]
-            if not available_pitches:
-                available_pitches = self.pitches.copy()
+            available_pitches = self._alternatives.get(self.last_selected_pitch, self.pitches)
             selected = random.choice(available_pitches)
         
         self.last_selected_pitch = selected
@@ -0,0 +1,349 @@
+"""
+RandomPitchPlayer 헤드리스 세션
+tkinter 없이 타이머/음정 선택/음성 안내 파이프라인을 실행하고 이벤트를 JSON Lines로 기록
+
+사용법:
+    python session.py --bpm 120 --minutes 5
+    python session.py --program "60->180@5m" --output events.jsonl --no-tts
+    python session.py --bpm 300 --minutes 60 --virtual   (가상 시계로 빨리 감기, 타이밍 코어 벤치마크)
+    python session.py --bpm 90 --minutes 20 --render practice.wav --tone   (연습용 음원 + practice.json 생성)
+    python main.py --headless --bpm 120                   (메인 진입점에서 실행)
+
+이벤트는 표준 출력(또는 --output 파일)에만 기록되고, 콘솔 로그는 실행 중 표준 오류로 보냅니다.
+"""
+import argparse
+import contextlib
+import json
+import queue
+import sys
+import threading
+import time
+
+from config import (DEFAULT_BPM, DEFAULT_DURATION_MINUTES, TTS_ENABLED, TONE_ENABLED, AUDIO_CLICK_ENABLED,
+                    ENABLE_CONSOLE_LOGS, RELEASE_MODE)
+from clock_manager import MonotonicClock, VirtualClock
+from debug_manager import DebugManager
+from pitch_selector import PitchSelector
+from timer_manager import TimerManager
+from timing_utils import TimingUtils
+from tempo_map import TempoMap, TempoMapError
+
+
+class EventWriter:
+    """세션 이벤트를 JSON Lines 형식으로 기록하는 클래스 (스레드 안전)"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self._lock = threading.Lock()
+    
+    def emit(self, event_type, **fields):
+        """이벤트 한 줄 기록"""
+        fields['event'] = event_type
+        line = json.dumps(fields, ensure_ascii=False)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+class _InlineBeatSink:
+    """큐 대신 발행된 비트를 즉시 처리하는 싱크 (가상 시계 실행용)"""
+    
+    def __init__(self, handler):
+        self.handler = handler
+    
+    def put(self, entry):
+        self.handler(entry)
+        entry.release()
+
+
+class Session:
+    """UI 없이 RandomPitchPlayer 파이프라인을 실행하는 헤드리스 세션"""
+    
+    def __init__(self, interval, tempo_map=None, duration_minutes=DEFAULT_DURATION_MINUTES,
+                 event_writer=None, enable_tts=TTS_ENABLED, clock=None):
+        self.clock = clock or MonotonicClock()
+        self.interval = interval
+        self.tempo_map = tempo_map
+        self.duration_minutes = duration_minutes
+        self.event_writer = event_writer or EventWriter(sys.stdout)
+        
+        # 파이프라인 구성 (UI 대신 이벤트 기록기 사용)
+        self.beat_queue = queue.Queue()
+        self.debug_manager = DebugManager(clock=self.clock)
+        self.debug_manager.debug_mode = False
+        self.debug_manager.enable_logs = False
+        self.pitch_selector = PitchSelector()
+        self.timer_manager = TimerManager(self.beat_queue, self.debug_manager, self.pitch_selector,
+                                          clock=self.clock)
+        
+        # 음성 안내 (가상 시계 실행 시에는 재생하지 않음)
+        self.tts_manager = None
+        if enable_tts and not self.clock.is_virtual:
+            from tts_manager import get_tts_manager
+            self.tts_manager = get_tts_manager()
+            self.tts_manager.set_debug_manager(self.debug_manager)
+        
+        self.is_running = False
+        self.stop_event = threading.Event()
+        self.consumer_thread = None
+        self.start_time = 0
+        self.beat_count = 0
+    
+    def run(self):
+        """세션을 지속 시간 동안 실행 (0분 = 중단될 때까지)"""
+        if self.clock.is_virtual:
+            return self._run_virtual()
+        
+        self.start()
+        try:
+            end_time = self.start_time + self.duration_minutes * 60 if self.duration_minutes > 0 else None
+            while not self.stop_event.is_set():
+                if end_time is None:
+                    self.clock.wait(self.stop_event, 1.0)
+                    continue
+                remaining = end_time - self.clock.now()
+                if remaining <= 0:
+                    break
+                self.clock.wait(self.stop_event, min(1.0, remaining))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+        return self.beat_count
+    
+    def start(self):
+        """타이머와 이벤트 소비 스레드 시작"""
+        if self.is_running:
+            return False
+        
+        self.is_running = True
+        self.stop_event.clear()
+        self.pitch_selector.reset()
+        self.beat_count = 0
+        self.timer_manager.start_timer(self.interval, self.tempo_map)
+        self.start_time = self.timer_manager.first_entry.target_time
+        if self.tts_manager is not None:
+            self.tts_manager.prioritize(
+                [self.timer_manager.first_entry.pitch] + self.timer_manager.lookahead.upcoming_pitches()
+            )
+            self.tts_manager.prepare_tempo(
+                self.tempo_map.min_interval() if self.tempo_map is not None else self.interval
+            )
+        
+        self._emit_start()
+        self._handle_entry(self.timer_manager.first_entry)
+        self.timer_manager.release_first_entry()
+        
+        self.consumer_thread = threading.Thread(target=self._consume_beats, daemon=True)
+        self.consumer_thread.start()
+        return True
+    
+    def stop(self):
+        """세션 정지 및 요약 이벤트 기록"""
+        if not self.is_running:
+            return
+        
+        self.is_running = False
+        self.stop_event.set()
+        self.timer_manager.stop_timer()
+        self.beat_queue.put(None)  # 소비 스레드 종료 신호
+        
+        if self.consumer_thread and self.consumer_thread.is_alive():
+            self.consumer_thread.join(timeout=1.0)
+        
+        if self.tts_manager is not None:
+            self.tts_manager.stop_speech()
+        
+        self._emit_stop()
+    
+    def _run_virtual(self):
+        """가상 시계로 세션 전체를 호출 스레드에서 즉시 실행 (무제한 세션은 끝나지 않으므로 거부)"""
+        if self.duration_minutes <= 0:
+            raise ValueError("가상 시계 실행에는 0보다 큰 지속 시간이 필요합니다")
+        self.start_time = self.clock.now()
+        end_time = self.start_time + self.duration_minutes * 60
+        
+        self.is_running = True
+        self.pitch_selector.reset()
+        self.beat_count = 0
+        self._emit_start()
+        
+        # 발행 즉시 같은 스레드에서 처리하여 가상 시각 기준 출력 시각을 기록
+        self.timer_manager.ui_queue = _InlineBeatSink(self._handle_entry)
+        wall_start = time.perf_counter()
+        try:
+            self.timer_manager.run_until(end_time, self.interval, self.tempo_map)
+        finally:
+            self.timer_manager.ui_queue = self.beat_queue
+        
+        self.is_running = False
+        self._emit_stop(wall_elapsed=time.perf_counter() - wall_start)
+        return self.beat_count
+    
+    def _consume_beats(self):
+        """타이머가 발행한 비트를 기다렸다가 처리 (폴링 없이 블로킹 대기)"""
+        while True:
+            entry = self.beat_queue.get()
+            if entry is None or not self.is_running:
+                break
+            self._handle_entry(entry)
+            entry.release()
+    
+    def _handle_entry(self, entry):
+        """비트 항목 처리: 이벤트 기록 및 음성 안내"""
+        self.beat_count += 1
+        emit_time = self.clock.now()
+        self.event_writer.emit(
+            'beat',
+            sequence=entry.sequence,
+            pitch=entry.pitch,
+            next_pitch=entry.next_pitch,
+            target_time=round(entry.target_time - self.start_time, 6),
+            emit_time=round(emit_time - self.start_time, 6),
+            latency_ms=round((emit_time - entry.target_time) * 1000.0, 3)
+        )
+        
+        if self.tts_manager is not None:
+            # 다음 비트 전에 시작하지 못하면 버림 (최신 음정만 안내)
+            self.tts_manager.speak_pitch_async(
+                entry.pitch, deadline=entry.target_time + self.timer_manager.get_current_interval()
+            )
+    
+    def _emit_start(self):
+        """시작 이벤트 기록"""
+        tempo_map = self.tempo_map or TempoMap.constant(self.interval)
+        self.event_writer.emit(
+            'start',
+            interval=self.interval,
+            bpm=round(60.0 / self.interval, 3),
+            program_sections=len(tempo_map.sections),
+            duration_minutes=self.duration_minutes,
+            virtual_clock=self.clock.is_virtual,
+            tts=self.tts_manager is not None
+        )
+    
+    def _emit_stop(self, wall_elapsed=None):
+        """정지 이벤트 기록 (타이머 지터 통계 포함)"""
+        fields = {
+            'beats': self.beat_count,
+            'elapsed': round(self.clock.now() - self.start_time, 6),
+            'jitter': self.timer_manager.get_jitter_stats()
+        }
+        if wall_elapsed is not None:
+            fields['wall_elapsed'] = round(wall_elapsed, 6)
+        if self.tts_manager is not None:
+            fields['announcements'] = self.tts_manager.get_announcement_stats()
+        self.event_writer.emit('stop', **fields)
+
+
+def build_arg_parser():
+    """헤드리스 실행 인자 파서 생성"""
+    parser = argparse.ArgumentParser(description="RandomPitchPlayer 헤드리스 세션 (tkinter 없이 실행)")
+    tempo_group = parser.add_mutually_exclusive_group()
+    tempo_group.add_argument("--bpm", type=float, help=f"템포 (BPM, 기본값: {DEFAULT_BPM})")
+    tempo_group.add_argument("--interval", type=float, help="간격 (초)")
+    tempo_group.add_argument("--program", help="템포 프로그램 (예: \"60->180@5m, 180@2m\")")
+    parser.add_argument("--minutes", type=float, default=DEFAULT_DURATION_MINUTES,
+                        help="지속 시간 (분, 0=무제한 - --virtual/--render에서는 사용 불가)")
+    parser.add_argument("--output", help="이벤트 기록 파일 (기본값: 표준 출력)")
+    parser.add_argument("--no-tts", action="store_true", help="음성 안내 끄기")
+    parser.add_argument("--virtual", action="store_true", help="가상 시계로 빨리 감기 실행")
+    parser.add_argument("--render", metavar="PATH",
+                        help="실시간 재생 대신 세션을 음원 파일(.wav/.flac)로 렌더링 (같은 이름의 .json에 비트 목록 기록)")
+    parser.add_argument("--tone", action="store_true", help="렌더링에 음정 소리 포함")
+    parser.add_argument("--no-click", action="store_true", help="렌더링에서 비트 클릭 소리 빼기")
+    return parser
+
+
+def main(argv=None, event_stream=None):
+    """헤드리스 세션 진입점 (event_stream: --output이 없을 때 이벤트를 기록할 스트림, 기본값 표준 출력)"""
+    args = build_arg_parser().parse_args(argv)
+    
+    tempo_map = None
+    if args.program:
+        try:
+            tempo_map = TempoMap.from_spec(args.program)
+        except TempoMapError as e:
+            print(f"[SESSION] 템포 프로그램 오류: {e}", file=sys.stderr)
+            return 2
+        interval = 60.0 / tempo_map.sections[0].start_bpm
+    elif args.interval is not None:
+        interval = args.interval
+    else:
+        interval = TimingUtils.bpm_to_exact_interval(args.bpm if args.bpm is not None else DEFAULT_BPM)
+    
+    if interval <= 0:
+        print("[SESSION] 간격은 0보다 커야 합니다", file=sys.stderr)
+        return 2
+    
+    if args.render:
+        return render(args, interval, tempo_map)
+    
+    if args.virtual and args.minutes <= 0:
+        print("[SESSION] 가상 시계 실행에는 0보다 큰 지속 시간이 필요합니다", file=sys.stderr)
+        return 2
+    
+    output_stream = open(args.output, 'w', encoding='utf-8') if args.output else (event_stream or sys.stdout)
+    try:
+        # 디버그 로그(print)는 표준 오류로 보내 이벤트 스트림(JSON Lines)에 섞이지 않게 함
+        with contextlib.redirect_stdout(sys.stderr):
+            session = Session(
+                interval,
+                tempo_map=tempo_map,
+                duration_minutes=args.minutes,
+                event_writer=EventWriter(output_stream),
+                enable_tts=TTS_ENABLED and not args.no_tts,
+                clock=VirtualClock() if args.virtual else MonotonicClock()
+            )
+            try:
+                beats = session.run()
+            finally:
+                # 종료 시(atexit) 정리 로그도 표준 출력으로 나가지 않도록 여기서 정리
+                if session.tts_manager is not None:
+                    from tts_manager import cleanup_tts_global
+                    cleanup_tts_global()
+        if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+            print(f"[SESSION] 세션 종료 - 총 {beats}비트", file=sys.stderr)
+    finally:
+        if args.output:
+            output_stream.close()
+    return 0
+
+
+def render(args, interval, tempo_map):
+    """세션을 음원 파일로 렌더링 (가상 시계, 실시간보다 훨씬 빠름)"""
+    import offline_render
+    if args.minutes <= 0:
+        print("[SESSION] 렌더링에는 0보다 큰 지속 시간이 필요합니다", file=sys.stderr)
+        return 2
+    
+    tts_manager = None
+    if TTS_ENABLED and not args.no_tts:
+        from tts_manager import get_tts_manager
+        tts_manager = get_tts_manager()
+        offline_render.prepare_voice(tts_manager)
+    
+    try:
+        renderer = offline_render.SessionRenderer(
+            interval,
+            tempo_map=tempo_map,
+            duration_minutes=args.minutes,
+            tts_manager=tts_manager,
+            tone=TONE_ENABLED or args.tone,
+            click=AUDIO_CLICK_ENABLED and not args.no_click
+        )
+        summary = renderer.render(args.render)
+    except offline_render.RenderError as e:
+        print(f"[SESSION] 렌더링 실패: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if tts_manager is not None:
+            tts_manager.cleanup()
+    
+    print(f"[SESSION] {summary['path']} ({summary['seconds']:.1f}초, 비트 {summary['beats']}회), "
+          f"{summary['sidecar']} - {summary['speed']:.0f}배속", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
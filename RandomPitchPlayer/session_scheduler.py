@@ -0,0 +1,240 @@
+"""
+RandomPitchPlayer 다중 세션 스케줄러
+여러 독립 세션(학생별 음정 스트림)을 하나의 타이머 스레드로 구동하는 힙 기반 스케줄러
+
+각 세션은 자체 PitchSelector와 선행 버퍼를 가지며, 스케줄러는 모든 세션의 다음 트리거 시각을
+최소 힙에 보관하고 가장 이른 시각까지만 정밀 대기합니다. 세션 수와 무관하게 스레드는 하나이고
+(콜백 처리용 작업자 풀은 선택), 깨어남 횟수는 비트 수에 비례합니다.
+"""
+import heapq
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from clock_manager import get_clock, PreciseWaiter, begin_high_resolution, end_high_resolution
+from pitch_buffer import PitchLookaheadBuffer
+from pitch_selector import PitchSelector
+from tempo_map import TempoMap
+from timing_utils import TimingUtils
+from config import TIMER_JITTER_SAMPLES, ENABLE_CONSOLE_LOGS, RELEASE_MODE
+
+
+class ScheduledSession:
+    """스케줄러에 등록된 세션 하나의 상태 (음정 선택기, 선행 버퍼, 지연 측정값)"""
+    
+    def __init__(self, session_id, pitch_selector, tempo_map):
+        self.session_id = session_id
+        self.pitch_selector = pitch_selector
+        self.lookahead = PitchLookaheadBuffer(pitch_selector)
+        self.tempo_map = tempo_map
+        self.version = 0  # 템포 변경 시 증가 (힙에 남은 이전 항목 무효화)
+        self.beat_count = 0
+        self.lateness_ns = deque(maxlen=TIMER_JITTER_SAMPLES)
+
+
+class SessionScheduler:
+    """여러 세션의 비트를 하나의 스레드에서 힙 순서대로 발행하는 스케줄러
+    
+    on_beat(session_id, entry) 콜백은 타이머 스레드에서 호출되며, worker_count > 0이면
+    작업자 풀로 넘겨 타이머 스레드가 콜백 처리 시간에 막히지 않도록 합니다.
+    entry는 풀에서 재사용되는 BeatEvent이므로 콜백이 처리 후 entry.release()를 호출합니다.
+    """
+    
+    def __init__(self, on_beat=None, clock=None, worker_count=0):
+        self.on_beat = on_beat
+        self.clock = clock or get_clock()
+        self.waiter = PreciseWaiter(self.clock)
+        self.executor = ThreadPoolExecutor(max_workers=worker_count) if worker_count > 0 else None
+        
+        self.sessions = {}
+        self._heap = []  # (트리거 시각, 순번, 세션 ID, 버전) - 제거/변경된 항목은 꺼낼 때 무시
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self.wake_event = threading.Event()
+        
+        self.is_running = False
+        self.scheduler_thread = None
+        self.lateness_ns = deque(maxlen=TIMER_JITTER_SAMPLES)
+        self.dispatch_count = 0
+    
+    def add_session(self, session_id, interval, tempo_map=None, pitch_selector=None, start_time=None):
+        """세션 등록 후 첫 비트 항목 반환 (sequence 0 = 시작 시각)"""
+        tempo_map = tempo_map or TempoMap.constant(interval)
+        session = ScheduledSession(session_id, pitch_selector or PitchSelector(), tempo_map)
+        start_time = self.clock.now() if start_time is None else start_time
+        
+        session.lookahead.reset(start_time, tempo_map)
+        first_entry = session.lookahead.publish()
+        
+        with self._lock:
+            if session_id in self.sessions:
+                raise KeyError(f"이미 등록된 세션입니다: {session_id}")
+            self.sessions[session_id] = session
+            self._push_locked(session)
+        self.wake_event.set()
+        
+        if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+            print(f"[SCHEDULER] 세션 추가: {session_id} (총 {len(self.sessions)}개)")
+        return first_entry
+    
+    def remove_session(self, session_id):
+        """세션 제거 (힙에 남은 항목은 다음에 꺼낼 때 무시됨)"""
+        with self._lock:
+            session = self.sessions.pop(session_id, None)
+        if session is not None and ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+            print(f"[SCHEDULER] 세션 제거: {session_id} (총 {len(self.sessions)}개)")
+        return session is not None
+    
+    def update_tempo(self, session_id, interval=None, tempo_map=None):
+        """세션 템포 변경 (다음 비트는 예정 시각 유지, 이후 비트부터 새 템포 적용)"""
+        tempo_map = tempo_map or TempoMap.constant(interval)
+        with self._lock:
+            session = self.sessions.get(session_id)
+            if session is None:
+                return False
+            session.tempo_map = tempo_map
+            session.lookahead.retime(tempo_map)
+            session.version += 1
+            self._push_locked(session)
+        self.wake_event.set()
+        return True
+    
+    def start(self):
+        """스케줄러 스레드 시작"""
+        if self.is_running:
+            return False
+        self.is_running = True
+        self.wake_event.clear()
+        self.scheduler_thread = threading.Thread(target=self._scheduler_worker, daemon=True)
+        self.scheduler_thread.start()
+        return True
+    
+    def stop(self):
+        """스케줄러 정지 (등록된 세션은 유지)"""
+        self.is_running = False
+        self.wake_event.set()
+        if self.scheduler_thread and self.scheduler_thread.is_alive():
+            self.scheduler_thread.join(timeout=1.0)
+        self.scheduler_thread = None
+    
+    def shutdown(self):
+        """스케줄러 정지 및 작업자 풀 종료"""
+        self.stop()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+    
+    def run_until(self, end_time):
+        """호출 스레드에서 동기적으로 end_time까지 실행 (가상 시계 시뮬레이션용)"""
+        if self.is_running:
+            return 0
+        
+        self.is_running = True
+        self.wake_event.clear()
+        start_count = self.dispatch_count
+        try:
+            while self.is_running:
+                deadline = self._next_deadline()
+                if deadline is None or deadline > end_time:
+                    break
+                if self._wait_until(deadline):
+                    self._dispatch_due(self.clock.now())
+            # 마지막 비트 이후 남은 시간 진행
+            if self.clock.is_virtual and self.is_running:
+                self.clock.advance_to(end_time)
+        finally:
+            self.is_running = False
+        
+        return self.dispatch_count - start_count
+    
+    def _scheduler_worker(self):
+        """별도 스레드에서 가장 이른 세션 비트까지 정밀 대기 후 발행"""
+        begin_high_resolution()
+        try:
+            while self.is_running:
+                deadline = self._next_deadline()
+                if deadline is None:
+                    # 등록된 세션이 없으면 추가/정지 요청까지 대기
+                    self.wake_event.wait()
+                    self.wake_event.clear()
+                    continue
+                if self._wait_until(deadline):
+                    self._dispatch_due(self.clock.now())
+        finally:
+            end_high_resolution()
+    
+    def _wait_until(self, deadline):
+        """목표 시각까지 대기 (세션 추가/템포 변경/정지로 깨어나면 False 반환)"""
+        if not self.waiter.wait_until(deadline, self.wake_event):
+            self.wake_event.clear()
+            return False
+        return self.is_running
+    
+    def _next_deadline(self):
+        """가장 이른 유효 트리거 시각 (무효 항목은 여기서 정리)"""
+        with self._lock:
+            while self._heap:
+                trigger_time, _, session_id, version = self._heap[0]
+                session = self.sessions.get(session_id)
+                if session is not None and session.version == version:
+                    return trigger_time
+                heapq.heappop(self._heap)
+            return None
+    
+    def _push_locked(self, session):
+        """세션의 다음 비트를 힙에 추가 (잠금 보유 상태에서 호출)"""
+        heapq.heappush(self._heap, (session.lookahead.peek_time(), next(self._counter),
+                                    session.session_id, session.version))
+    
+    def _dispatch_due(self, current_time):
+        """current_time까지 도래한 모든 세션 비트 발행"""
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= current_time:
+                trigger_time, _, session_id, version = heapq.heappop(self._heap)
+                session = self.sessions.get(session_id)
+                if session is None or session.version != version:
+                    continue
+                entry = session.lookahead.publish()
+                session.beat_count += 1
+                lateness_ns = int((current_time - trigger_time) * 1e9)
+                session.lateness_ns.append(lateness_ns)
+                self.lateness_ns.append(lateness_ns)
+                self._push_locked(session)
+                due.append((session, entry))
+        
+        self.dispatch_count += len(due)
+        for session, entry in due:
+            if self.on_beat is None:
+                entry.release()
+            elif self.executor is not None:
+                self.executor.submit(self.on_beat, session.session_id, entry)
+            else:
+                self.on_beat(session.session_id, entry)
+        
+        # 마감 이후 시간에 선행 버퍼 보충
+        for session, _ in due:
+            session.lookahead.fill()
+    
+    def get_session_stats(self, session_id):
+        """세션별 지터 통계 반환 (밀리초 단위)"""
+        session = self.sessions.get(session_id)
+        if session is None:
+            return None
+        stats = TimingUtils.summarize_lateness(session.lateness_ns)
+        if stats is not None:
+            stats['beats'] = session.beat_count
+        return stats
+    
+    def get_jitter_stats(self):
+        """전체 세션 지터 통계 반환 (밀리초 단위)"""
+        stats = TimingUtils.summarize_lateness(self.lateness_ns)
+        if stats is None:
+            return None
+        stats.update({
+            'mode': 'scheduler',
+            'sessions': len(self.sessions),
+            'wakeups': self.waiter.wakeup_count,
+            'spin_threshold_ms': self.waiter.spin_threshold * 1000.0
+        })
+        return stats
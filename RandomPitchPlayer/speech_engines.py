@@ -0,0 +1,330 @@
+"""
+RandomPitchPlayer 음성 합성 엔진
+TTSManager가 사용하는 교체 가능한 음성 합성 백엔드 모음
+
+- GTTSEngine: Google TTS (네트워크 필요, 사용 전 짧은 시간 제한으로 연결 확인)
+- Pyttsx3Engine: 운영체제 음성 (SAPI5/espeak 등, 오프라인, 여러 클립을 한 번에 합성)
+- BuiltinSpeechEngine: 외부 의존성 없는 내장 포먼트 합성기 (오프라인, 항상 사용 가능)
+
+모든 엔진은 synthesize_batch([(텍스트, 언어, 경로), ...])로 파일을 만들고,
+name/version/audio_format은 클립 저장소 키에 포함되어 엔진별로 캐시가 구분됩니다.
+"""
+import abc
+import array
+import math
+import random
+import socket
+import threading
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from config import TTS_ENGINE, TTS_NETWORK_TIMEOUT, TTS_RATE, TTS_VOICE_INDEX, ENABLE_CONSOLE_LOGS, RELEASE_MODE
+
+# 선택적 라이브러리 임포트 (없으면 해당 엔진만 사용 불가)
+try:
+    from gtts import gTTS
+    try:
+        from gtts.version import __version__ as _gtts_version
+    except ImportError:
+        _gtts_version = "unknown"
+    _gtts_available = True
+except ImportError:
+    _gtts_available = False
+
+try:
+    import pyttsx3
+    _pyttsx3_available = True
+except ImportError:
+    _pyttsx3_available = False
+
+
+class SpeechEngine(abc.ABC):
+    """음성 합성 엔진 기본 클래스 (하위 클래스는 synthesize를 구현해야 함)"""
+    
+    name = "base"
+    display_name = "기본"
+    version = "0"
+    audio_format = "wav"
+    requires_network = False
+    batch_size = 1  # 한 번의 합성 호출로 처리할 최대 클립 수
+    
+    def is_available(self):
+        """라이브러리 등 실행 조건 충족 여부 (네트워크 확인은 check_online에서)"""
+        return True
+    
+    def check_online(self):
+        """합성 가능한 상태인지 확인 (네트워크가 필요한 엔진만 실제로 확인)"""
+        return True
+    
+    @abc.abstractmethod
+    def synthesize(self, text, language, path):
+        """텍스트 하나를 음성 파일로 합성"""
+    
+    def synthesize_batch(self, requests):
+        """(텍스트, 언어, 경로) 목록을 합성 (기본: 하나씩 처리)"""
+        for text, language, path in requests:
+            self.synthesize(text, language, path)
+
+
+class GTTSEngine(SpeechEngine):
+    """Google TTS 엔진 (네트워크 필요)"""
+    
+    name = "gtts"
+    display_name = "gTTS"
+    audio_format = "mp3"
+    requires_network = True
+    PROBE_HOST = ("translate.google.com", 443)
+    
+    def __init__(self):
+        self.version = _gtts_version if _gtts_available else "unknown"
+    
+    def is_available(self):
+        return _gtts_available
+    
+    def check_online(self):
+        """짧은 시간 제한으로 서버 연결 가능 여부 확인 (오프라인에서 gTTS가 오래 멈추지 않도록)"""
+        try:
+            with socket.create_connection(self.PROBE_HOST, timeout=TTS_NETWORK_TIMEOUT):
+                return True
+        except OSError as e:
+            if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+                print(f"[TTS] gTTS 서버 연결 불가 ({TTS_NETWORK_TIMEOUT}초 제한): {e}")
+            return False
+    
+    def synthesize(self, text, language, path):
+        gTTS(text=text, lang=language, slow=False).save(path)
+
+
+class Pyttsx3Engine(SpeechEngine):
+    """운영체제 음성 엔진 (pyttsx3, 오프라인)
+    
+    pyttsx3 드라이버(SAPI5 등)는 생성한 스레드에서만 안전하게 사용할 수 있으므로
+    전용 스레드 하나에서 초기화와 합성을 모두 처리합니다.
+    """
+    
+    name = "pyttsx3"
+    display_name = "pyttsx3"
+    batch_size = 8
+    
+    def __init__(self):
+        # 합성 결과에 영향을 주는 설정을 버전에 포함 (설정이 바뀌면 다른 캐시 키)
+        library_version = getattr(pyttsx3, '__version__', "unknown") if _pyttsx3_available else "unknown"
+        self.version = f"{library_version}:rate={TTS_RATE}:voice={TTS_VOICE_INDEX}"
+        self._engine = None
+        self._executor = None
+        self._lock = threading.Lock()
+    
+    def is_available(self):
+        return _pyttsx3_available
+    
+    def synthesize(self, text, language, path):
+        self.synthesize_batch([(text, language, path)])
+    
+    def synthesize_batch(self, requests):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1)
+            executor = self._executor
+        executor.submit(self._synthesize_on_engine_thread, requests).result()
+    
+    def _synthesize_on_engine_thread(self, requests):
+        """전용 스레드에서 여러 파일 저장을 예약한 뒤 runAndWait() 한 번으로 합성"""
+        if self._engine is None:
+            self._engine = pyttsx3.init()
+            self._engine.setProperty('rate', TTS_RATE)
+        
+        for text, language, path in requests:
+            self._select_voice(language)
+            self._engine.save_to_file(text, path)
+        self._engine.runAndWait()
+    
+    def _select_voice(self, language):
+        """언어에 맞는 음성 선택 (없으면 TTS_VOICE_INDEX 음성)"""
+        voices = self._engine.getProperty('voices') or []
+        for voice in voices:
+            languages = [str(lang).lower() for lang in (getattr(voice, 'languages', None) or [])]
+            if any(language in lang for lang in languages) or language in str(voice.id).lower():
+                self._engine.setProperty('voice', voice.id)
+                return
+        if 0 <= TTS_VOICE_INDEX < len(voices):
+            self._engine.setProperty('voice', voices[TTS_VOICE_INDEX].id)
+
+
+class BuiltinSpeechEngine(SpeechEngine):
+    """외부 의존성 없는 내장 포먼트 합성기 (오프라인, 모노 16비트 WAV)
+    
+    음정 이름 정도의 짧은 음절만 대상으로 하며, 음소 표를 따라 자음(잡음/파열) 구간과
+    모음(성대 펄스 + 포먼트 공진기) 구간을 이어 붙입니다. 같은 입력은 항상 같은 파일을 만듭니다.
+    """
+    
+    name = "builtin"
+    display_name = "내장 합성기"
+    version = "1"  # 합성 방식이 바뀌면 올려서 이전 캐시 무효화
+    SAMPLE_RATE = 22050
+    
+    # 모음 포먼트 (F1, F2, F3 Hz)
+    VOWELS = {
+        'a': (730, 1090, 2440),
+        'e': (530, 1840, 2480),
+        'i': (270, 2290, 3010),
+        'o': (450, 800, 2830),
+        'u': (300, 870, 2240),
+    }
+    # 유성 자음 (포먼트, 길이 초)
+    SONORANTS = {
+        'm': ((250, 1000, 2200), 0.07),
+        'n': ((250, 1500, 2500), 0.07),
+        'l': ((360, 1300, 2700), 0.06),
+        'r': ((350, 1100, 1700), 0.04),
+    }
+    # 마찰음 (잡음 중심 주파수, 길이 초)
+    FRICATIVES = {
+        's': (5500, 0.12),
+        'sh': (3000, 0.12),
+        'f': (4500, 0.09),
+        'j': (2800, 0.06),
+    }
+    # 파열음 (파열 잡음 중심 주파수, 유성 여부)
+    PLOSIVES = {
+        'p': (1500, False), 'b': (1500, True),
+        't': (3500, False), 'd': (3500, True),
+        'k': (2500, False), 'g': (2500, True),
+    }
+    # 텍스트별 음소열
+    PHONEMES = {
+        '도': ('d', 'o'), '레': ('r', 'e'), '미': ('m', 'i'), '파': ('p', 'a'),
+        '솔': ('s', 'o', 'l'), '라': ('r', 'a'), '시': ('sh', 'i'),
+        'C': ('s', 'i'), 'D': ('d', 'i'), 'E': ('i',), 'F': ('e', 'f'),
+        'G': ('j', 'i'), 'A': ('e', 'i'), 'B': ('b', 'i'),
+        '테스트': ('t', 'e', 's', 'u'), 'Test': ('t', 'e', 's', 't'),
+    }
+    
+    def synthesize(self, text, language, path):
+        samples = self.render(text)
+        pcm = array.array('h', (int(max(-1.0, min(1.0, s)) * 32767) for s in samples))
+        with wave.open(path, 'wb') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(self.SAMPLE_RATE)
+            wav_file.writeframes(pcm.tobytes())
+    
+    def render(self, text):
+        """텍스트를 float 샘플 목록(-1.0 ~ 1.0)으로 합성"""
+        rng = random.Random(text)  # 잡음도 입력별로 고정
+        phonemes = self.PHONEMES.get(text) or self._guess_phonemes(text)
+        vowel_count = max(1, sum(1 for p in phonemes if p in self.VOWELS))
+        vowel_duration = 0.32 / vowel_count
+        
+        samples = []
+        for phoneme in phonemes:
+            if phoneme in self.VOWELS:
+                segment = self._voiced(self.VOWELS[phoneme], vowel_duration, 1.0)
+            elif phoneme in self.SONORANTS:
+                formants, duration = self.SONORANTS[phoneme]
+                segment = self._voiced(formants, duration, 0.5)
+            elif phoneme in self.FRICATIVES:
+                center, duration = self.FRICATIVES[phoneme]
+                segment = self._noise(rng, center, 1200, duration, 0.3)
+            else:
+                center, voiced = self.PLOSIVES.get(phoneme, (2500, False))
+                segment = [0.0] * int(self.SAMPLE_RATE * 0.01)  # 폐쇄 구간
+                segment += self._noise(rng, center, 1500, 0.01 if voiced else 0.025, 0.5)
+            samples.extend(segment)
+        
+        return self._fade(samples, 0.01, 0.04)
+    
+    def _guess_phonemes(self, text):
+        """표에 없는 텍스트는 포함된 모음 글자로 대략 발음 (모음이 없으면 'a')"""
+        vowels = tuple(ch for ch in text.lower() if ch in self.VOWELS)
+        return vowels or ('a',)
+    
+    def _voiced(self, formants, duration, level):
+        """성대 펄스열을 포먼트 공진기에 통과시킨 유성음 구간"""
+        count = int(self.SAMPLE_RATE * duration)
+        source = []
+        phase = 0.0
+        for index in range(count):
+            f0 = 130.0 - 20.0 * index / max(1, count)  # 음절 끝으로 갈수록 살짝 내려가는 억양
+            phase += f0 / self.SAMPLE_RATE
+            if phase >= 1.0:
+                phase -= 1.0
+                source.append(1.0)
+            else:
+                source.append(0.0)
+        
+        segment = source
+        for freq, bandwidth in zip(formants, (60, 90, 150)):
+            segment = self._resonate(segment, freq, bandwidth)
+        return self._fade(self._normalize(segment, level), 0.005, 0.005)
+    
+    def _noise(self, rng, center, bandwidth, duration, level):
+        """공진기로 대역을 제한한 잡음 구간 (마찰음/파열음)"""
+        count = int(self.SAMPLE_RATE * duration)
+        segment = self._resonate([rng.uniform(-1.0, 1.0) for _ in range(count)], center, bandwidth)
+        return self._fade(self._normalize(segment, level), 0.005, 0.005)
+    
+    def _resonate(self, samples, freq, bandwidth):
+        """2차 디지털 공진기 (포먼트 필터)"""
+        rate = self.SAMPLE_RATE
+        c = -math.exp(-2.0 * math.pi * bandwidth / rate)
+        b = 2.0 * math.exp(-math.pi * bandwidth / rate) * math.cos(2.0 * math.pi * freq / rate)
+        a = 1.0 - b - c
+        y1 = y2 = 0.0
+        output = []
+        for x in samples:
+            y = a * x + b * y1 + c * y2
+            y2 = y1
+            y1 = y
+            output.append(y)
+        return output
+    
+    @staticmethod
+    def _normalize(samples, level):
+        peak = max((abs(s) for s in samples), default=0.0)
+        if peak == 0.0:
+            return samples
+        scale = level * 0.8 / peak
+        return [s * scale for s in samples]
+    
+    def _fade(self, samples, fade_in, fade_out):
+        """구간 시작/끝 페이드 (구간 경계 클릭 방지)"""
+        count = len(samples)
+        fade_in_count = min(count, int(self.SAMPLE_RATE * fade_in))
+        fade_out_count = min(count, int(self.SAMPLE_RATE * fade_out))
+        for index in range(fade_in_count):
+            samples[index] *= index / fade_in_count
+        for index in range(fade_out_count):
+            samples[count - 1 - index] *= index / fade_out_count
+        return samples
+
+
+ENGINE_CLASSES = {
+    GTTSEngine.name: GTTSEngine,
+    Pyttsx3Engine.name: Pyttsx3Engine,
+    BuiltinSpeechEngine.name: BuiltinSpeechEngine,
+}
+
+
+def create_engines(preference=None):
+    """사용 가능한 엔진을 시도 순서대로 생성 (앞 엔진이 실패하면 다음 엔진으로 대체)
+    
+    "auto"는 gTTS → pyttsx3 → 내장 합성기 순서이고, 특정 엔진을 지정하면
+    그 엔진 다음에 내장 합성기를 오프라인 대비용으로 둡니다.
+    """
+    preference = (preference or TTS_ENGINE).lower()
+    if preference == "auto":
+        names = [GTTSEngine.name, Pyttsx3Engine.name, BuiltinSpeechEngine.name]
+    elif preference in ENGINE_CLASSES:
+        names = [preference] if preference == BuiltinSpeechEngine.name else [preference, BuiltinSpeechEngine.name]
+    else:
+        if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+            print(f"[TTS] 알 수 없는 음성 엔진 '{preference}' - 내장 합성기 사용")
+        names = [BuiltinSpeechEngine.name]
+    
+    engines = []
+    for name in names:
+        engine = ENGINE_CLASSES[name]()
+        if engine.is_available():
+            engines.append(engine)
+        elif ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+            print(f"[TTS] {engine.display_name} 엔진 사용 불가 (라이브러리 없음)")
+    return engines
@@ -0,0 +1,271 @@
+"""
+RandomPitchPlayer 템포 맵 엔진
+가속/감속 램프(선형, 지수), 고정 템포 구간, 반복을 포함한 연습 프로그램의 비트 시각을
+누적 오차 없이 닫힌 형태로 계산
+
+프로그램 표기법 (TempoMap.from_spec):
+    "60@1m"              60 BPM 고정 1분
+    "60->180@5m"         5분 동안 60에서 180 BPM까지 선형 가속
+    "180~>60@90s"        90초 동안 180에서 60 BPM까지 지수 감속
+    "(60@30s, 120@30s)x3"  괄호 묶음 3회 반복
+구간은 쉼표로 구분하며, 프로그램이 끝나면 마지막 템포를 유지합니다.
+"""
+import bisect
+import math
+import re
+from config import MIN_BPM, MAX_BPM
+
+
+class TempoMapError(ValueError):
+    """템포 프로그램 표기 오류"""
+
+
+class ConstantSection:
+    """고정 템포 구간"""
+    
+    curve = "constant"
+    
+    def __init__(self, bpm, duration):
+        self.start_bpm = float(bpm)
+        self.end_bpm = float(bpm)
+        self.duration = float(duration)
+    
+    def bpm_at(self, t):
+        return self.start_bpm
+    
+    def beats_at(self, t):
+        """구간 시작 후 t초까지 진행한 비트 수"""
+        return self.start_bpm * t / 60.0
+    
+    def time_at(self, beats):
+        """구간 시작 후 beats 비트가 되는 시각"""
+        return 60.0 * beats / self.start_bpm
+
+
+class LinearRampSection:
+    """BPM이 시간에 따라 선형으로 변하는 구간"""
+    
+    curve = "linear"
+    
+    def __init__(self, start_bpm, end_bpm, duration):
+        self.start_bpm = float(start_bpm)
+        self.end_bpm = float(end_bpm)
+        self.duration = float(duration)
+        self.slope = (self.end_bpm - self.start_bpm) / self.duration  # BPM/초
+    
+    def bpm_at(self, t):
+        return self.start_bpm + self.slope * t
+    
+    def beats_at(self, t):
+        return (self.start_bpm * t + 0.5 * self.slope * t * t) / 60.0
+    
+    def time_at(self, beats):
+        # slope/2 * t^2 + start_bpm * t - 60 * beats = 0 의 양의 근 (수치적으로 안정한 형태)
+        scaled = 60.0 * beats
+        discriminant = self.start_bpm * self.start_bpm + 2.0 * self.slope * scaled
+        return 2.0 * scaled / (self.start_bpm + math.sqrt(max(0.0, discriminant)))
+
+
+class ExponentialRampSection:
+    """BPM이 일정 비율로 변하는 (지수) 구간"""
+    
+    curve = "exponential"
+    
+    def __init__(self, start_bpm, end_bpm, duration):
+        self.start_bpm = float(start_bpm)
+        self.end_bpm = float(end_bpm)
+        self.duration = float(duration)
+        self.rate = math.log(self.end_bpm / self.start_bpm) / self.duration  # 1/초
+    
+    def bpm_at(self, t):
+        return self.start_bpm * math.exp(self.rate * t)
+    
+    def beats_at(self, t):
+        if self.rate == 0:
+            return self.start_bpm * t / 60.0
+        return self.start_bpm * math.expm1(self.rate * t) / (60.0 * self.rate)
+    
+    def time_at(self, beats):
+        if self.rate == 0:
+            return 60.0 * beats / self.start_bpm
+        return math.log1p(60.0 * self.rate * beats / self.start_bpm) / self.rate
+
+
+class TempoMap:
+    """구간 목록으로 이루어진 템포 맵 (비트 번호 → 시작 기준 시각)"""
+    
+    def __init__(self, sections):
+        if not sections:
+            raise TempoMapError("템포 맵에는 최소 한 개의 구간이 필요합니다")
+        self.sections = list(sections)
+        
+        # 구간별 시작 시각과 시작 비트 (구간 수만큼만 합산하므로 비트 수와 무관하게 오차가 쌓이지 않음)
+        self.section_start_times = []
+        self.section_start_beats = []
+        elapsed_time = 0.0
+        elapsed_beats = 0.0
+        for section in self.sections:
+            self.section_start_times.append(elapsed_time)
+            self.section_start_beats.append(elapsed_beats)
+            if math.isinf(section.duration):
+                elapsed_time = math.inf
+                elapsed_beats = math.inf
+                break
+            elapsed_time += section.duration
+            elapsed_beats += section.beats_at(section.duration)
+        
+        self.total_duration = elapsed_time
+        self.total_beats = elapsed_beats
+        self.final_bpm = self.sections[-1].end_bpm
+    
+    @classmethod
+    def constant(cls, interval):
+        """고정 간격(초) 템포 맵"""
+        return cls([ConstantSection(60.0 / interval, math.inf)])
+    
+    @classmethod
+    def constant_bpm(cls, bpm):
+        """고정 BPM 템포 맵"""
+        return cls([ConstantSection(bpm, math.inf)])
+    
+    def beat_time(self, beat_index):
+        """beat_index번째 비트의 시각 (맵 시작 기준, 초)"""
+        if beat_index <= 0:
+            return 0.0
+        
+        if beat_index >= self.total_beats:
+            # 프로그램 종료 후에는 마지막 템포 유지
+            return self.total_duration + 60.0 * (beat_index - self.total_beats) / self.final_bpm
+        
+        index = bisect.bisect_right(self.section_start_beats, beat_index) - 1
+        section = self.sections[index]
+        return self.section_start_times[index] + section.time_at(beat_index - self.section_start_beats[index])
+    
+    def bpm_at(self, t):
+        """맵 시작 후 t초 시점의 BPM"""
+        if t >= self.total_duration:
+            return self.final_bpm
+        index = max(0, bisect.bisect_right(self.section_start_times, t) - 1)
+        return self.sections[index].bpm_at(t - self.section_start_times[index])
+    
+    def interval_at_beat(self, beat_index):
+        """beat_index번째 비트와 다음 비트 사이 간격 (초)"""
+        return self.beat_time(beat_index + 1) - self.beat_time(beat_index)
+    
+    def min_interval(self):
+        """맵 전체에서 가장 짧은 비트 간격 (초, 가장 빠른 BPM 기준)"""
+        max_bpm = max(max(section.start_bpm, section.end_bpm) for section in self.sections)
+        return 60.0 / max_bpm
+    
+    def is_constant(self):
+        """단일 고정 템포 맵 여부"""
+        return len(self.sections) == 1 and isinstance(self.sections[0], ConstantSection)
+    
+    def describe(self):
+        """구간 목록을 JSON으로 기록할 수 있는 형태로 반환 (무한 구간의 길이는 None)"""
+        return [
+            {
+                'curve': section.curve,
+                'start_bpm': section.start_bpm,
+                'end_bpm': section.end_bpm,
+                'duration': None if math.isinf(section.duration) else section.duration
+            }
+            for section in self.sections
+        ]
+    
+    @classmethod
+    def from_spec(cls, spec):
+        """프로그램 표기 문자열을 템포 맵으로 변환"""
+        parser = _TempoSpecParser(spec)
+        sections = parser.parse()
+        return cls(sections)
+
+
+class _TempoSpecParser:
+    """템포 프로그램 표기 파서 (쉼표 구분 구간, 괄호 반복 지원)"""
+    
+    _SECTION_PATTERN = re.compile(
+        r'^\s*(?P<start>\d+(?:\.\d+)?)\s*(?:(?P<curve>->|~>)\s*(?P<end>\d+(?:\.\d+)?))?\s*'
+        r'@\s*(?P<duration>\d+(?:\.\d+)?)\s*(?P<unit>s|m)?\s*$'
+    )
+    
+    def __init__(self, spec):
+        self.spec = spec or ""
+        self.position = 0
+    
+    def parse(self):
+        sections = self._parse_sequence()
+        if self.position < len(self.spec):
+            raise TempoMapError(f"잘못된 문자 위치 {self.position}: '{self.spec[self.position:]}'")
+        if not sections:
+            raise TempoMapError("빈 템포 프로그램입니다")
+        return sections
+    
+    def _parse_sequence(self):
+        sections = []
+        while self.position < len(self.spec):
+            self._skip_spaces()
+            if self._peek() == '(':
+                self.position += 1
+                group = self._parse_sequence()
+                if self._peek() != ')':
+                    raise TempoMapError("닫는 괄호가 없습니다")
+                self.position += 1
+                sections.extend(group * self._parse_repeat())
+            elif self._peek() == ')':
+                break
+            else:
+                sections.append(self._parse_section())
+            
+            self._skip_spaces()
+            if self._peek() == ',':
+                self.position += 1
+            elif self._peek() not in (')', ''):
+                raise TempoMapError(f"구간 구분자(,)가 필요합니다: '{self.spec[self.position:]}'")
+        return sections
+    
+    def _parse_repeat(self):
+        match = re.compile(r'\s*[xX*]\s*(\d+)').match(self.spec, self.position)
+        if not match:
+            return 1
+        self.position = match.end()
+        count = int(match.group(1))
+        if count < 1:
+            raise TempoMapError(f"반복 횟수는 1 이상이어야 합니다: x{match.group(1)}")
+        return count
+    
+    def _parse_section(self):
+        end = self.position
+        while end < len(self.spec) and self.spec[end] not in ',()':
+            end += 1
+        text = self.spec[self.position:end]
+        self.position = end
+        
+        match = self._SECTION_PATTERN.match(text)
+        if not match:
+            raise TempoMapError(f"구간 표기를 해석할 수 없습니다: '{text.strip()}'")
+        
+        start_bpm = self._validate_bpm(float(match.group('start')))
+        duration = float(match.group('duration')) * (60.0 if match.group('unit') == 'm' else 1.0)
+        if duration <= 0:
+            raise TempoMapError(f"구간 길이는 0보다 커야 합니다: '{text.strip()}'")
+        
+        if match.group('curve') is None:
+            return ConstantSection(start_bpm, duration)
+        
+        end_bpm = self._validate_bpm(float(match.group('end')))
+        if match.group('curve') == '~>':
+            return ExponentialRampSection(start_bpm, end_bpm, duration)
+        return LinearRampSection(start_bpm, end_bpm, duration)
+    
+    def _validate_bpm(self, bpm):
+        if not MIN_BPM <= bpm <= MAX_BPM:
+            raise TempoMapError(f"BPM은 {MIN_BPM}~{MAX_BPM} 범위여야 합니다: {bpm}")
+        return bpm
+    
+    def _peek(self):
+        return self.spec[self.position] if self.position < len(self.spec) else ''
+    
+    def _skip_spaces(self):
+        while self._peek().isspace():
+            self.position += 1
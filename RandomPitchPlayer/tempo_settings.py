@@ -0,0 +1,57 @@
+"""
+RandomPitchPlayer 템포 설정 모델
+UI 입력 변경 시 검증된 값을 한 번만 반영하고, 비트 처리 경로는 불변 스냅샷만 읽도록 하는 반응형 설정
+"""
+from collections import namedtuple
+from config import DEFAULT_BPM, DEFAULT_INTERVAL, ENABLE_CONSOLE_LOGS, RELEASE_MODE
+from timing_utils import TimingUtils
+
+
+# 템포 설정 스냅샷 (mode: "bpm" 또는 "seconds", interval: 타이밍 엔진용 정확한 간격)
+TempoSettings = namedtuple('TempoSettings', ['mode', 'interval', 'bpm'])
+
+
+class TempoSettingsModel:
+    """현재 템포 설정 스냅샷을 보관하고 변경 시 구독자에게 알리는 클래스
+    
+    스냅샷은 통째로 교체되므로 간격과 BPM이 항상 함께 바뀝니다 (읽는 쪽에 잠금 불필요).
+    구독자 호출은 update_from_*()를 호출한 스레드(UI 스레드)에서 이루어집니다.
+    """
+    
+    def __init__(self, mode="bpm", interval=DEFAULT_INTERVAL, bpm=DEFAULT_BPM):
+        self.snapshot = TempoSettings(mode, interval, bpm)
+        self._subscribers = []
+    
+    def subscribe(self, callback):
+        """변경 알림 구독 (callback(new_settings, old_settings))"""
+        self._subscribers.append(callback)
+    
+    def update_from_bpm(self, bpm_text, mode="bpm"):
+        """BPM 입력값을 허용 범위로 제한하여 반영 (숫자가 아니면 무시), 변경되었으면 True"""
+        try:
+            bpm = TimingUtils.clamp_bpm(float(bpm_text))
+        except ValueError:
+            return False
+        return self._publish(TempoSettings(mode, TimingUtils.bpm_to_exact_interval(bpm), bpm))
+    
+    def update_from_interval(self, interval_text, mode="seconds"):
+        """초 간격 입력값을 허용 범위로 제한하여 반영 (숫자가 아니면 무시), 변경되었으면 True"""
+        try:
+            interval = TimingUtils.clamp_interval(float(interval_text))
+        except ValueError:
+            return False
+        return self._publish(TempoSettings(mode, interval, TimingUtils.interval_to_bpm(interval)))
+    
+    def _publish(self, settings):
+        """스냅샷 교체 및 구독자 알림 (값이 같으면 알리지 않음)"""
+        old_settings = self.snapshot
+        if settings == old_settings:
+            return False
+        
+        self.snapshot = settings
+        if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+            print(f"[SETTINGS] 템포 설정 변경 - 모드: {settings.mode}, 간격: {settings.interval:.3f}초, BPM: {settings.bpm}")
+        
+        for callback in self._subscribers:
+            callback(settings, old_settings)
+        return True
@@ -0,0 +1,17 @@
+"""
+RandomPitchPlayer 테스트 공통 설정
+프로젝트 폴더를 임포트 경로에 추가하고, config.py가 없으면 디버그 설정을 config로 사용
+"""
+import importlib
+import os
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_DIR not in sys.path:
+    sys.path.insert(0, PROJECT_DIR)
+
+# config.py는 빌드 시 config_debug.py/config_release.py를 복사해 만드는 파일 (저장소에는 없음)
+try:
+    import config  # noqa: F401
+except ImportError:
+    sys.modules['config'] = importlib.import_module('config_debug')
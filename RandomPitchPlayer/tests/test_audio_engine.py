@@ -0,0 +1,105 @@
+"""
+콜백 오디오 엔진 buffer 모드 검증
+가상 시계로 세션을 실행하며 비트마다 1샘플 임펄스를 합성하고, 시작 위치를 샘플 단위로 비교
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from audio_engine import AudioEngine, AudioMixer
+from clock_manager import VirtualClock
+from debug_manager import DebugManager
+from pitch_selector import PitchSelector
+from tempo_map import TempoMap
+from timer_manager import TimerManager
+
+
+class _RenderingQueue:
+    """비트가 발행될 때마다 현재 시각까지 출력 합성 (실시간 출력 콜백 흉내)"""
+    
+    def __init__(self, engine, clock):
+        self.engine = engine
+        self.clock = clock
+        self.targets = []
+        self.blocks = []
+    
+    def put(self, entry):
+        self.targets.append(entry.target_time)
+        self.blocks.append(self.engine.render_until(self.clock.now()))
+        entry.release()
+
+
+def _render_session(seconds, tempo_map, block_size=256):
+    """buffer 모드 엔진으로 세션을 렌더링하고 (검출된 시작 프레임, 예정 프레임, 엔진) 반환
+    
+    예정 프레임은 템포 맵의 닫힌 형태 비트 시각에서 직접 계산합니다 (세션 시작 = 프레임 0).
+    """
+    clock = VirtualClock()
+    engine = AudioEngine(clock=clock, backend="buffer", channels=1, block_size=block_size)
+    engine.sources = []
+    impulse = np.ones(1, dtype=np.float32)
+    engine.add_source("impulse", lambda pitch: impulse)
+    
+    debug_manager = DebugManager(clock=clock)
+    debug_manager.debug_mode = False
+    debug_manager.enable_logs = False
+    sink = _RenderingQueue(engine, clock)
+    timer_manager = TimerManager(sink, debug_manager, PitchSelector(), scheduler_mode="precise",
+                                 clock=clock, audio_engine=engine)
+    
+    end_time = clock.now() + seconds
+    assert engine.start()
+    timer_manager.run_until(end_time, tempo_map.interval_at_beat(0), tempo_map)
+    engine.clear()
+    sink.blocks.append(engine.render_until(end_time))
+    
+    output = np.concatenate(sink.blocks)[:, 0]
+    onsets = np.flatnonzero(output > 0.5)
+    expected = np.array([int(round(tempo_map.beat_time(index) * engine.sample_rate))
+                         for index in range(len(sink.targets))])
+    return onsets, expected, engine
+
+
+@pytest.mark.parametrize("tempo_map", [
+    TempoMap.constant(0.2),
+    TempoMap.from_spec("60->300@0.25m"),
+    TempoMap.from_spec("120@5s, 240@5s"),
+], ids=["constant-300bpm", "ramp-60-300", "two-sections"])
+def test_onsets_match_schedule_to_the_sample(tempo_map):
+    onsets, expected, engine = _render_session(15.0, tempo_map)
+    
+    assert len(expected) > 10
+    assert len(onsets) == len(expected)
+    assert np.array_equal(onsets, expected)
+    assert engine.mixer.late_count == 0
+
+
+@pytest.mark.parametrize("block_size", [64, 1000, 4096])
+def test_onsets_independent_of_block_size(block_size):
+    onsets, expected, engine = _render_session(5.0, TempoMap.constant(0.25), block_size=block_size)
+    
+    assert np.array_equal(onsets, expected)
+    assert engine.mixer.late_count == 0
+
+
+def test_mixer_replaces_pending_voice_in_place():
+    mixer = AudioMixer(sample_rate=1000, channels=1)
+    data = np.ones(4, dtype=np.float32)
+    assert mixer.add("beat", data, 100)
+    voice = mixer._voices["beat"]
+    assert mixer.add("beat", data * 0.5, 200)
+    
+    assert mixer._voices["beat"] is voice
+    output = mixer.render(300)[:, 0]
+    assert np.flatnonzero(output).tolist() == [200, 201, 202, 203]
+    assert output[200] == pytest.approx(0.5)
+
+
+def test_mixer_does_not_move_started_voice():
+    mixer = AudioMixer(sample_rate=1000, channels=1)
+    data = np.ones(10, dtype=np.float32)
+    mixer.add("beat", data, 0)
+    mixer.render(5)
+    
+    assert not mixer.add("beat", data, 50)
+    assert mixer._voices["beat"].start == 0
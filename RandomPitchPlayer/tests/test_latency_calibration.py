@@ -0,0 +1,111 @@
+"""
+출력 지연 측정 검증
+지연시킨 클릭 트레인을 WAV로 합성해 녹음 장치 대신 사용하고, 장치별 측정값 저장 파일을 확인
+"""
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import latency_calibration
+from clip_processing import write_wav
+from clock_manager import VirtualClock
+from latency_calibration import CalibrationStore, LatencyCalibrator, WavCapture, apply_saved_calibration
+from latency_compensator import LatencyCompensator
+
+SAMPLE_RATE = 22050
+
+
+def _write_delayed_recording(path, calibrator, delay_samples, lead_samples=0, noise=0.05):
+    """클릭 트레인을 delay_samples만큼 늦추고 반사음과 잡음을 섞은 녹음 WAV 생성
+    
+    lead_samples: 녹음 시작부터 재생 시작까지의 샘플 수 (WavCapture의 start_offset에 해당)
+    """
+    train, _ = latency_calibration.make_click_train(SAMPLE_RATE, calibrator.clicks, calibrator.period)
+    start = lead_samples + delay_samples
+    echo = int(0.013 * SAMPLE_RATE)
+    captured = np.zeros(start + len(train) + echo + SAMPLE_RATE // 2, dtype=np.float32)
+    captured[start:start + len(train)] += 0.5 * train
+    captured[start + echo:start + echo + len(train)] += 0.2 * train  # 벽 반사음
+    captured += noise * np.random.default_rng(1).standard_normal(len(captured)).astype(np.float32)
+    write_wav(str(path), captured, SAMPLE_RATE)
+
+
+@pytest.mark.parametrize("delay_ms", [0.0, 12.5, 45.0, 180.0, 420.0])
+def test_loopback_estimate_through_wav_capture(tmp_path, delay_ms):
+    calibrator = LatencyCalibrator(clock=VirtualClock(), sample_rate=SAMPLE_RATE)
+    delay_samples = int(round(delay_ms / 1000.0 * SAMPLE_RATE))
+    path = tmp_path / "capture.wav"
+    _write_delayed_recording(path, calibrator, delay_samples)
+    
+    result = calibrator.measure_audio(WavCapture(str(path)), play_audio=False)
+    
+    actual = delay_samples / SAMPLE_RATE
+    assert abs(result['latency'] - actual) < 0.0001
+    assert result['confidence'] >= 5.0
+    assert result['source'] == "wav"
+
+
+def test_loopback_estimate_subtracts_capture_start_offset(tmp_path):
+    calibrator = LatencyCalibrator(clock=VirtualClock(), sample_rate=SAMPLE_RATE)
+    delay_samples = int(round(0.045 * SAMPLE_RATE))
+    lead_samples = int(round(0.1 * SAMPLE_RATE))
+    path = tmp_path / "capture.wav"
+    _write_delayed_recording(path, calibrator, delay_samples, lead_samples=lead_samples)
+    
+    result = calibrator.measure_audio(WavCapture(str(path), start_offset=lead_samples / SAMPLE_RATE),
+                                      play_audio=False)
+    
+    assert abs(result['latency'] - delay_samples / SAMPLE_RATE) < 0.0001
+
+
+def test_store_round_trip(tmp_path):
+    path = tmp_path / "settings" / "latency_calibration.json"
+    store = CalibrationStore(str(path))
+    assert store.get("host|speakers|1920x1080") is None
+    
+    entry = store.save("host|speakers|1920x1080", {'audio': 0.0451, 'display': 0.0167})
+    
+    assert entry['audio_ms'] == 45.1
+    assert entry['display_ms'] == 16.7
+    reloaded = CalibrationStore(str(path)).get("host|speakers|1920x1080")
+    assert reloaded == entry
+    assert not list(path.parent.glob(".tmp-*"))
+
+
+def test_store_keeps_unmeasured_outputs_and_other_devices(tmp_path):
+    store = CalibrationStore(str(tmp_path / "latency_calibration.json"))
+    store.save("host|speakers|1920x1080", {'audio': 0.040, 'display': 0.020})
+    store.save("host|headphones|1920x1080", {'audio': 0.120})
+    
+    store.save("host|speakers|1920x1080", {'display': 0.030})
+    
+    data = store.load()
+    assert data["host|speakers|1920x1080"]['audio_ms'] == 40.0
+    assert data["host|speakers|1920x1080"]['display_ms'] == 30.0
+    assert data["host|headphones|1920x1080"]['audio_ms'] == 120.0
+    assert 'display_ms' not in data["host|headphones|1920x1080"]
+
+
+def test_store_load_ignores_missing_or_corrupt_file(tmp_path):
+    path = tmp_path / "latency_calibration.json"
+    assert CalibrationStore(str(path)).load() == {}
+    
+    path.write_text("{not json", encoding='utf-8')
+    assert CalibrationStore(str(path)).load() == {}
+    
+    path.write_text(json.dumps([1, 2, 3]), encoding='utf-8')
+    assert CalibrationStore(str(path)).load() == {}
+
+
+def test_apply_saved_calibration_sets_device_offsets(tmp_path):
+    store = CalibrationStore(str(tmp_path / "latency_calibration.json"))
+    compensator = LatencyCompensator()
+    assert not apply_saved_calibration(compensator, store=store)
+    
+    store.save(latency_calibration.device_key(), {'audio': 0.045, 'display': 0.012})
+    
+    assert apply_saved_calibration(compensator, store=store)
+    assert compensator.device_offsets['audio'] == pytest.approx(0.045)
+    assert compensator.device_offsets['display'] == pytest.approx(0.012)
@@ -0,0 +1,110 @@
+"""
+템포 맵 검증
+닫힌 형태 비트 시각(고정, 선형, 지수, 반복)과 프로그램 표기 해석
+"""
+import math
+
+import pytest
+
+from tempo_map import ConstantSection, ExponentialRampSection, LinearRampSection, TempoMap, TempoMapError
+
+
+def test_constant_beat_time_has_no_drift_over_long_sessions():
+    tempo_map = TempoMap.constant_bpm(300)
+    
+    # 60시간 분량의 비트도 곱셈 한 번으로 계산되므로 누적 오차가 없음
+    assert tempo_map.beat_time(1_080_000) == pytest.approx(216_000.0, abs=1e-9)
+    assert tempo_map.beat_time(1) == pytest.approx(0.2, abs=1e-15)
+    assert tempo_map.beat_time(0) == 0.0
+
+
+def test_linear_ramp_hits_exact_beat_times():
+    tempo_map = TempoMap.from_spec("60->180@1m")
+    
+    assert isinstance(tempo_map.sections[0], LinearRampSection)
+    assert tempo_map.total_beats == pytest.approx(120.0, abs=1e-12)
+    assert tempo_map.beat_time(120) == pytest.approx(60.0, abs=1e-12)
+    # 60t + t^2 = 60 * 60 의 양의 근
+    assert tempo_map.beat_time(60) == pytest.approx((-60.0 + math.sqrt(3600.0 + 14400.0)) / 2.0, abs=1e-12)
+    assert tempo_map.bpm_at(30.0) == pytest.approx(120.0)
+
+
+def test_exponential_ramp_hits_exact_beat_times():
+    tempo_map = TempoMap.from_spec("60~>120@60s")
+    rate = math.log(2.0) / 60.0
+    
+    assert isinstance(tempo_map.sections[0], ExponentialRampSection)
+    assert tempo_map.total_beats == pytest.approx(1.0 / rate, abs=1e-9)
+    assert tempo_map.beat_time(tempo_map.total_beats) == pytest.approx(60.0, abs=1e-9)
+    assert tempo_map.beat_time(0.5 / rate) == pytest.approx(math.log(1.5) / rate, abs=1e-9)
+    assert tempo_map.bpm_at(30.0) == pytest.approx(60.0 * math.sqrt(2.0))
+
+
+def test_repeated_program_places_every_cycle_exactly():
+    tempo_map = TempoMap.from_spec("(60@30s, 120@30s)x3")
+    
+    assert len(tempo_map.sections) == 6
+    assert tempo_map.total_beats == pytest.approx(270.0)
+    for cycle in range(4):
+        assert tempo_map.beat_time(90 * cycle) == pytest.approx(60.0 * cycle, abs=1e-9)
+    assert tempo_map.beat_time(30) == pytest.approx(30.0, abs=1e-9)
+    assert tempo_map.interval_at_beat(30) == pytest.approx(0.5, abs=1e-12)
+
+
+def test_tempo_is_held_after_program_ends():
+    tempo_map = TempoMap.from_spec("60->180@1m")
+    
+    assert tempo_map.beat_time(150) == pytest.approx(70.0, abs=1e-9)
+    assert tempo_map.interval_at_beat(1000) == pytest.approx(1.0 / 3.0, abs=1e-12)
+    assert tempo_map.bpm_at(120.0) == 180.0
+
+
+def test_beat_times_increase_across_section_boundaries():
+    tempo_map = TempoMap.from_spec("60->180@20s, 180~>90@20s, (90@5s, 150@5s)x2")
+    
+    times = [tempo_map.beat_time(beat) for beat in range(int(tempo_map.total_beats) + 20)]
+    intervals = [later - earlier for earlier, later in zip(times, times[1:])]
+    assert min(intervals) > 0
+    assert min(intervals) >= tempo_map.min_interval() - 1e-12
+
+
+def test_parser_builds_section_types_and_units():
+    tempo_map = TempoMap.from_spec("60@1m, 60->120@30s, 120~>60@2m")
+    
+    assert [type(section) for section in tempo_map.sections] == [
+        ConstantSection, LinearRampSection, ExponentialRampSection
+    ]
+    assert [section.duration for section in tempo_map.sections] == [60.0, 30.0, 120.0]
+    assert tempo_map.total_duration == 210.0
+
+
+
+def test_describe_lists_every_section_for_the_sidecar():
+    tempo_map = TempoMap.from_spec("60->180@1m, 180~>90@30s")
+    
+    assert tempo_map.describe() == [
+        {'curve': 'linear', 'start_bpm': 60.0, 'end_bpm': 180.0, 'duration': 60.0},
+        {'curve': 'exponential', 'start_bpm': 180.0, 'end_bpm': 90.0, 'duration': 30.0},
+    ]
+    assert TempoMap.constant_bpm(90).describe() == [
+        {'curve': 'constant', 'start_bpm': 90.0, 'end_bpm': 90.0, 'duration': None}
+    ]
+
+@pytest.mark.parametrize("spec", [
+    "(60@1m)x0",
+    "(60@1m, 120@1m)x00",
+    "",
+    "60",
+    "60@0s",
+    "60->@1m",
+    "(60@1m",
+    "60@1m 120@1m",
+    "10000@1m",
+])
+def test_invalid_programs_are_rejected(spec):
+    with pytest.raises(TempoMapError):
+        TempoMap.from_spec(spec)
+
+
+def test_single_repeat_is_allowed():
+    assert len(TempoMap.from_spec("(60@1m)x1").sections) == 1
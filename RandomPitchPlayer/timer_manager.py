@@ -1,51 +1,78 @@
 """
 RandomPitchPlayer 타이머 관리자
-정확한 타이밍 제어를 담당하는 폴링 기반 타이머
+정확한 타이밍 제어를 담당하는 타이머 (정밀 대기+스핀 방식 / 폴링 방식)
 """
 import threading
-import time
 import queue
-from config import TIMER_SLEEP_MS, INTERVAL_UPDATE_FREQUENCY
+from collections import deque
+from clock_manager import get_clock, PreciseWaiter, begin_high_resolution, end_high_resolution
+from pitch_buffer import PitchLookaheadBuffer
+from tempo_map import TempoMap
+from timing_utils import TimingUtils
+from config import TIMER_SLEEP_MS, INTERVAL_UPDATE_FREQUENCY, TIMER_SCHEDULER_MODE, TIMER_JITTER_SAMPLES
 
 
 class TimerManager:
     """RandomPitchPlayer 타이밍 제어를 관리하는 클래스"""
     
-    def __init__(self, ui_queue, debug_manager, pitch_selector):
+    def __init__(self, ui_queue, debug_manager, pitch_selector, scheduler_mode=TIMER_SCHEDULER_MODE, clock=None,
+                 latency_compensator=None, audio_engine=None):
         self.ui_queue = ui_queue
         self.debug_manager = debug_manager
         self.pitch_selector = pitch_selector
+        self.scheduler_mode = scheduler_mode
+        self.clock = clock or get_clock()
+        self.latency_compensator = latency_compensator  # 출력 지연만큼 트리거를 앞당김 (선택)
+        self.audio_engine = audio_engine  # 선행 버퍼의 비트를 미리 넘겨 샘플 단위로 재생 (선택)
         
-        # 타이밍 관련 변수들
+        # 타이밍 관련 변수들 (모든 시각은 공유 시계 기준 단조 시간)
         self.is_running = False
         self.timer_thread = None
+        self.wake_event = threading.Event()  # 정지 또는 간격 변경 시 대기 중인 스레드를 깨움
         self.current_interval = 1.0
+        self.tempo_map = TempoMap.constant(self.current_interval)
         self.next_update_time = 0
         self.last_update_time = 0
         self.update_sequence = 0
+        
+        # 다음 비트들을 미리 계산해 두는 선행 버퍼 (마감 시각에는 인덱스 발행만 수행)
+        self.lookahead = PitchLookaheadBuffer(pitch_selector)
+        self.first_entry = None
+        
+        # 정밀 모드 스핀 구간 보정 (sleep 초과 지연의 지수 이동 평균)
+        self.waiter = PreciseWaiter(self.clock)
+        
+        # 지터 측정 (목표 시각 대비 실제 트리거 시각, 나노초)
+        self.trigger_lateness_ns = deque(maxlen=TIMER_JITTER_SAMPLES)
+        self.wakeup_count = 0
     
-    def start_timer(self, interval):
-        """타이머 시작"""
+    def start_timer(self, interval, tempo_map=None):
+        """타이머 시작 (tempo_map이 주어지면 간격 대신 템포 맵을 따름)"""
         if self.is_running:
             return False
-            
-        self.current_interval = interval
+        
+        self._set_tempo(interval, tempo_map)
         self.is_running = True
-        self.update_sequence = 0
-        self.last_update_time = time.time()
+        self.wake_event.clear()
+        self._reset_session_state()
         
         # 타이머 스레드 시작
-        self.timer_thread = threading.Thread(target=self._timer_worker, daemon=True)
+        if self.scheduler_mode == "polling":
+            worker = self._timer_worker
+        else:
+            worker = self._precise_timer_worker
+        self.timer_thread = threading.Thread(target=worker, daemon=True)
         self.timer_thread.start()
         
         if self.debug_manager.debug_mode:
-            print(f"[TIMER] RandomPitchPlayer 타이머 시작 - 간격: {interval:.3f}초")
+            print(f"[TIMER] RandomPitchPlayer 타이머 시작 - 간격: {interval:.3f}초, 방식: {self.scheduler_mode}")
         
         return True
     
     def stop_timer(self):
         """타이머 정지"""
         self.is_running = False
+        self.wake_event.set()
         
         # 스레드 종료 대기 (최대 1초)
         if self.timer_thread and self.timer_thread.is_alive():
@@ -54,54 +81,168 @@ class TimerManager:
         if self.debug_manager.debug_mode:
             print("[TIMER] RandomPitchPlayer 타이머 정지")
     
+    def run_until(self, end_time, interval=None, tempo_map=None):
+        """호출 스레드에서 동기적으로 end_time까지 타이머 실행 (가상 시계 시뮬레이션용)
+        
+        start_timer와 달리 첫 항목(sequence 0)도 ui_queue에 넣습니다.
+        """
+        if self.is_running:
+            return 0
+        
+        self._set_tempo(interval if interval is not None else self.current_interval, tempo_map)
+        self.is_running = True
+        self.wake_event.clear()
+        self._reset_session_state()
+        self.ui_queue.put(self.first_entry)
+        
+        try:
+            while self.is_running and self._next_trigger_time() <= end_time:
+                if not self._wait_for_next_beat():
+                    break
+                self._trigger_update(self.clock.now())
+            # 마지막 비트 이후 남은 시간 진행
+            if self.clock.is_virtual and self.is_running:
+                self.clock.advance_to(end_time)
+        finally:
+            self.is_running = False
+        
+        return self.update_sequence
+    
+    def _reset_session_state(self):
+        """세션 시작 시 시퀀스 및 측정값 초기화, 선행 버퍼 채우기"""
+        start_time = self.clock.now()
+        self.last_update_time = start_time
+        self.trigger_lateness_ns.clear()
+        self.wakeup_count = 0
+        self.waiter.reset_stats()
+        
+        # 첫 음정(sequence 0)은 시작 시각에 바로 표시되도록 미리 발행
+        self.lookahead.reset(start_time, self.tempo_map)
+        self.first_entry = self.lookahead.publish()
+        self.update_sequence = self.first_entry.sequence
+        self.next_update_time = self._next_trigger_time()
+        
+        first = self.first_entry
+        self._schedule_audio([(first.sequence, first.pitch, first.target_time)] + self.lookahead.upcoming_beats())
+    
+    def release_first_entry(self):
+        """시작 시 미리 발행한 첫 비트 항목을 풀에 반환 (소비자가 표시/처리를 마친 뒤 호출)"""
+        entry, self.first_entry = self.first_entry, None
+        if entry is not None:
+            entry.release()
+    
+    def _set_tempo(self, interval, tempo_map):
+        """시작 시 간격 및 템포 맵 설정"""
+        self.current_interval = interval
+        self.tempo_map = tempo_map if tempo_map is not None else TempoMap.constant(interval)
+    
     def update_interval(self, new_interval):
-        """실행 중 간격 업데이트"""
+        """실행 중 간격 업데이트 (템포 맵 실행 중이면 고정 간격으로 전환)"""
         if new_interval != self.current_interval:
+            self.update_tempo_map(TempoMap.constant(new_interval))
             self.current_interval = new_interval
             if self.debug_manager.debug_mode:
                 print(f"[TIMER] 간격 변경: {new_interval:.3f}초")
     
+    def update_tempo_map(self, tempo_map):
+        """실행 중 템포 맵 교체 (다음 비트부터 새 맵 기준으로 재계산)"""
+        self.tempo_map = tempo_map
+        # 발행 전 항목들의 목표 시각을 재계산하고 대기 중인 타이머 스레드를 깨움
+        self.lookahead.retime(tempo_map)
+        self.wake_event.set()
+        # 목표 시각이 바뀌었으므로 시작 전인 비트 전체를 다시 등록
+        self._schedule_audio(self.lookahead.upcoming_beats())
+    
+    def get_current_interval(self):
+        """현재 템포의 비트 간격 (템포 맵 램프 구간에서는 비트마다 달라짐)"""
+        return self.lookahead.current_interval()
+    
     def _timer_worker(self):
-        """별도 스레드에서 폴링 방식 타이밍 제어"""
-        # 첫 번째 업데이트 시간 설정
-        self.next_update_time = time.time() + self.current_interval
-        
+        """별도 스레드에서 폴링 방식 타이밍 제어 (비교용 기존 방식)"""
         while self.is_running:
-            current_time = time.time()
+            current_time = self.clock.now()
+            self.wakeup_count += 1
             
             # 설정된 간격이 지났는지 확인 (폴링)
-            if current_time >= self.next_update_time:
+            if current_time >= self._next_trigger_time():
                 self._trigger_update(current_time)
             
             # CPU 사용률 최적화를 위한 짧은 대기
-            time.sleep(TIMER_SLEEP_MS / 1000.0)
+            self.clock.sleep(TIMER_SLEEP_MS / 1000.0)
+    
+    def _precise_timer_worker(self):
+        """별도 스레드에서 정밀 타이밍 제어 (목표 직전까지 대기 후 짧은 스핀)"""
+        begin_high_resolution()
+        try:
+            while self.is_running:
+                if not self._wait_for_next_beat():
+                    break
+                self._trigger_update(self.clock.now())
+        finally:
+            end_high_resolution()
+    
+    def _wait_for_next_beat(self):
+        """선행 버퍼의 다음 목표 시각까지 대기 (간격 변경 시 재계산, 정지 시 False 반환)"""
+        while self.is_running:
+            self.next_update_time = self._next_trigger_time()
+            if self._wait_until(self.next_update_time):
+                # 대기 중 간격이 늘어났다면 새 목표 시각까지 다시 대기
+                if self._next_trigger_time() <= self.clock.now():
+                    return True
+            else:
+                self.wake_event.clear()
+        return False
+    
+    def _next_trigger_time(self):
+        """다음 비트의 트리거 시각 (목표 시각 - 지연 보상 오프셋)"""
+        target_time = self.lookahead.peek_time()
+        if self.latency_compensator is not None:
+            return target_time - self.latency_compensator.get_lead_time()
+        return target_time
+    
+    def _wait_until(self, deadline):
+        """목표 시각까지 대기 (정지/간격 변경으로 깨어나면 False 반환)"""
+        if not self.waiter.wait_until(deadline, self.wake_event):
+            return False
+        return self.is_running
     
     def _trigger_update(self, current_time):
-        """업데이트 트리거"""
-        self.update_sequence += 1
+        """업데이트 트리거 (미리 계산된 항목 발행 후, 마감 이후 시간에 버퍼 보충)"""
+        trigger_time = self.next_update_time
+        entry = self.lookahead.publish()
+        self.ui_queue.put(entry)
         
-        # 목표 출력 시간 (원래 예정된 시간)
-        target_output_time = self.next_update_time
-        
-        # 음정 선택 (중복 방지)
-        from config import SCALE_COLORS
-        selected_pitch = self.pitch_selector.get_next_pitch()
-        pitch_color = SCALE_COLORS[selected_pitch]
+        # 마감 시각 작업 완료 - 이하 측정 및 보충 작업
+        self.update_sequence = entry.sequence
+        self.trigger_lateness_ns.append(int((current_time - trigger_time) * 1e9))
         
         if self.debug_manager.debug_mode:
-            print(f"[TRIGGER] {selected_pitch} 음정 트리거 - 목표시간: {target_output_time:.3f}")
-        
-        # UI 업데이트를 큐에 추가
-        self.ui_queue.put({
-            'pitch': selected_pitch,
-            'color': pitch_color,
-            'target_time': target_output_time,
-            'sequence': self.update_sequence
-        })
+            print(f"[TRIGGER] {entry.pitch} 음정 트리거 - 목표시간: {entry.target_time:.3f}")
         
         # 간격값 업데이트 확인 (INTERVAL_UPDATE_FREQUENCY 초마다)
         if current_time - self.last_update_time > INTERVAL_UPDATE_FREQUENCY:
             self.last_update_time = current_time
         
-        # 다음 업데이트 시간 계산 (정확한 간격 유지)
-        self.next_update_time = target_output_time + self.current_interval
\ No newline at end of file
+        # 발행된 슬롯 보충 및 다음 업데이트 시간 갱신 (오디오 엔진에는 새로 채운 비트만 등록)
+        filled = self.lookahead.fill()
+        self.next_update_time = self._next_trigger_time()
+        self._schedule_audio(filled)
+    
+    def _schedule_audio(self, beats):
+        """오디오 엔진에 비트들을 미리 등록 (이미 등록된 비트는 시작 전이면 새 시각으로 교체)"""
+        if self.audio_engine is None:
+            return
+        for sequence, pitch, target_time in beats:
+            self.audio_engine.schedule_beat(sequence, pitch, target_time)
+    
+    def get_jitter_stats(self):
+        """트리거 지터 통계 반환 (밀리초 단위)"""
+        stats = TimingUtils.summarize_lateness(self.trigger_lateness_ns)
+        if stats is None:
+            return None
+        return {
+            'mode': self.scheduler_mode,
+            **stats,
+            'wakeups': self.wakeup_count + self.waiter.wakeup_count,
+            'spin_threshold_ms': self.waiter.spin_threshold * 1000.0
+        }
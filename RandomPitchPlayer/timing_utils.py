@@ -18,6 +18,15 @@ class TimingUtils:
         except (ValueError, ZeroDivisionError):
             return DEFAULT_INTERVAL
     
+    @staticmethod
+    def bpm_to_exact_interval(bpm):
+        """BPM을 반올림 없이 초 간격으로 변환 (타이밍 엔진용, 표시용은 bpm_to_interval)"""
+        try:
+            bpm = max(MIN_BPM, min(MAX_BPM, float(bpm)))
+            return 60.0 / bpm
+        except (ValueError, ZeroDivisionError):
+            return DEFAULT_INTERVAL
+    
     @staticmethod
     def interval_to_bpm(interval):
         """초 간격을 BPM으로 변환"""
@@ -28,6 +37,34 @@ class TimingUtils:
         except (ValueError, ZeroDivisionError):
             return DEFAULT_BPM
     
+    @staticmethod
+    def clamp_bpm(bpm):
+        """BPM을 허용 범위(MIN_BPM ~ MAX_BPM)로 제한"""
+        return max(MIN_BPM, min(MAX_BPM, bpm))
+    
+    @staticmethod
+    def clamp_interval(interval):
+        """초 간격을 허용 범위(MIN_INTERVAL ~ MAX_INTERVAL)로 제한"""
+        return max(MIN_INTERVAL, min(MAX_INTERVAL, interval))
+    
+    @staticmethod
+    def summarize_lateness(samples_ns):
+        """지연 샘플(나노초) 요약 통계 - 평균/표준편차/p99/최대 (밀리초 단위, 샘플이 없으면 None)"""
+        samples = sorted(samples_ns)
+        if not samples:
+            return None
+        
+        count = len(samples)
+        mean_ns = sum(samples) / count
+        variance = sum((s - mean_ns) ** 2 for s in samples) / count
+        return {
+            'count': count,
+            'mean_ms': mean_ns / 1e6,
+            'std_ms': (variance ** 0.5) / 1e6,
+            'max_ms': samples[-1] / 1e6,
+            'p99_ms': samples[min(count - 1, int(count * 0.99))] / 1e6
+        }
+    
     @staticmethod
     def validate_bpm(bpm_value):
         """BPM 값 유효성 검사"""
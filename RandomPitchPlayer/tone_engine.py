@@ -0,0 +1,203 @@
+"""
+RandomPitchPlayer 음 합성 엔진
+PITCH_FREQUENCIES 표의 주파수로 음정 소리를 NumPy 벡터 연산으로 합성하여 재생
+
+음색(배음 구성) × ADSR 엔벨로프로 한 번에 버퍼를 만들고 (음정, 길이, 음색, 샘플레이트)별로
+pygame.mixer.Sound를 캐시하므로, 비트마다 하는 일은 캐시된 버퍼를 mixer에 넘기는 것뿐입니다.
+음색을 바꾸면 캐시를 비우고 다음 재생 때 음정별로 다시 만듭니다.
+"""
+from config import (SCALES, PITCH_FREQUENCIES, TONE_ENABLED, TONE_TIMBRE, TONE_DURATION, TONE_VOLUME,
+                    TONE_ADSR, ENABLE_CONSOLE_LOGS, RELEASE_MODE)
+
+# NumPy/pygame 임포트 (없으면 음 재생만 비활성화)
+try:
+    import numpy as np
+    _numpy_available = True
+except ImportError:
+    _numpy_available = False
+
+try:
+    import pygame
+    _pygame_available = True
+except ImportError:
+    _pygame_available = False
+
+
+# 음색별 배음 구성 ((배수, 상대 진폭), ...)
+TIMBRES = {
+    "sine": ((1, 1.0),),
+    "organ": ((1, 1.0), (2, 0.5), (3, 0.25), (4, 0.12)),
+    "clarinet": ((1, 1.0), (3, 0.4), (5, 0.2), (7, 0.1)),  # 홀수 배음
+    "bright": ((1, 1.0), (2, 0.7), (3, 0.5), (4, 0.35), (5, 0.25), (6, 0.15)),
+}
+
+DEFAULT_SAMPLE_RATE = 22050
+
+
+def render_tone(frequency, duration, timbre="sine", sample_rate=DEFAULT_SAMPLE_RATE, adsr=TONE_ADSR):
+    """음 하나를 float32 모노 버퍼(-1.0 ~ 1.0)로 합성 (배음 합 × ADSR, 시작/끝이 0이라 클릭 없음)"""
+    count = max(1, int(round(duration * sample_rate)))
+    t = np.arange(count, dtype=np.float64) / sample_rate
+    
+    # 나이퀴스트 주파수를 넘는 배음은 제외 (앨리어싱 방지)
+    partials = [(multiple, amplitude) for multiple, amplitude in TIMBRES[timbre]
+                if frequency * multiple < sample_rate / 2]
+    multiples = np.array([multiple for multiple, _ in partials], dtype=np.float64)
+    amplitudes = np.array([amplitude for _, amplitude in partials], dtype=np.float64)
+    
+    # (배음 수, 샘플 수) 행렬을 한 번에 계산한 뒤 진폭 가중합
+    waveform = amplitudes @ np.sin(2.0 * np.pi * frequency * np.outer(multiples, t))
+    waveform /= amplitudes.sum()
+    
+    return (waveform * adsr_envelope(count, sample_rate, adsr)).astype(np.float32)
+
+
+def adsr_envelope(count, sample_rate, adsr=TONE_ADSR):
+    """ADSR 엔벨로프 (attack, decay, sustain 레벨, release 초) - 버퍼가 짧으면 구간을 비례 축소"""
+    attack, decay, sustain, release = adsr
+    total = attack + decay + release
+    scale = min(1.0, (count / sample_rate) / total) if total > 0 else 1.0
+    attack_end = attack * scale * sample_rate
+    decay_end = attack_end + decay * scale * sample_rate
+    release_start = count - release * scale * sample_rate
+    
+    points = [0.0, attack_end, decay_end, max(decay_end, release_start), count - 1]
+    levels = [0.0, 1.0, sustain, sustain, 0.0]
+    return np.interp(np.arange(count), points, levels)
+
+
+class ToneEngine:
+    """음정별 합성 버퍼 캐시를 가진 음 재생 엔진"""
+    
+    def __init__(self, timbre=TONE_TIMBRE, duration=TONE_DURATION, volume=TONE_VOLUME):
+        self.available = _numpy_available and _pygame_available
+        self.enabled = TONE_ENABLED and self.available
+        self.timbre = timbre if timbre in TIMBRES else "sine"
+        self.duration = duration
+        self.volume = volume
+        self.sound_cache = {}  # (음정, 길이, 음색, 샘플레이트) → pygame.mixer.Sound
+        self.buffer_cache = {}  # (음정, 길이, 음색, 샘플레이트) → float32 모노 버퍼 (콜백 오디오 엔진용)
+        self.render_count = 0
+        
+        if not self.available and ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+            missing = "numpy" if not _numpy_available else "pygame"
+            print(f"[TONE] {missing} 라이브러리가 없어 음 재생을 사용할 수 없음")
+    
+    def set_enabled(self, enabled):
+        """음 재생 켜기/끄기 (라이브러리가 없으면 항상 꺼짐)"""
+        self.enabled = enabled and self.available
+        return self.enabled
+    
+    def set_timbre(self, timbre):
+        """음색 변경 (캐시는 비우고 다음 재생 때 음정별로 다시 합성)"""
+        if timbre not in TIMBRES or timbre == self.timbre:
+            return False
+        self.timbre = timbre
+        self.sound_cache.clear()
+        self.buffer_cache.clear()
+        if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+            print(f"[TONE] 음색 변경: {timbre} (캐시 재생성 대기)")
+        return True
+    
+    def set_duration(self, duration):
+        """음 길이 변경 (이전 길이의 버퍼는 캐시 키가 달라 자연히 다시 합성됨)"""
+        self.duration = duration
+    
+    def prepare(self, pitches=None, sample_rate=None):
+        """음정 버퍼를 미리 합성 (재생 시작 전에 호출하면 첫 비트에서 합성하지 않음)
+        
+        sample_rate가 주어지면 mixer Sound 대신 콜백 오디오 엔진용 버퍼를 준비합니다.
+        """
+        if not self.enabled:
+            return 0
+        for pitch in pitches or SCALES:
+            if sample_rate is None:
+                self.get_sound(pitch)
+            else:
+                self.get_buffer(pitch, sample_rate)
+        return len(self.sound_cache) if sample_rate is None else len(self.buffer_cache)
+    
+    def get_sound(self, pitch):
+        """캐시된 Sound 반환 (없으면 합성 후 캐시)"""
+        if not self._ensure_mixer():
+            return None
+        sample_rate, _, channels = pygame.mixer.get_init()
+        key = (pitch, self.duration, self.timbre, sample_rate)
+        sound = self.sound_cache.get(key)
+        if sound is None:
+            sound = self._build_sound(pitch, sample_rate, channels)
+            self.sound_cache[key] = sound
+        return sound
+    
+    def get_buffer(self, pitch, sample_rate):
+        """캐시된 float32 모노 버퍼 반환 (없으면 합성 후 캐시, 꺼져 있으면 None)"""
+        if not self.enabled or pitch not in PITCH_FREQUENCIES:
+            return None
+        key = (pitch, self.duration, self.timbre, sample_rate)
+        samples = self.buffer_cache.get(key)
+        if samples is None:
+            samples = render_tone(PITCH_FREQUENCIES[pitch], self.duration, self.timbre, sample_rate) * self.volume
+            self.buffer_cache[key] = samples
+            self.render_count += 1
+        return samples
+    
+    def play(self, pitch):
+        """음정 재생 (캐시된 버퍼를 mixer에 넘김, 재생했으면 True)"""
+        if not self.enabled or pitch not in PITCH_FREQUENCIES:
+            return False
+        try:
+            sound = self.get_sound(pitch)
+            if sound is None:
+                return False
+            sound.play()
+            return True
+        except Exception as e:
+            if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+                print(f"[TONE] {pitch} 음 재생 오류: {e}")
+            return False
+    
+    def _build_sound(self, pitch, sample_rate, channels):
+        """음정 버퍼 합성 후 mixer 형식(16비트, 채널 수)의 Sound로 변환"""
+        samples = render_tone(PITCH_FREQUENCIES[pitch], self.duration, self.timbre, sample_rate)
+        pcm = (samples * 32767).astype(np.int16)
+        if channels > 1:
+            pcm = np.repeat(pcm[:, np.newaxis], channels, axis=1)
+        sound = pygame.mixer.Sound(buffer=np.ascontiguousarray(pcm).tobytes())
+        sound.set_volume(self.volume)
+        
+        self.render_count += 1
+        if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+            print(f"[TONE] {pitch} 음 버퍼 합성 - {self.timbre}, {self.duration}초, {sample_rate}Hz")
+        return sound
+    
+    def _ensure_mixer(self):
+        """mixer가 초기화되어 있지 않으면 음성 안내와 같은 형식으로 초기화"""
+        if not self.available:
+            return False
+        if pygame.mixer.get_init() is None:
+            try:
+                pygame.mixer.pre_init(frequency=DEFAULT_SAMPLE_RATE, size=-16, channels=2, buffer=512)
+                pygame.mixer.init()
+            except Exception as e:
+                if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+                    print(f"[TONE] mixer 초기화 실패: {e}")
+                self.available = False
+                self.enabled = False
+                return False
+        return True
+    
+    def cleanup(self):
+        """캐시 정리"""
+        self.sound_cache.clear()
+        self.buffer_cache.clear()
+
+
+# 전역 음 합성 엔진 인스턴스
+_tone_engine_instance = None
+
+def get_tone_engine():
+    """음 합성 엔진 싱글톤 인스턴스 반환"""
+    global _tone_engine_instance
+    if _tone_engine_instance is None:
+        _tone_engine_instance = ToneEngine()
+    return _tone_engine_instance
@@ -1,39 +1,31 @@
 """
 RandomPitchPlayer TTS (Text-to-Speech) 관리자
-gTTS와 pygame을 사용한 음정 음성 안내 기능
+교체 가능한 음성 합성 엔진(gTTS/pyttsx3/내장 합성기)과 pygame을 사용한 음정 음성 안내 기능
 """
 import threading
 import time
-import tkinter as tk
 import queue
+import itertools
 import os
-import tempfile
 import io
+import json
 from config import *
+from clip_store import ClipStore
+import clip_processing
+import voice_pack
+from clock_manager import get_clock
+from speech_engines import create_engines
 
-# gTTS 및 pygame 라이브러리 임포트
-_tts_available = False
+# pygame 라이브러리 임포트 (음성 합성 엔진은 speech_engines에서 선택)
 _pygame_available = False
 
-try:
-    from gtts import gTTS
-    _tts_available = True
-    
-    if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
-        print("[TTS] gTTS 라이브러리 사용 가능")
-        
-except ImportError as e:
-    if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
-        print(f"[TTS] gTTS 라이브러리 임포트 실패: {e}")
-        print("[TTS] pip install gtts 로 설치하세요")
-
 try:
     import pygame
     _pygame_available = True
     
     if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
         print("[TTS] pygame 라이브러리 사용 가능")
-        
+
 except ImportError as e:
     if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
         print(f"[TTS] pygame 라이브러리 임포트 실패: {e}")
@@ -41,25 +33,69 @@ except ImportError as e:
 
 
 class TTSManager:
-    """RandomPitchPlayer TTS 기능을 관리하는 클래스 (gTTS + pygame 버전)"""
+    """RandomPitchPlayer TTS 기능을 관리하는 클래스 (음성 합성 엔진 + pygame 버전)"""
     
     def __init__(self, master=None):
         self.master = master  # tkinter 루트 위젯 참조
-        self.tts_enabled = TTS_ENABLED and _tts_available and _pygame_available
-        self.rate = TTS_RATE  # gTTS에서는 직접 사용하지 않지만 호환성 유지
+        self.clock = get_clock()  # 안내 기한(비트 목표 시각) 비교용
+        self.debug_manager = None  # 누락/중단 횟수를 전달할 디버그 매니저 (set_debug_manager로 연결)
+        
+        # 음성 합성 엔진 (시도 순서대로, 실패한 엔진은 목록에서 빠지고 다음 엔진 사용)
+        self.engines = create_engines()
+        self.engine = self.engines[0] if self.engines else None
+        self.engine_lock = threading.Lock()
+        self.engine_checked = False  # 현재 엔진의 온라인 확인 여부 (작업 스레드에서 한 번만)
+        
+        self.tts_enabled = TTS_ENABLED and _pygame_available and self.engine is not None
+        self.rate = TTS_RATE  # pyttsx3 엔진의 말하기 속도
         self.volume = TTS_VOLUME
         self.voice_index = TTS_VOICE_INDEX
         self.use_korean = TTS_LANGUAGE_KOREAN
         
-        # 오디오 캐시 (음정별로 미리 생성된 오디오 파일)
+        # 오디오 캐시 (음정 → 클립 저장소의 오디오 파일 경로)
         self.audio_cache = {}
-        self.temp_dir = None
+        self.clip_store = None
+        self.voice_pack = None  # 미리 디코딩해 둔 음성 팩 (있으면 클립 저장소/합성보다 먼저 사용)
+        
+        # 백그라운드 미리 생성 (우선순위 큐 + 제한된 작업 스레드, 음정별 준비 완료 이벤트)
+        self.clip_ready = {pitch: threading.Event() for pitch in SCALES}
+        self.pregen_queue = queue.PriorityQueue()
+        self.pregen_priorities = {}  # 음정 → 현재 우선순위 (낮을수록 먼저, 큐의 이전 항목은 꺼낼 때 무시)
+        self.pregen_counter = itertools.count()
+        self.pregen_lock = threading.Lock()
+        self.pregen_threads = []
         
         # pygame mixer 관련
         self.mixer_initialized = False
+        self.mixer_buffer_frames = 512  # mixer 출력 버퍼 크기 (프레임, 재생 시작 후 소리가 나기까지의 지연 추정에 사용)
+        self.sound_cache = {}  # 음정 → 메모리에 디코딩해 둔 pygame.mixer.Sound (PCM)
+        self.channels = []     # 음성 안내 전용 예약 채널
+        self.channel_index = 0
+        self.clip_lengths = {}  # 음정 → 디코딩한 클립 길이 (초)
+        self.clip_keys = {}     # 음정 → 클립 저장소 키 (시간 압축 버전 키의 기준, 무음 제거 시 제거본의 키)
+        self.clip_onsets = {}   # 음정 → 클립 시작부터 음성이 시작되기까지의 시간 (초, 재생 예약을 그만큼 앞당김)
         
-        # 큐 기반 TTS 처리
+        # 빠른 템포용 시간 압축 버전 (음정 → 속도순 (속도, 길이, Sound) 튜플, 재생 시에는 고르기만 함)
+        self.variants = {}
+        self.pack_entries = {}  # 음정 → 속도순 음성 팩 항목 (팩 클립의 Sound는 처음 선택될 때 생성)
+        self.target_interval = None  # 클립이 들어가야 하는 가장 짧은 비트 간격 (prepare_tempo로 설정)
+        self.variant_queue = queue.Queue()
+        self.variant_pending = set()  # 생성 대기 중인 (음정, 속도)
+        self.variant_lock = threading.Lock()
+        self.variant_thread = None
+        
+        # 재생 완료 대기 (클립 길이로 계산한 종료 시각까지 대기, stop_speech()와 새 안내 요청이 깨움)
+        self.playback_end_time = None
+        self.playing_pitch = None  # 마지막으로 재생을 시작한 음정 (끊긴 안내 기록용)
+        self.last_output_time = None  # 마지막 안내의 음성이 출력되는 예상 시각 (재생 시작 + mixer 버퍼 + 음성 시작 위치)
+        self.playback_interrupted = threading.Event()
+        
+        # 큐 기반 TTS 처리 (가장 최근 음정 요청 하나만 대기, 이전 요청은 버림)
         self.speech_queue = queue.Queue()
+        self.announce_lock = threading.Lock()
+        self.played_count = 0
+        self.dropped_count = 0    # 기한 초과 또는 더 새 요청에 밀려 말하지 않은 안내
+        self.preempted_count = 0  # 새 안내 때문에 도중에 끊은 안내
         self.is_speaking = False
         self.tts_thread = None
         self.stop_event = threading.Event()
@@ -71,6 +107,29 @@ class TTSManager:
         """tkinter 마스터 설정 (늦은 초기화용)"""
         self.master = master
     
+    def set_debug_manager(self, debug_manager):
+        """안내 재생/누락/중단 횟수를 기록할 디버그 매니저 연결"""
+        self.debug_manager = debug_manager
+    
+    def _record_announcement(self, outcome, pitch):
+        """안내 결과 기록 ('played', 'dropped', 'preempted')"""
+        if outcome == 'played':
+            self.played_count += 1
+        elif outcome == 'dropped':
+            self.dropped_count += 1
+        else:
+            self.preempted_count += 1
+        if self.debug_manager is not None:
+            self.debug_manager.record_announcement(outcome, pitch)
+    
+    def get_announcement_stats(self):
+        """안내 재생/누락/중단 횟수"""
+        return {
+            'played': self.played_count,
+            'dropped': self.dropped_count,
+            'preempted': self.preempted_count
+        }
+    
     def _initialize_tts(self):
         """TTS 시스템 초기화"""
         if not self.tts_enabled:
@@ -83,28 +142,38 @@ class TTSManager:
             if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                 print("[TTS] pygame mixer 초기화 시작")
             
-            pygame.mixer.pre_init(frequency=22050, size=-16, channels=2, buffer=512)
+            pygame.mixer.pre_init(frequency=22050, size=-16, channels=2, buffer=self.mixer_buffer_frames)
             pygame.mixer.init()
             self.mixer_initialized = True
             
             # 볼륨 설정
             pygame.mixer.music.set_volume(self.volume)
             
+            # 음성 안내 전용 채널 예약 (다른 효과음이 채널을 가져가지 않도록)
+            reserved = max(1, TTS_RESERVED_CHANNELS)
+            pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), reserved))
+            pygame.mixer.set_reserved(reserved)
+            self.channels = [pygame.mixer.Channel(index) for index in range(reserved)]
+            
             if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                 print(f"[TTS] pygame mixer 초기화 완료 - 볼륨: {self.volume}")
             
-            # 임시 디렉토리 생성
-            self.temp_dir = tempfile.mkdtemp(prefix="random_pitch_tts_")
+            # 실행 간에 유지되는 클립 저장소 (이미 생성된 클립은 다시 합성하지 않음)
+            self.clip_store = ClipStore()
             
             if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
-                print(f"[TTS] 임시 디렉토리 생성: {self.temp_dir}")
+                print(f"[TTS] 클립 저장소: {self.clip_store.root_dir}")
+            
+            # 번들된 음성 팩 (mixer 형식과 같을 때만 사용, 다르면 기존 합성 경로)
+            self.voice_pack = self._open_voice_pack()
             
-            # 음정별 오디오 파일 미리 생성
+            # 음정별 오디오 파일 미리 생성 (백그라운드, UI 시작을 막지 않음)
             self._pregenerate_audio_files()
             
             if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
-                print("[TTS] gTTS 초기화 완료")
-                
+                engine_names = " → ".join(engine.display_name for engine in self.engines)
+                print(f"[TTS] 음성 엔진 초기화 완료: {engine_names} (오디오 생성은 백그라운드에서 진행)")
+        
         except Exception as e:
             if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                 print(f"[TTS] TTS 초기화 실패: {e}")
@@ -114,52 +183,496 @@ class TTSManager:
             self.tts_enabled = False
     
     def _pregenerate_audio_files(self):
-        """모든 음정에 대한 오디오 파일 미리 생성"""
+        """모든 음정의 오디오 파일 생성을 백그라운드 작업 스레드에 맡김 (SCALES 순서가 기본 우선순위)"""
         if not self.tts_enabled:
             return
         
-        try:
+        # 음성 팩이나 저장소에 이미 있는 클립은 바로 준비 완료 (합성 없음)
+        missing = [pitch for pitch in SCALES if not self._load_pack_clip(pitch) and not self._load_cached_clip(pitch)]
+        if not missing:
+            if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+                source = "음성 팩" if self.voice_pack is not None else "저장소"
+                print(f"[TTS] {source}에서 {len(self.audio_cache)}개 음정 오디오 로드 (생성 불필요)")
+            return
+        
+        if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+            print(f"[TTS] 음정별 오디오 파일 생성 시작 - {len(missing)}개 (작업 스레드 {TTS_PREGEN_WORKERS}개)")
+        
+        for priority, pitch in enumerate(missing):
+            self._queue_pregen(pitch, priority)
+        
+        for _ in range(max(1, min(TTS_PREGEN_WORKERS, len(missing)))):
+            thread = threading.Thread(target=self._pregen_worker, daemon=True)
+            thread.start()
+            self.pregen_threads.append(thread)
+    
+    def _queue_pregen(self, pitch, priority):
+        """음정 생성 요청을 우선순위 큐에 추가 (이미 더 높은 우선순위로 대기 중이면 무시)"""
+        with self.pregen_lock:
+            current = self.pregen_priorities.get(pitch)
+            if current is not None and current <= priority:
+                return
+            self.pregen_priorities[pitch] = priority
+        self.pregen_queue.put((priority, next(self.pregen_counter), pitch))
+    
+    def prioritize(self, pitches):
+        """곧 필요한 음정 순서대로 생성 우선순위 올리기 (첫 번째 음정이 가장 먼저)"""
+        if not self.tts_enabled:
+            return
+        
+        # 기본 우선순위(0 이상)보다 항상 앞서도록 음수 우선순위 사용
+        base = -len(pitches) - 1
+        for index, pitch in enumerate(pitches):
+            if pitch in self.clip_ready and not self.clip_ready[pitch].is_set():
+                self._queue_pregen(pitch, base + index)
+    
+    def _pregen_worker(self):
+        """우선순위 큐에서 음정을 꺼내 오디오 파일 생성 (엔진이 지원하면 여러 음정을 한 번에 합성)"""
+        while not self.stop_event.is_set():
+            priority, _, pitch = self.pregen_queue.get()
+            if pitch is None:  # 종료 신호
+                break
+            if not self._claim_pregen(pitch, priority):
+                continue
+            
+            batch = [pitch] + self._drain_pregen_batch()
+            if not self._generate_clips(batch):
+                # 실패한 음정은 다음 prioritize() 요청 때 다시 시도
+                with self.pregen_lock:
+                    for failed_pitch in batch:
+                        if not self.clip_ready[failed_pitch].is_set():
+                            self.pregen_priorities.pop(failed_pitch, None)
+        
+        if ENABLE_CONSOLE_LOGS and not RELEASE_MODE and len(self.audio_cache) == len(SCALES):
+            print(f"[TTS] 총 {len(self.audio_cache)}개 음정 오디오 파일 생성 완료")
+    
+    def _claim_pregen(self, pitch, priority):
+        """큐에서 꺼낸 항목이 유효하면 생성 중으로 표시 (더 높은 우선순위로 다시 등록된 이전 항목은 무시)"""
+        with self.pregen_lock:
+            if self.pregen_priorities.get(pitch) != priority:
+                return False
+            self.pregen_priorities[pitch] = float('-inf')  # 생성 중 (재등록 방지)
+            return True
+    
+    def _drain_pregen_batch(self):
+        """현재 엔진의 일괄 합성 크기만큼 대기 중인 음정을 우선순위 순서대로 추가로 꺼냄"""
+        engine = self.engine
+        extra = []
+        while engine is not None and len(extra) + 1 < engine.batch_size:
+            try:
+                priority, counter, pitch = self.pregen_queue.get_nowait()
+            except queue.Empty:
+                break
+            if pitch is None:
+                self.pregen_queue.put((priority, counter, pitch))  # 종료 신호는 되돌려 놓음
+                break
+            if self._claim_pregen(pitch, priority):
+                extra.append(pitch)
+        return extra
+    
+    def _current_engine(self):
+        """합성에 사용할 엔진 반환 (네트워크 엔진은 처음 사용할 때 작업 스레드에서 연결 확인)"""
+        with self.engine_lock:
+            while self.engine is not None and not self.engine_checked:
+                if self.engine.check_online():
+                    self.engine_checked = True
+                else:
+                    self._drop_engine_locked(self.engine)
+            return self.engine
+    
+    def _fallback_from(self, engine):
+        """실패한 엔진을 빼고 다음 엔진으로 전환 (다음 엔진이 있으면 True)"""
+        with self.engine_lock:
+            if engine is self.engine:
+                self._drop_engine_locked(engine)
+            return self.engine is not None
+    
+    def _drop_engine_locked(self, engine):
+        """엔진 목록에서 제거하고 다음 엔진 선택 (잠금 보유 상태에서 호출)"""
+        if engine in self.engines:
+            self.engines.remove(engine)
+        self.engine = self.engines[0] if self.engines else None
+        self.engine_checked = False
+        if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+            next_name = self.engine.display_name if self.engine else "없음"
+            print(f"[TTS] {engine.display_name} 엔진 사용 불가 - 다음 엔진으로 전환: {next_name}")
+    
+    def _clip_request(self, pitch, engine):
+        """음정의 (텍스트, 언어, 클립 키) 반환 (키에 엔진 이름/버전/형식 포함)"""
+        lang = 'ko' if self.use_korean else 'en'
+        if self.use_korean:
+            text = TTS_PITCH_TEXTS.get(pitch, pitch)
+        else:
+            text = TTS_PITCH_TEXTS_EN.get(pitch, pitch)
+        key = ClipStore.make_key(text, lang, engine.name, engine.version, engine.audio_format)
+        return text, lang, key
+    
+    def _load_cached_clip(self, pitch):
+        """클립 저장소에 있는 음정 오디오를 캐시에 등록 (있으면 True, 엔진 우선순위 순서로 확인)"""
+        for engine in list(self.engines):
+            _, _, key = self._clip_request(pitch, engine)
+            audio_path = self.clip_store.get(key, engine.audio_format)
+            if audio_path is not None:
+                self._register_clip(pitch, audio_path, key)
+                return True
+        return False
+    
+    def _open_voice_pack(self):
+        """기본 음성 팩 열기 (현재 언어가 없거나 mixer 형식과 다르면 None)"""
+        pack = voice_pack.open_default_pack()
+        if pack is None:
+            return None
+        language = 'ko' if self.use_korean else 'en'
+        sample_rate, _, channels = pygame.mixer.get_init()
+        if language not in pack.languages() or (pack.sample_rate, pack.channels) != (sample_rate, channels):
+            if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+                print(f"[TTS] 음성 팩 사용 안 함 - 언어 {pack.languages()}, "
+                      f"{pack.sample_rate}Hz/{pack.channels}채널 (필요: {language}, {sample_rate}Hz/{channels}채널)")
+            pack.close()
+            return None
+        if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+            print(f"[TTS] 음성 팩 사용: {pack.path} (클립 {len(pack.entries)}개)")
+        return pack
+    
+    def _load_pack_clip(self, pitch):
+        """음성 팩의 클립을 색인만으로 등록 (디코딩/무음 제거/시간 압축 없이 모든 속도 버전 준비, 있으면 True)
+        
+        PCM은 읽지 않으며, 각 버전의 Sound는 재생할 버전으로 처음 선택될 때 만듭니다.
+        """
+        if self.voice_pack is None:
+            return False
+        entries = self.voice_pack.find(pitch, 'ko' if self.use_korean else 'en')
+        if not entries or entries[0].speed != 1.0:
+            return False
+        
+        # 팩 클립은 저장소 키가 없으므로 시간 압축 버전을 따로 만들지 않음 (팩에 이미 들어 있음)
+        self.pack_entries[pitch] = tuple(entries)
+        self.clip_lengths[pitch] = self.voice_pack.duration(entries[0])
+        self.clip_onsets[pitch] = entries[0].onset
+        self.variants[pitch] = tuple((entry.speed, self.voice_pack.duration(entry), None) for entry in entries)
+        self.audio_cache[pitch] = None  # 파일 재생 대체 경로 없음 (재생 가능 여부 표시용)
+        self.clip_ready[pitch].set()
+        return True
+    
+    def _load_pack_sound(self, pitch, variant):
+        """음성 팩 버전의 Sound 생성 후 재생 후보 교체 (pygame이 PCM을 자체 버퍼로 복사하므로 버전마다 한 번만)"""
+        speed, length, _ = variant
+        entry = next(entry for entry in self.pack_entries[pitch] if entry.speed == speed)
+        sound = pygame.mixer.Sound(buffer=self.voice_pack.view(entry))
+        sound.set_volume(self.volume)
+        variant = (speed, length, sound)
+        
+        # 재생 경로가 잠금 없이 읽도록 새 튜플로 교체
+        self.variants[pitch] = tuple(variant if item[0] == speed else item for item in self.variants[pitch])
+        return variant
+    
+    def _register_clip(self, pitch, audio_path, key):
+        """오디오 경로를 캐시에 등록하고 디코딩 후 준비 완료 알림 (빠른 템포면 시간 압축 버전 생성 예약)"""
+        self.audio_cache[pitch] = audio_path
+        self._decode_clip(pitch, audio_path, key)
+        self.clip_ready[pitch].set()
+        self._queue_variants(pitch)
+    
+    def _generate_clips(self, pitches):
+        """음정 목록의 오디오 파일을 한 번에 생성 (엔진이 실패하면 다음 엔진으로 재시도, 성공 시 True)"""
+        # 다른 인스턴스가 그 사이에 만들었을 수 있으므로 저장소 먼저 확인
+        pitches = [pitch for pitch in pitches if not self._load_cached_clip(pitch)]
+        if not pitches:
+            return True
+        
+        while True:
+            engine = self._current_engine()
+            if engine is None:
+                return False
+            
+            requests = [self._clip_request(pitch, engine) for pitch in pitches]
             if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
-                print("[TTS] 음정별 오디오 파일 생성 시작")
+                texts = ", ".join(f"'{text}'" for text, _, _ in requests)
+                print(f"[TTS] {engine.display_name}로 오디오 생성 중: {texts} (언어: {requests[0][1]})")
             
-            # 언어 설정
-            lang = 'ko' if self.use_korean else 'en'
+            try:
+                # 엔진으로 합성 후 저장소에 원자적으로 등록
+                audio_paths = self.clip_store.store_batch(
+                    [key for _, _, key in requests], engine.audio_format,
+                    lambda temp_paths: engine.synthesize_batch(
+                        [(text, lang, path) for (text, lang, _), path in zip(requests, temp_paths)]))
+            except Exception as e:
+                if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+                    print(f"[TTS] {engine.display_name} 오디오 생성 실패: {e}")
+                if not self._fallback_from(engine):
+                    return False
+                continue
             
-            # 각 음정에 대해 오디오 파일 생성
-            for pitch in SCALES:
+            for pitch, audio_path, (_, _, key) in zip(pitches, audio_paths, requests):
+                self._register_clip(pitch, audio_path, key)
+                if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+                    print(f"[TTS] {pitch} 음정 오디오 생성 완료: {audio_path}")
+            return True
+    
+    def _decode_clip(self, pitch, audio_path, key):
+        """클립을 한 번만 디코딩하여 메모리(Sound)에 보관 (실패 시 파일 재생으로 대체)"""
+        if not self.mixer_initialized:
+            return False
+        try:
+            sound = pygame.mixer.Sound(audio_path)
+            self.clip_keys[pitch] = key
+            self.clip_onsets[pitch] = 0.0
+            if TTS_TRIM_ENABLED and clip_processing.is_available():
                 try:
-                    # 텍스트 가져오기
-                    if self.use_korean:
-                        text = TTS_PITCH_TEXTS.get(pitch, pitch)
-                    else:
-                        text = TTS_PITCH_TEXTS_EN.get(pitch, pitch)
-                    
-                    if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
-                        print(f"[TTS] {pitch} 음정 오디오 생성 중: '{text}' (언어: {lang})")
-                    
-                    # gTTS로 음성 생성
-                    tts = gTTS(text=text, lang=lang, slow=False)
-                    
-                    # 임시 파일에 저장
-                    audio_path = os.path.join(self.temp_dir, f"pitch_{pitch}.mp3")
-                    tts.save(audio_path)
-                    
-                    # 캐시에 저장
-                    self.audio_cache[pitch] = audio_path
-                    
-                    if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
-                        print(f"[TTS] {pitch} 음정 오디오 생성 완료: {audio_path}")
-                    
+                    sound = self._trim_clip(pitch, sound, key)
                 except Exception as e:
                     if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
-                        print(f"[TTS] {pitch} 음정 오디오 생성 실패: {e}")
+                        print(f"[TTS] {pitch} 클립 무음 제거 실패, 원본 사용: {e}")
+            sound.set_volume(self.volume)
+            self.clip_lengths[pitch] = sound.get_length()
+            self.sound_cache[pitch] = sound
+            self.variants[pitch] = ((1.0, self.clip_lengths[pitch], sound),)
+            return True
+        except Exception as e:
+            if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+                print(f"[TTS] {pitch} 클립 디코딩 실패, 파일 재생으로 대체: {e}")
+            return False
+    
+    def _trim_clip(self, pitch, sound, key):
+        """앞뒤 무음을 제거한 클립 반환 (제거본과 음성 시작 위치는 클립 저장소에 캐시)"""
+        sample_rate, _, channels = pygame.mixer.get_init()
+        trim_key = ClipStore.derive_key(key, "trim", TTS_TRIM_THRESHOLD_DB, TTS_TRIM_LEAD_MS,
+                                        TTS_TRIM_FADE_MS, sample_rate)
+        trimmed_path = self.clip_store.get(trim_key, "wav")
+        info_path = self.clip_store.get(trim_key, "json")
+        
+        if trimmed_path is not None and info_path is not None:
+            with open(info_path, 'r', encoding='utf-8') as f:
+                onset = json.load(f)['onset']
+        else:
+            samples = clip_processing.pcm16_to_mono(sound.get_raw(), channels)
+            trimmed, onset = clip_processing.trim_silence(samples, sample_rate)
+            trimmed_path = self.clip_store.store(
+                trim_key, "wav", lambda temp_path: clip_processing.write_wav(temp_path, trimmed, sample_rate))
+            info = {'onset': onset, 'source_length': len(samples) / sample_rate}
+            self.clip_store.store_bytes(trim_key, "json", json.dumps(info).encode('utf-8'))
             
             if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
-                print(f"[TTS] 총 {len(self.audio_cache)}개 음정 오디오 파일 생성 완료")
-                
-        except Exception as e:
+                print(f"[TTS] {pitch} 클립 무음 제거: {len(samples) / sample_rate:.3f}s → "
+                      f"{len(trimmed) / sample_rate:.3f}s (음성 시작 {onset * 1000:.0f}ms)")
+        
+        trimmed_sound = pygame.mixer.Sound(trimmed_path)
+        self.clip_keys[pitch] = trim_key
+        self.clip_onsets[pitch] = onset
+        return trimmed_sound
+    
+    def get_onset_offset(self, pitch):
+        """클립 시작부터 음성이 들리기까지의 시간 (초) - 이만큼 일찍 재생하면 음성 시작이 비트에 맞음"""
+        return self.clip_onsets.get(pitch, 0.0)
+    
+    def _play_clip(self, pitch, deadline=None):
+        """음정 클립 재생 시작 (메모리의 Sound 우선, 없으면 파일 재생), 시작했으면 True
+        
+        deadline(다음 비트 시각)이 주어지면 남은 시간 안에 끝나는 가장 느린 시간 압축 버전을 고릅니다.
+        """
+        # 이전 안내가 아직 재생 중이면 새 음정이 우선 (이전 안내는 짧게 페이드아웃)
+        self._preempt_playback()
+        self.playback_interrupted.clear()
+        variant = self._select_variant(pitch, deadline)
+        if variant is not None and self.channels:
+            speed, length, sound = variant
+            # 예약 채널을 번갈아 사용: 페이드아웃 중인 이전 채널과 겹쳐 끊김 잡음 방지
+            self.channel_index = (self.channel_index + 1) % len(self.channels)
+            channel = self.channels[self.channel_index]
+            channel.play(sound)
+            self.playback_end_time = time.perf_counter() + length
+            self.last_output_time = (self.clock.now() + self.get_mixer_latency()
+                                     + self.clip_onsets.get(pitch, 0.0) / speed)
+            self.playing_pitch = pitch
+            return True
+        
+        audio_path = self.audio_cache.get(pitch)
+        if audio_path is not None and os.path.exists(audio_path):
+            self._play_music_file(audio_path)
+            self.playback_end_time = None  # 파일 재생은 길이를 미리 알 수 없음
+            self.last_output_time = self.clock.now() + self.get_mixer_latency()  # 원본 파일의 음성 시작 위치는 모름
+            self.playing_pitch = pitch
+            return True
+        
+        if ENABLE_CONSOLE_LOGS and not RELEASE_MODE and audio_path is not None:
+            print(f"[TTS] 오디오 파일이 존재하지 않음: {audio_path}")
+        return False
+    
+    def get_mixer_latency(self):
+        """재생 시작부터 mixer 버퍼를 지나 장치로 나가기까지의 지연 (초)
+        
+        장치/드라이버 자체 지연은 알 수 없으므로 포함하지 않습니다 (출력 지연 측정의 장치 오프셋이 담당).
+        """
+        if not self.mixer_initialized:
+            return 0.0
+        sample_rate = pygame.mixer.get_init()[0]
+        return self.mixer_buffer_frames / sample_rate
+    
+    def _select_variant(self, pitch, deadline):
+        """재생할 (속도, 길이, Sound) 선택 - 미리 만든 버전 중 남은 시간에 들어가는 가장 느린 것 (계산 없음)"""
+        variants = self.variants.get(pitch)
+        if not variants:
+            return None
+        variant = variants[-1]  # 아직 충분히 빠른 버전이 없으면 준비된 것 중 가장 빠른 것
+        if deadline is None:
+            variant = variants[0]
+        else:
+            limit = (deadline - self.clock.now()) * TTS_FIT_RATIO
+            for candidate in variants:
+                if candidate[1] <= limit:
+                    variant = candidate
+                    break
+        
+        # 음성 팩 클립은 처음 선택된 버전만 Sound로 만듦
+        if variant[2] is None:
+            variant = self._load_pack_sound(pitch, variant)
+        return variant
+    
+    def prepare_tempo(self, interval):
+        """가장 짧은 비트 간격에 맞춰 시간 압축 버전을 백그라운드에서 미리 생성 (재생 시작/템포 변경 시 호출)"""
+        if not self.tts_enabled or not clip_processing.is_available() or interval <= 0:
+            return
+        
+        self.target_interval = interval
+        for pitch in list(self.sound_cache):
+            self._queue_variants(pitch)
+    
+    def _queue_variants(self, pitch):
+        """목표 간격에 들어가는 속도 단계까지 아직 없는 버전의 생성을 예약"""
+        interval = self.target_interval
+        length = self.clip_lengths.get(pitch)
+        if interval is None or length is None or pitch not in self.clip_keys:
+            return
+        
+        needed = clip_processing.speed_bucket(length, interval, TTS_SPEED_BUCKETS, TTS_FIT_RATIO)
+        existing = {speed for speed, _, _ in self.variants.get(pitch, ())}
+        with self.variant_lock:
+            for speed in TTS_SPEED_BUCKETS:
+                if speed > needed:
+                    break
+                if speed == 1.0 or speed in existing or (pitch, speed) in self.variant_pending:
+                    continue
+                self.variant_pending.add((pitch, speed))
+                self.variant_queue.put((pitch, speed))
+            
+            if self.variant_pending and self.variant_thread is None:
+                self.variant_thread = threading.Thread(target=self._variant_worker, daemon=True)
+                self.variant_thread.start()
+    
+    def _variant_worker(self):
+        """시간 압축 버전 생성 스레드 (재생 경로와 분리)"""
+        while not self.stop_event.is_set():
+            request = self.variant_queue.get()
+            if request is None:  # 종료 신호
+                break
+            pitch, speed = request
+            try:
+                self._build_variant(pitch, speed)
+            except Exception as e:
+                if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+                    print(f"[TTS] {pitch} 음정 {speed}배 시간 압축 실패: {e}")
+            finally:
+                with self.variant_lock:
+                    self.variant_pending.discard((pitch, speed))
+    
+    def _build_variant(self, pitch, speed):
+        """음정 클립의 speed배 시간 압축 버전을 만들어 (또는 저장소에서 불러와) 재생 후보에 추가"""
+        sound = self.sound_cache.get(pitch)
+        if sound is None or not self.mixer_initialized:
+            return
+        
+        sample_rate, _, channels = pygame.mixer.get_init()
+        key = ClipStore.derive_key(self.clip_keys[pitch], "wsola", speed, TTS_WSOLA_FRAME_MS,
+                                   TTS_WSOLA_TOLERANCE_MS, sample_rate)
+        variant_path = self.clip_store.get(key, "wav")
+        if variant_path is None:
+            samples = clip_processing.pcm16_to_mono(sound.get_raw(), channels)
+            compressed = clip_processing.time_compress(samples, speed, sample_rate)
+            variant_path = self.clip_store.store(
+                key, "wav", lambda temp_path: clip_processing.write_wav(temp_path, compressed, sample_rate))
+        
+        variant_sound = pygame.mixer.Sound(variant_path)
+        variant_sound.set_volume(self.volume)
+        variant = (speed, variant_sound.get_length(), variant_sound)
+        
+        # 재생 경로가 잠금 없이 읽도록 새 튜플로 교체
+        self.variants[pitch] = tuple(sorted(self.variants.get(pitch, ()) + (variant,), key=lambda item: item[0]))
+        
+        if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+            print(f"[TTS] {pitch} 음정 {speed}배 시간 압축 버전 준비: {self.clip_lengths[pitch]:.3f}s → {variant[1]:.3f}s")
+    
+    def _preempt_playback(self):
+        """재생 중인 안내를 짧은 페이드아웃으로 끊음 (끊었으면 True)"""
+        if self.playing_pitch is None:
+            return False
+        end_time = self.playback_end_time
+        if end_time is not None:
+            still_playing = time.perf_counter() < end_time
+        else:
+            still_playing = pygame.mixer.music.get_busy()
+        if still_playing:
+            for channel in self.channels:
+                if channel.get_busy():
+                    channel.fadeout(TTS_CROSSFADE_MS)
+            if end_time is None:
+                pygame.mixer.music.fadeout(TTS_CROSSFADE_MS)
+            self._record_announcement('preempted', self.playing_pitch)
             if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
-                print(f"[TTS] 오디오 파일 생성 중 오류: {e}")
+                print(f"[TTS] 이전 안내 중단: {self.playing_pitch}")
+        
+        self.playing_pitch = None
+        self.playback_interrupted.set()
+        return still_playing
+    
+    def _play_music_file(self, audio_path):
+        """파일을 열어 디코딩하며 재생 (Sound 디코딩이 불가능한 경우의 대체 경로)"""
+        pygame.mixer.music.load(audio_path)
+        pygame.mixer.music.play()
+    
+    def get_clip_raw(self, pitch):
+        """디코딩해 둔 클립의 (16비트 인터리브 PCM 바이트, 샘플레이트, 채널 수) 반환 (없으면 None)
+        
+        음성 팩 클립은 Sound를 만들지 않고 mmap 위의 memoryview를 그대로 반환합니다 (복사 없음).
+        """
+        if not self.mixer_initialized:
+            return None
+        sample_rate, _, channels = pygame.mixer.get_init()
+        entries = self.pack_entries.get(pitch)
+        if entries is not None and self.voice_pack is not None:
+            return self.voice_pack.view(entries[0]), sample_rate, channels
+        sound = self.sound_cache.get(pitch)
+        if sound is None:
+            return None
+        return sound.get_raw(), sample_rate, channels
+    
+    def _wait_for_playback(self):
+        """재생이 끝날 때까지 대기 (클립 길이로 계산한 종료 시각까지 블로킹, stop_speech() 시 즉시 반환)"""
+        end_time = self.playback_end_time
+        if end_time is not None:
+            self.playback_interrupted.wait(max(0.0, end_time - time.perf_counter()))
+            return
+        
+        # 길이를 모르는 파일 재생(디코딩 실패 시 대체 경로)만 재생 상태를 짧은 간격으로 확인
+        while self._is_playing() and not self.playback_interrupted.wait(0.01):
+            pass
+    
+    def _is_playing(self):
+        """예약 채널 또는 music 스트림이 재생 중인지 확인"""
+        if any(channel.get_busy() for channel in self.channels):
+            return True
+        return pygame.mixer.music.get_busy()
+    
+    def is_clip_ready(self, pitch):
+        """음정 오디오 준비 완료 여부"""
+        event = self.clip_ready.get(pitch)
+        return event is not None and event.is_set()
+    
+    def wait_until_ready(self, pitch, timeout=None):
+        """음정 오디오가 준비될 때까지 대기 (준비되면 True)"""
+        event = self.clip_ready.get(pitch)
+        if event is None:
+            return False
+        return event.wait(timeout)
     
     def _start_tts_worker(self):
         """TTS 워커 스레드 시작"""
@@ -189,51 +702,54 @@ class TTSManager:
         # TTS 처리 루프
         while not self.stop_event.is_set():
             try:
-                # 큐에서 TTS 요청 대기 (타임아웃 0.5초)
-                speech_request = self.speech_queue.get(timeout=0.5)
+                # 큐에서 TTS 요청 대기 (요청 또는 종료 신호가 올 때까지 블로킹)
+                speech_request = self.speech_queue.get()
                 
                 if speech_request is None:  # 종료 신호
                     break
                 
-                pitch, text = speech_request
+                pitch, text, deadline = speech_request
+                
+                # 기한(다음 비트) 전에 시작할 수 없는 안내는 표시와 어긋나므로 말하지 않음
+                if deadline is not None and self.clock.now() > deadline:
+                    self._drop_announcement(pitch, "기한 초과")
+                    continue
+                
                 self.is_speaking = True
                 
                 if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                     print(f"[TTS] 음성 안내 시작: {pitch} -> '{text}'")
                 
-                # 캐시된 오디오 파일로 재생
+                # 캐시된 클립 재생
                 if pitch in self.audio_cache and self.mixer_initialized:
                     try:
-                        audio_path = self.audio_cache[pitch]
+                        # 꺼낸 뒤 더 새 요청이 들어왔으면 건너뜀 (확인과 재생 시작 사이에 새 요청이 끼지 않도록 잠금)
+                        with self.announce_lock:
+                            superseded = not self.speech_queue.empty()
+                            started = not superseded and self._play_clip(pitch, deadline)
                         
-                        if os.path.exists(audio_path):
-                            # pygame으로 오디오 재생
-                            pygame.mixer.music.load(audio_path)
-                            pygame.mixer.music.play()
-                            
-                            # 재생 완료까지 대기
-                            while pygame.mixer.music.get_busy():
-                                time.sleep(0.1)
+                        if superseded:
+                            self._record_announcement('dropped', pitch)
+                        elif started:
+                            self._record_announcement('played', pitch)
+                            # 재생 완료(또는 새 안내 요청)까지 대기
+                            self._wait_for_playback()
                             
                             if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                                 print(f"[TTS] 음성 안내 완료: {pitch} -> '{text}'")
-                        else:
-                            if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
-                                print(f"[TTS] 오디오 파일이 존재하지 않음: {audio_path}")
                     
                     except Exception as e:
                         if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                             print(f"[TTS] 음성 재생 오류: {e}")
                 
                 else:
+                    # 아직 생성되지 않았다면 다음 요청을 위해 우선 생성
+                    self.prioritize([pitch])
                     if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                         print(f"[TTS] {pitch} 음정의 캐시된 오디오가 없거나 mixer가 초기화되지 않음")
                 
                 self.is_speaking = False
-                
-            except queue.Empty:
-                # 타임아웃 - 계속 루프
-                continue
+            
             except Exception as e:
                 if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                     print(f"[TTS] 워커 스레드 오류: {e}")
@@ -242,8 +758,21 @@ class TTSManager:
         if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
             print("[TTS] TTS 워커 스레드 종료")
     
-    def speak_pitch_async(self, pitch):
-        """음정을 비동기적으로 음성 안내 (논블로킹)"""
+    def _drop_announcement(self, pitch, reason):
+        """시작하지 못한 안내를 누락으로 기록 (이전 안내가 아직 재생 중이면 함께 끊음)"""
+        self._record_announcement('dropped', pitch)
+        if self.mixer_initialized:
+            with self.announce_lock:
+                self._preempt_playback()
+        if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+            print(f"[TTS] 음성 안내 누락 ({reason}): {pitch}")
+    
+    def speak_pitch_async(self, pitch, deadline=None):
+        """음정을 비동기적으로 음성 안내 (논블로킹)
+        
+        deadline은 안내가 시작되어야 하는 마지막 시각(보통 다음 비트의 목표 시각)입니다.
+        대기 중인 이전 요청은 버리고 가장 최근 음정만 남기며, 재생 중인 이전 안내는 끊습니다.
+        """
         if not self.tts_enabled:
             return
         
@@ -254,28 +783,42 @@ class TTSManager:
             else:
                 text = TTS_PITCH_TEXTS_EN.get(pitch, pitch)
             
-            # 큐 크기 확인 (너무 많이 쌓이면 스킵)
-            if self.speech_queue.qsize() > 5:
+            with self.announce_lock:
+                # 아직 시작하지 못한 이전 요청은 버림 (최신 음정 우선)
+                while True:
+                    try:
+                        stale_request = self.speech_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if stale_request is None:  # 종료 신호는 되돌려 놓고 새 요청은 넣지 않음
+                        self.speech_queue.put(None)
+                        return
+                    self._record_announcement('dropped', stale_request[0])
+                    if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+                        print(f"[TTS] 대기 중인 안내 누락 (새 요청에 밀림): {stale_request[0]}")
+                
                 if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
-                    print(f"[TTS] 큐가 너무 많이 쌓임 (크기: {self.speech_queue.qsize()}), TTS 요청 스킵: {pitch}")
-                return
-            
-            if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
-                print(f"[TTS] 비동기 음성 안내 요청: {pitch} -> '{text}' (큐 크기: {self.speech_queue.qsize()})")
+                    print(f"[TTS] 비동기 음성 안내 요청: {pitch} -> '{text}'")
                 
-            # 큐에 TTS 요청 추가
-            self.speech_queue.put((pitch, text))
+                self.speech_queue.put((pitch, text, deadline))
                 
+                # 재생 완료를 기다리는 워커를 깨워 새 요청부터 처리 (이전 안내는 새 클립 재생 시 끊김)
+                if self.is_speaking:
+                    self.playback_interrupted.set()
+        
         except Exception as e:
             if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                 print(f"[TTS] 비동기 음성 안내 오류: {e}")
     
-    def speak_pitch_sync_main_thread(self, pitch):
-        """메인 스레드에서 동기적으로 음성 안내 (gTTS + pygame 버전)"""
+    def speak_pitch_sync_main_thread(self, pitch, deadline=None):
+        """메인 스레드에서 동기적으로 음성 안내 (미리 디코딩한 클립 재생, deadline이 지났으면 누락 처리)
+        
+        재생을 시작했으면 음성이 출력되는 예상 시각을, 아니면 None을 반환합니다.
+        """
         if not self.tts_enabled:
             if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                 print(f"[TTS] 메인 스레드 TTS 스킵 - enabled: {self.tts_enabled}")
-            return
+            return None
         
         try:
             # 음정에 해당하는 텍스트 가져오기
@@ -287,24 +830,24 @@ class TTSManager:
             if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                 print(f"[TTS] 메인 스레드 음성 안내 시작: {pitch} -> '{text}'")
             
-            # 캐시된 오디오 파일로 즉시 재생
+            # 다음 비트가 이미 지났으면 말하지 않음 (재생 중인 이전 안내도 끊음)
+            if deadline is not None and self.clock.now() > deadline:
+                self._drop_announcement(pitch, "기한 초과")
+                return None
+            
+            # 메모리에 디코딩해 둔 클립을 예약 채널에서 즉시 재생 (디스크 I/O, 디코딩 없음)
             if pitch in self.audio_cache and self.mixer_initialized:
-                audio_path = self.audio_cache[pitch]
-                
-                if os.path.exists(audio_path):
-                    # pygame으로 오디오 재생 (논블로킹)
-                    pygame.mixer.music.load(audio_path)
-                    pygame.mixer.music.play()
-                    
+                with self.announce_lock:
+                    started = self._play_clip(pitch, deadline)
+                if started:
+                    self._record_announcement('played', pitch)
                     if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                         print(f"[TTS] 메인 스레드 음성 안내 시작됨: {pitch}")
-                else:
-                    if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
-                        print(f"[TTS] 오디오 파일이 존재하지 않음: {audio_path}")
+                    return self.last_output_time
             else:
                 if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                     print(f"[TTS] {pitch} 음정의 캐시된 오디오가 없거나 mixer가 초기화되지 않음")
-                
+        
         except Exception as e:
             if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                 print(f"[TTS] 메인 스레드 음성 안내 오류: {e}")
@@ -328,9 +871,13 @@ class TTSManager:
                 except queue.Empty:
                     break
             
-            # pygame 음악 정지
+            # pygame 음악 정지 및 재생 완료 대기 중인 스레드 깨우기 (정지는 중단 횟수에 넣지 않음)
+            self.playing_pitch = None
+            self.playback_interrupted.set()
             if self.mixer_initialized:
                 try:
+                    for channel in self.channels:
+                        channel.stop()
                     pygame.mixer.music.stop()
                 except Exception as e:
                     if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
@@ -341,7 +888,7 @@ class TTSManager:
             
             if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                 print("[TTS] 음성 안내 정지 완료")
-                
+        
         except Exception as e:
             if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                 print(f"[TTS] 음성 정지 오류: {e}")
@@ -350,7 +897,7 @@ class TTSManager:
             self.is_speaking = False
     
     def speak_pitch_sync(self, pitch):
-        """음정을 동기적으로 음성 안내 (블로킹) - gTTS 버전"""
+        """음정을 동기적으로 음성 안내 (블로킹)"""
         if not self.tts_enabled:
             return
         
@@ -361,34 +908,24 @@ class TTSManager:
             else:
                 text = TTS_PITCH_TEXTS_EN.get(pitch, pitch)
             
-            # 캐시된 오디오 파일로 재생
+            # 캐시된 클립 재생 (블로킹)
             if pitch in self.audio_cache and self.mixer_initialized:
-                audio_path = self.audio_cache[pitch]
-                
-                if os.path.exists(audio_path):
-                    # pygame으로 오디오 재생 (블로킹)
-                    pygame.mixer.music.load(audio_path)
-                    pygame.mixer.music.play()
-                    
+                if self._play_clip(pitch):
                     # 재생 완료까지 대기
-                    while pygame.mixer.music.get_busy():
-                        time.sleep(0.1)
+                    self._wait_for_playback()
                     
                     if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                         print(f"[TTS] 동기 음성 안내: {pitch} -> '{text}'")
-                else:
-                    if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
-                        print(f"[TTS] 오디오 파일이 존재하지 않음: {audio_path}")
             else:
                 if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                     print(f"[TTS] {pitch} 음정의 캐시된 오디오가 없습니다")
-                
+        
         except Exception as e:
             if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                 print(f"[TTS] 동기 음성 안내 오류: {e}")
     
     def _has_korean_voice(self):
-        """한국어 음성 사용 가능 여부 확인 (gTTS는 항상 가능)"""
+        """한국어 음성 사용 가능 여부 확인 (모든 엔진이 한국어 텍스트 처리 가능)"""
         return True
     
     def is_currently_speaking(self):
@@ -399,7 +936,7 @@ class TTSManager:
         
         if self.mixer_initialized:
             try:
-                pygame_playing = pygame.mixer.music.get_busy()
+                pygame_playing = self._is_playing()
             except:
                 pass
         
@@ -411,21 +948,20 @@ class TTSManager:
     
     def get_tts_status_info(self):
         """TTS 상태 정보 반환"""
-        if not _tts_available:
-            return "TTS: gTTS 라이브러리 없음"
-        
         if not _pygame_available:
             return "TTS: pygame 라이브러리 없음"
         
+        if self.engine is None:
+            return "TTS: 사용 가능한 음성 엔진 없음"
+        
         if not self.tts_enabled:
             return "TTS: 비활성화"
         
+        lang_text = "한국어" if self.use_korean else "영어"
         if self.is_currently_speaking():
-            lang_text = "한국어" if self.use_korean else "영어"
-            return f"TTS: 음성 안내 중 (gTTS {lang_text})"
+            return f"TTS: 음성 안내 중 ({self.engine.display_name} {lang_text})"
         else:
-            lang_text = "한국어" if self.use_korean else "영어"
-            return f"TTS: 대기 중 (gTTS {lang_text})"
+            return f"TTS: 대기 중 ({self.engine.display_name} {lang_text})"
     
     def test_tts(self):
         """TTS 기능 테스트"""
@@ -440,13 +976,13 @@ class TTSManager:
             
             # 큐에 테스트 요청 추가
             test_text = "테스트" if self.use_korean else "Test"
-            self.speech_queue.put(("TEST", test_text))
+            self.speech_queue.put(("TEST", test_text, None))
             
             if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                 print("[TTS] TTS 테스트 요청 완료")
             
             return True
-            
+        
         except Exception as e:
             if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                 print(f"[TTS] TTS 테스트 실패: {e}")
@@ -459,32 +995,44 @@ class TTSManager:
             self.tts_enabled = False
             self.stop_speech()
             
-            # 워커 스레드 종료
+            # 워커 스레드 종료 (재생 완료 대기 중이면 깨움)
             if self.tts_thread and self.tts_thread.is_alive():
                 self.stop_event.set()
+                self.playback_interrupted.set()
                 self.speech_queue.put(None)  # 종료 신호
                 self.tts_thread.join(timeout=2.0)
             
+            # 미리 생성 작업 스레드 종료 (진행 중인 생성은 기다리지 않음)
+            self.stop_event.set()
+            for _ in self.pregen_threads:
+                self.pregen_queue.put((float('-inf'), next(self.pregen_counter), None))
+            self.pregen_threads = []
+            if self.variant_thread is not None:
+                self.variant_queue.put(None)
+                self.variant_thread = None
+            
             # pygame mixer 정리
             if self.mixer_initialized:
                 try:
+                    for channel in self.channels:
+                        channel.stop()
                     pygame.mixer.music.stop()
+                    self.channels = []
+                    self.sound_cache.clear()
+                    self.clip_lengths.clear()
+                    self.variants.clear()
+                    self.pack_entries.clear()
+                    self.clip_onsets.clear()
                     pygame.mixer.quit()
                     self.mixer_initialized = False
                 except Exception as mixer_error:
                     if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                         print(f"[TTS] pygame mixer 정리 중 오류 (무시됨): {mixer_error}")
             
-            # 임시 파일들 정리
-            if self.temp_dir and os.path.exists(self.temp_dir):
-                try:
-                    import shutil
-                    shutil.rmtree(self.temp_dir)
-                    if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
-                        print(f"[TTS] 임시 디렉토리 정리 완료: {self.temp_dir}")
-                except Exception as temp_error:
-                    if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
-                        print(f"[TTS] 임시 디렉토리 정리 오류 (무시됨): {temp_error}")
+            # 클립 저장소의 파일은 다음 실행을 위해 남겨 둠 (크기 상한은 저장소가 관리)
+            if self.voice_pack is not None:
+                self.voice_pack.close()
+                self.voice_pack = None
             
             # 모든 상태 리셋
             self.audio_cache.clear()
@@ -492,7 +1040,7 @@ class TTSManager:
             
             if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                 print("[TTS] TTS 리소스 정리 완료")
-                
+        
         except Exception as e:
             if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
                 print(f"[TTS] TTS 리소스 정리 오류 (무시됨): {e}")
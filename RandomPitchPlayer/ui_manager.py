@@ -4,21 +4,99 @@ tkinter UI 생성, 관리, 렌더링 담당
 """
 import tkinter as tk
 import tkinter.font as tkFont
-import time
 import queue
+import threading
 from config import *
 from timing_utils import TimingUtils
+from clock_manager import get_clock
+from tempo_settings import TempoSettingsModel
+from pitch_canvas import PitchGlyphCanvas
+
+
+class UIEventQueue(queue.Queue):
+    """항목이 들어오면 tkinter 메인 루프를 가상 이벤트로 직접 깨우는 UI 큐
+    
+    타이머 스레드의 put()은 알림 스레드를 깨우는 이벤트만 설정하고 바로 반환합니다.
+    event_generate는 알림 스레드가 호출하므로, 스레드 지원 Tcl이 호출을 메인 스레드로 넘기고
+    Tk 루프가 처리할 때까지 기다리는 동안(창 크기 조절, 긴 after 콜백, 모달 대화상자 등)에도
+    타이머 스레드는 멈추지 않습니다. 이미 알림이 대기 중이면 추가 이벤트를 만들지 않습니다.
+    """
+    
+    EVENT_NAME = "<<PitchBeatReady>>"
+    
+    def __init__(self, maxsize=0):
+        super().__init__(maxsize)
+        self.master = None
+        self._notify_pending = threading.Event()
+        self._wake = threading.Event()  # 알림 스레드 깨우기 (타이머 스레드는 설정만 함)
+        self._closed = False
+        self._notifier_thread = None
+    
+    def bind(self, master, handler):
+        """메인 루프 위젯과 이벤트 처리기 연결 후 알림 스레드 시작"""
+        self.master = master
+        master.bind(self.EVENT_NAME, lambda event: self._dispatch(handler))
+        if self._notifier_thread is None:
+            self._notifier_thread = threading.Thread(target=self._notifier_worker, daemon=True)
+            self._notifier_thread.start()
+    
+    def put(self, item, block=True, timeout=None):
+        super().put(item, block, timeout)
+        self._notify()
+    
+    def _notify(self):
+        """알림 스레드에 메인 루프 깨우기 요청 (대기 중인 알림이 있으면 생략, 블로킹 없음)"""
+        if self.master is None or self._notify_pending.is_set():
+            return
+        self._notify_pending.set()
+        self._wake.set()
+    
+    def _notifier_worker(self):
+        """알림 스레드: 요청이 있을 때마다 메인 루프에 가상 이벤트 전달 (Tk 대기는 이 스레드만 부담)"""
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if self._closed:
+                break
+            self._generate_event()
+    
+    def _generate_event(self):
+        """메인 루프에 가상 이벤트 전달 (알림 스레드에서 호출)"""
+        try:
+            # 다른 스레드에서 호출하면 tkinter가 메인 스레드로 전달 (스레드 지원 Tcl 필요)
+            self.master.event_generate(self.EVENT_NAME, when="tail")
+        except (tk.TclError, RuntimeError):
+            # 창이 이미 닫힌 경우 등
+            self._notify_pending.clear()
+    
+    def _dispatch(self, handler):
+        """알림 플래그를 먼저 해제한 뒤 처리기 호출 (처리 중 들어온 항목은 새 알림으로 처리)"""
+        self._notify_pending.clear()
+        handler()
+    
+    def request_drain(self):
+        """남은 항목 처리를 메인 루프 유휴 시점에 다시 요청"""
+        if self.master is not None and not self.empty():
+            self.master.after_idle(self._notify)
+    
+    def close(self):
+        """알림 스레드 종료 요청 (메인 스레드에서 기다리지 않음 - 알림 스레드가 Tk를 기다리는 중일 수 있음)"""
+        self._closed = True
+        self._wake.set()
 
 
 class UIManager:
     """RandomPitchPlayer UI 생성 및 관리를 담당하는 클래스"""
     
-    def __init__(self, master, debug_manager):
+    def __init__(self, master, debug_manager, clock=None):
         self.master = master
         self.debug_manager = debug_manager
+        self.clock = clock or get_clock()
         
         # UI 관련 변수들
         self.pitch_label = None  # scale_label -> pitch_label
+        self.pitch_canvas = None  # 캔버스 표시 방식에서 사용하는 음정 글리프 캔버스
+        self.next_pitch_label = None  # 다음 음정 미리보기 레이블
         self.debug_label = None
         self.remaining_time_label = None  # 남은 시간 표시 레이블 추가
         self.power_status_label = None  # 전원 상태 표시 레이블 추가
@@ -26,6 +104,7 @@ class UIManager:
         self.interval_entry = None
         self.bpm_entry = None
         self.duration_entry = None  # 지속 시간 입력 필드 추가
+        self.tempo_program_entry = None  # 템포 프로그램 입력 필드 (가속/감속 연습)
         self.mode_var = None  # 'seconds' 또는 'bpm'
         self.tempo_label = None
         self.start_button = None
@@ -41,6 +120,12 @@ class UIManager:
         # 렌더링 관련
         self.current_pitch_display_time = 0  # scale -> pitch
         
+        # 템포 설정 모델 (입력 변경 시에만 갱신, 비트 처리 경로는 스냅샷만 읽음)
+        if BPM_MODE_ENABLED:
+            self.tempo_settings = TempoSettingsModel("bpm", TimingUtils.bpm_to_exact_interval(DEFAULT_BPM), DEFAULT_BPM)
+        else:
+            self.tempo_settings = TempoSettingsModel("seconds", DEFAULT_INTERVAL, TimingUtils.interval_to_bpm(DEFAULT_INTERVAL))
+        
         self._setup_window()
         self._create_font()
         self._create_ui()
@@ -72,17 +157,23 @@ class UIManager:
     
     def _create_ui(self):
         """UI 요소들 생성"""
-        # 음정 표시 레이블
-        self.pitch_label = tk.Label(
-            self.master, 
-            text="준비", 
-            font=self.main_font, 
-            fg="black",
-            anchor="center",
-            justify="center",
-            wraplength=0
-        )
-        self.pitch_label.pack(pady=30, expand=True)
+        # 음정 표시 (캔버스 방식은 음정별 글리프를 미리 만들어 두고 표시만 전환)
+        if PITCH_DISPLAY_MODE == "canvas":
+            self.pitch_canvas = PitchGlyphCanvas(self.master, self.main_font.actual('family'), self.current_font_size)
+            self.pitch_canvas.pack(pady=30, expand=True, fill=tk.BOTH)
+            self.pitch_canvas.show_text("준비")
+        else:
+            self._create_pitch_label()
+
+        # 다음 음정 미리보기 레이블 (선택 사항)
+        if SHOW_NEXT_PITCH_PREVIEW:
+            self.next_pitch_label = tk.Label(
+                self.master,
+                text="",
+                font=("Arial", 24, "bold"),
+                fg="gray"
+            )
+            self.next_pitch_label.pack(pady=5)
 
         # 남은 시간 표시 레이블
         self.remaining_time_label = tk.Label(
@@ -112,6 +203,19 @@ class UIManager:
         # 컨트롤 패널
         self._create_control_panel()
     
+    def _create_pitch_label(self):
+        """레이블 방식 음정 표시 생성"""
+        self.pitch_label = tk.Label(
+            self.master, 
+            text="준비", 
+            font=self.main_font, 
+            fg="black",
+            anchor="center",
+            justify="center",
+            wraplength=0
+        )
+        self.pitch_label.pack(pady=30, expand=True)
+    
     def _create_control_panel(self):
         """컨트롤 패널 생성"""
         control_frame = tk.Frame(self.master)
@@ -175,6 +279,9 @@ class UIManager:
         self.interval_entry = tk.Entry(self.seconds_frame, font=("Arial", 12), width=10)
         self.interval_entry.insert(0, str(DEFAULT_INTERVAL))
         self.interval_entry.bind('<KeyRelease>', self._on_interval_change)
+        self.interval_entry.bind('<FocusOut>', self._commit_interval_entry)
+        self.interval_entry.bind('<Return>', self._commit_interval_entry)
+        self.entry_foreground = self.interval_entry.cget('fg')
         self.interval_entry.pack()
         
         # BPM 입력
@@ -183,6 +290,8 @@ class UIManager:
         self.bpm_entry = tk.Entry(self.bpm_frame, font=("Arial", 12), width=10)
         self.bpm_entry.insert(0, str(DEFAULT_BPM))
         self.bpm_entry.bind('<KeyRelease>', self._on_bpm_change)
+        self.bpm_entry.bind('<FocusOut>', self._commit_bpm_entry)
+        self.bpm_entry.bind('<Return>', self._commit_bpm_entry)
         self.bpm_entry.pack()
         
         # 두 번째 행: 지속 시간 설정
@@ -198,6 +307,14 @@ class UIManager:
         self.duration_entry.bind('<KeyRelease>', self._on_duration_change)
         self.duration_entry.pack()
         
+        # 템포 프로그램 입력 (비워두면 고정 템포)
+        program_frame = tk.Frame(duration_row)
+        program_frame.pack(pady=5)
+        tk.Label(program_frame, text="템포 프로그램 (예: 60->180@5m, 180@2m):", font=("Arial", 12)).pack()
+        self.tempo_program_entry = tk.Entry(program_frame, font=("Arial", 12), width=30)
+        self.tempo_program_entry.insert(0, TEMPO_PROGRAM)
+        self.tempo_program_entry.pack()
+        
         # 세 번째 행: TTS 설정
         tts_row = tk.Frame(input_frame)
         tts_row.pack(pady=5)
@@ -216,7 +333,31 @@ class UIManager:
             font=("Arial", 11),
             command=self._on_tts_toggle
         )
-        tts_checkbox.pack()
+        tts_checkbox.pack(side=tk.LEFT)
+        
+        # 음정 소리 체크박스 및 음색 선택
+        from tone_engine import get_tone_engine, TIMBRES
+        tone_engine = get_tone_engine()
+        
+        self.tone_enabled_var = tk.BooleanVar()
+        self.tone_enabled_var.set(tone_engine.enabled)
+        
+        tone_checkbox = tk.Checkbutton(
+            tts_frame,
+            text="음정 소리",
+            variable=self.tone_enabled_var,
+            font=("Arial", 11),
+            command=self._on_tone_toggle,
+            state=tk.NORMAL if tone_engine.available else tk.DISABLED
+        )
+        tone_checkbox.pack(side=tk.LEFT, padx=(10, 0))
+        
+        self.tone_timbre_var = tk.StringVar()
+        self.tone_timbre_var.set(tone_engine.timbre)
+        timbre_menu = tk.OptionMenu(tts_frame, self.tone_timbre_var, *TIMBRES.keys(),
+                                    command=self._on_timbre_change)
+        timbre_menu.config(font=("Arial", 10))
+        timbre_menu.pack(side=tk.LEFT)
 
         # 초기 모드에 따라 표시
         self._update_input_visibility()
@@ -253,6 +394,15 @@ class UIManager:
         )
         self.stop_button.pack(side=tk.LEFT, padx=5)
         
+        # 출력 지연 측정 창 열기 (정지 상태에서만 사용)
+        self.calibrate_button = tk.Button(
+            button_frame,
+            text="지연 측정",
+            font=("Arial", 12),
+            width=8
+        )
+        self.calibrate_button.pack(side=tk.LEFT, padx=5)
+        
         # 디버그 버튼 (릴리즈 모드에서는 생성하지 안음)
         if ENABLE_DEBUG_UI and not RELEASE_MODE:
             self.debug_button = tk.Button(
@@ -274,29 +424,66 @@ class UIManager:
         self._sync_values()
     
     def _on_interval_change(self, event=None):
-        """초 간격 변경 시 BPM 동기화"""
+        """초 간격 변경 시 BPM 동기화 및 템포 설정 반영 (범위 밖이면 제한한 값을 적용하고 입력란을 강조)"""
         if self.mode_var.get() == "seconds":
             try:
-                interval = float(self.interval_entry.get())
+                interval_text = self.interval_entry.get()
+                interval = float(interval_text)
                 bpm = TimingUtils.interval_to_bpm(interval)
                 self.bpm_entry.delete(0, tk.END)
                 self.bpm_entry.insert(0, str(bpm))
                 self._update_tempo_info(bpm)
+                self._mark_entry(self.interval_entry, TimingUtils.clamp_interval(interval) != interval)
+                self.tempo_settings.update_from_interval(interval_text)
             except ValueError:
                 pass
     
     def _on_bpm_change(self, event=None):
-        """BPM 변경 시 초 간격 동기화"""
+        """BPM 변경 시 초 간격 동기화 및 템포 설정 반영 (범위 밖이면 제한한 값을 적용하고 입력란을 강조)"""
         if self.mode_var.get() == "bpm":
             try:
-                bpm = float(self.bpm_entry.get())
-                interval = TimingUtils.bpm_to_interval(bpm)
+                bpm_text = self.bpm_entry.get()
+                bpm = float(bpm_text)
+                clamped = TimingUtils.clamp_bpm(bpm)
+                interval = TimingUtils.bpm_to_interval(clamped)
                 self.interval_entry.delete(0, tk.END)
                 self.interval_entry.insert(0, str(interval))
-                self._update_tempo_info(bpm)
+                self._update_tempo_info(clamped)
+                self._mark_entry(self.bpm_entry, clamped != bpm)
+                self.tempo_settings.update_from_bpm(bpm_text)
             except ValueError:
                 pass
     
+    def _mark_entry(self, entry, out_of_range):
+        """범위 밖 입력값 표시 (입력 중에는 값을 바꾸지 않고 글자색만 변경)"""
+        entry.config(fg="red" if out_of_range else self.entry_foreground)
+    
+    def _commit_interval_entry(self, event=None):
+        """입력을 마치면 초 간격 입력란에 실제 적용된 (범위 제한된) 값 기록"""
+        if self.mode_var.get() == "seconds":
+            self._write_back(self.interval_entry, self.tempo_settings.snapshot.interval)
+    
+    def _commit_bpm_entry(self, event=None):
+        """입력을 마치면 BPM 입력란에 실제 적용된 (범위 제한된) 값 기록"""
+        if self.mode_var.get() == "bpm":
+            self._write_back(self.bpm_entry, self.tempo_settings.snapshot.bpm)
+    
+    def _write_back(self, entry, value):
+        """입력란 값이 적용된 값과 다르면 교체 (숫자가 아닌 입력도 마지막 적용값으로 되돌림)"""
+        try:
+            matches = float(entry.get()) == value
+        except ValueError:
+            matches = False
+        if not matches:
+            entry.delete(0, tk.END)
+            entry.insert(0, f"{value:g}")
+        self._mark_entry(entry, False)
+    
+    def commit_tempo_entries(self):
+        """재생 시작 전 입력란을 실제 적용될 값으로 정리 (포커스를 잃지 않고 시작 버튼을 누른 경우)"""
+        self._commit_interval_entry()
+        self._commit_bpm_entry()
+    
     def _on_duration_change(self, event=None):
         """지속 시간 변경 시 처리"""
         try:
@@ -340,6 +527,17 @@ class UIManager:
             TTS_ENABLED = False
             self._update_tts_status()
     
+    def _on_tone_toggle(self):
+        """음정 소리 켜기/끄기"""
+        from tone_engine import get_tone_engine
+        enabled = get_tone_engine().set_enabled(self.tone_enabled_var.get())
+        self.tone_enabled_var.set(enabled)
+    
+    def _on_timbre_change(self, timbre):
+        """음색 변경 (버퍼는 다음 재생 때 다시 합성)"""
+        from tone_engine import get_tone_engine
+        get_tone_engine().set_timbre(timbre)
+    
     def _sync_values(self):
         """모드 변경 시 값 동기화"""
         if self.mode_var.get() == "bpm":
@@ -364,28 +562,33 @@ class UIManager:
         except:
             self.tempo_label.config(text="BPM 정보")
     
-    def set_button_commands(self, start_command, stop_command, debug_command=None):
+    def set_button_commands(self, start_command, stop_command, debug_command=None, calibrate_command=None):
         """버튼 명령어 설정"""
         self.start_button.config(command=start_command)
         self.stop_button.config(command=stop_command)
+        if calibrate_command:
+            self.calibrate_button.config(command=calibrate_command)
         # 디버그 버튼이 존재할 때만 명령어 설정
         if debug_command and self.debug_button and ENABLE_DEBUG_UI and not RELEASE_MODE:
             self.debug_button.config(command=debug_command)
     
+    def get_tempo_settings(self):
+        """현재 템포 설정 스냅샷 반환 (입력 위젯을 읽지 않음)"""
+        return self.tempo_settings.snapshot
+    
     def get_interval_value(self):
-        """간격 입력값 가져오기 (항상 초 단위로 반환)"""
-        try:
-            value = float(self.interval_entry.get())
-            return max(MIN_INTERVAL, min(MAX_INTERVAL, value))
-        except:
-            return DEFAULT_INTERVAL
+        """간격 값 가져오기 (항상 초 단위로 반환, BPM 모드는 반올림 없는 정확한 간격)"""
+        return self.tempo_settings.snapshot.interval
     
     def get_current_bpm(self):
         """현재 BPM 값 가져오기"""
-        try:
-            return float(self.bpm_entry.get())
-        except:
-            return DEFAULT_BPM
+        return self.tempo_settings.snapshot.bpm
+    
+    def get_tempo_program(self):
+        """템포 프로그램 입력값 가져오기 (빈 문자열 = 사용 안 함)"""
+        if self.tempo_program_entry is None:
+            return ""
+        return self.tempo_program_entry.get().strip()
     
     def get_current_mode(self):
         """현재 입력 모드 반환"""
@@ -464,13 +667,28 @@ class UIManager:
         """전원 상태 표시 업데이트 (외부 호출용)"""
         self._update_power_status()
     
-    def update_pitch_display(self, pitch_text, color):
-        """음정 화면 업데이트"""
+    def _show_pitch(self, pitch_text, color):
+        """음정 표시 위젯 갱신 (캔버스 방식은 미리 만든 글리프 전환만 수행)"""
+        if self.pitch_canvas is not None:
+            self.pitch_canvas.show_pitch(pitch_text, color)
+            return
         self.pitch_label.config(text=pitch_text, fg=color)
-        self.master.update_idletasks()  # 강제 렌더링 시도
+    
+    def update_pitch_display(self, pitch_text, color, next_pitch=None, on_rendered=None):
+        """음정 화면 업데이트 (next_pitch: 선행 버퍼에서 제공하는 다음 음정 미리보기)
+        
+        on_rendered(render_time): 레이블 다시 그리기가 끝난 직후 호출되는 콜백.
+        config()가 예약한 다시 그리기 작업 뒤에 after_idle로 예약하므로 폴링 없이 그리기 완료 시각을 얻습니다.
+        """
+        self._show_pitch(pitch_text, color)
+        if self.next_pitch_label is not None and next_pitch is not None:
+            self.next_pitch_label.config(text=f"다음: {next_pitch}", fg=SCALE_COLORS.get(next_pitch, "gray"))
+        if on_rendered is not None:
+            self.master.after_idle(lambda: on_rendered(self.clock.now()))
+        self.master.update_idletasks()  # 강제 렌더링 (예약된 다시 그리기와 완료 콜백을 순서대로 실행)
         
         # 실제 출력 시간 기록
-        actual_time = time.time()
+        actual_time = self.clock.now()
         self.current_pitch_display_time = actual_time
         return actual_time
     
@@ -483,14 +701,6 @@ class UIManager:
         bpm_info = f" | BPM: {self.get_current_bpm():.1f}"
         self.debug_label.config(text=debug_text + bpm_info)
     
-    def check_rendering_completion(self, expected_text):
-        """렌더링 완료 여부 확인"""
-        try:
-            current_displayed_text = self.pitch_label.cget('text')
-            return current_displayed_text == expected_text
-        except:
-            return False
-    
     def set_button_states(self, start_enabled, stop_enabled):
         """버튼 상태 설정"""
         start_state = tk.NORMAL if start_enabled else tk.DISABLED
@@ -498,9 +708,15 @@ class UIManager:
         
         self.start_button.config(state=start_state)
         self.stop_button.config(state=stop_state)
+        self.calibrate_button.config(state=start_state)  # 지연 측정은 정지 상태에서만
     
     def set_display_text(self, text, color="black"):
         """화면 텍스트 설정"""
+        if self.next_pitch_label is not None:
+            self.next_pitch_label.config(text="")
+        if self.pitch_canvas is not None:
+            self.pitch_canvas.show_text(text, color)
+            return
         self.pitch_label.config(text=text, fg=color)
     
     def _on_window_resize(self, event):
@@ -532,6 +748,8 @@ class UIManager:
             if abs(new_font_size - self.current_font_size) > FONT_SIZE_CHANGE_THRESHOLD:
                 self.current_font_size = new_font_size
                 self.main_font.configure(size=new_font_size)
+                if self.pitch_canvas is not None:
+                    self.pitch_canvas.rebuild(new_font_size)  # 유휴 시간에 글리프 캐시 재생성
         except:
             pass
 
@@ -0,0 +1,329 @@
+"""
+RandomPitchPlayer 음성 팩 (Voice Pack)
+음정 음성 클립을 미리 디코딩한 PCM으로 한 파일에 모아 두는 색인 아카이브
+
+파일 구조 (리틀 엔디안):
+- 헤더: 매직 "RPVP", 버전, 샘플 폭, 샘플레이트, 채널 수, 항목 수
+- 색인: 항목마다 (음정, 언어, 버전 이름, 데이터 오프셋, 데이터 길이, 재생 속도, 음성 시작 위치)
+- 데이터: 16비트 인터리브 PCM (항목마다 16바이트 경계 정렬, mixer 형식 그대로라 변환 없음)
+
+실행 시에는 파일을 mmap으로 열고 색인만 읽으며, 클립은 처음 사용할 때 memoryview로 잘라 씁니다
+(사용하지 않는 언어/속도의 데이터는 디스크에서 읽지도 않음). 콜백 오디오 엔진은 memoryview에서 바로
+변환하므로 복사가 없지만, pygame mixer로 재생하는 버전은 Sound를 만들 때 pygame이 PCM을 자체 버퍼로
+한 번 복사합니다 (TTSManager는 버전이 처음 선택될 때만 만듦). 팩은 오프라인에서 만들어
+EXE에 포함하므로 시작할 때 음성 합성/디코딩/무음 제거/시간 압축이 모두 필요 없습니다.
+
+사용법:
+    python voice_pack.py build                    (한국어 계이름 + 영어 음이름 팩 생성)
+    python voice_pack.py build --engine builtin   (오프라인 내장 합성기로 생성)
+    python voice_pack.py info voices.rpvp         (팩 내용 출력)
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from config import (SCALES, TTS_PITCH_TEXTS, TTS_PITCH_TEXTS_EN, TTS_SPEED_BUCKETS, TTS_TRIM_ENABLED,
+                    VOICE_PACK_ENABLED, VOICE_PACK_FILE, ENABLE_CONSOLE_LOGS, RELEASE_MODE)
+import clip_processing
+
+MAGIC = b"RPVP"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIHHI")      # 매직, 버전, 샘플 폭, 샘플레이트, 채널 수, 예약, 항목 수
+ENTRY = struct.Struct("<16s8s16sQQdd")   # 음정, 언어, 버전 이름, 오프셋, 길이, 재생 속도, 음성 시작 위치(초)
+DATA_ALIGN = 16
+
+BASE_VARIANT = "base"
+PACK_TEXTS = {'ko': TTS_PITCH_TEXTS, 'en': TTS_PITCH_TEXTS_EN}  # 팩에 넣는 언어별 안내 텍스트
+
+PackEntry = namedtuple('PackEntry', 'pitch language variant offset length speed onset')
+
+
+class VoicePackError(Exception):
+    """음성 팩 형식 오류 또는 생성 실패"""
+    pass
+
+
+def variant_name(speed):
+    """재생 속도의 버전 이름 (1.0 = 'base', 시간 압축본 = 'x1.5' 등)"""
+    return BASE_VARIANT if speed == 1.0 else f"x{speed:g}"
+
+
+def default_pack_path():
+    """기본 음성 팩 경로 (상대 경로는 프로그램 폴더 기준, EXE에서는 압축 해제 폴더 기준)"""
+    if os.path.isabs(VOICE_PACK_FILE):
+        return VOICE_PACK_FILE
+    base_dir = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_dir, VOICE_PACK_FILE)
+
+
+def open_default_pack():
+    """기본 음성 팩 열기 (꺼져 있거나 파일이 없거나 손상되었으면 None)"""
+    path = default_pack_path()
+    if not VOICE_PACK_ENABLED or not os.path.exists(path):
+        return None
+    try:
+        return VoicePack(path)
+    except (OSError, VoicePackError) as e:
+        if ENABLE_CONSOLE_LOGS and not RELEASE_MODE:
+            print(f"[VOICE] 음성 팩 열기 실패 ({path}): {e}")
+        return None
+
+
+def _pack_text(value, size):
+    encoded = value.encode('utf-8')
+    if len(encoded) > size:
+        raise VoicePackError(f"색인 필드가 너무 김 ({size}바이트 초과): {value}")
+    return encoded
+
+
+def _unpack_text(value):
+    return value.rstrip(b"\0").decode('utf-8')
+
+
+class VoicePack:
+    """mmap으로 연 음성 팩 (색인만 읽고 클립은 요청 시 복사 없이 memoryview로 반환)"""
+    
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # 빈 파일
+            self._file.close()
+            raise VoicePackError("빈 파일")
+        self._view = memoryview(self._map)
+        
+        try:
+            self._read_index()
+        except Exception:
+            self.close()
+            raise
+    
+    def _read_index(self):
+        """헤더와 색인 읽기 (데이터 영역은 건드리지 않음)"""
+        size = len(self._map)
+        if size < HEADER.size:
+            raise VoicePackError("헤더가 잘림")
+        magic, version, sample_width, self.sample_rate, self.channels, _, count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise VoicePackError("음성 팩 파일이 아님")
+        if version != VERSION:
+            raise VoicePackError(f"지원하지 않는 버전: {version}")
+        if sample_width != 2:
+            raise VoicePackError(f"지원하지 않는 샘플 폭: {sample_width}")
+        if HEADER.size + count * ENTRY.size > size:
+            raise VoicePackError("색인이 잘림")
+        
+        self.entries = {}  # (음정, 언어, 버전 이름) → PackEntry
+        for index in range(count):
+            fields = ENTRY.unpack_from(self._map, HEADER.size + index * ENTRY.size)
+            entry = PackEntry(_unpack_text(fields[0]), _unpack_text(fields[1]), _unpack_text(fields[2]),
+                              *fields[3:])
+            if entry.offset + entry.length > size:
+                raise VoicePackError(f"데이터 범위 초과: {entry.pitch}/{entry.language}/{entry.variant}")
+            self.entries[(entry.pitch, entry.language, entry.variant)] = entry
+    
+    @property
+    def frame_bytes(self):
+        return 2 * self.channels
+    
+    def languages(self):
+        """팩에 들어 있는 언어 목록"""
+        return sorted({language for _, language, _ in self.entries})
+    
+    def find(self, pitch, language):
+        """음정/언어의 모든 버전 (재생 속도순)"""
+        return sorted((entry for (entry_pitch, entry_language, _), entry in self.entries.items()
+                       if entry_pitch == pitch and entry_language == language), key=lambda entry: entry.speed)
+    
+    def view(self, entry):
+        """항목의 PCM 데이터 (mmap 위의 memoryview, 복사 없음)"""
+        return self._view[entry.offset:entry.offset + entry.length]
+    
+    def get(self, pitch, language, variant=BASE_VARIANT):
+        """PCM 데이터 memoryview (없으면 None)"""
+        entry = self.entries.get((pitch, language, variant))
+        return self.view(entry) if entry is not None else None
+    
+    def duration(self, entry):
+        """항목 길이 (초)"""
+        return entry.length / self.frame_bytes / self.sample_rate
+    
+    def close(self):
+        """mmap 닫기 (반환한 memoryview가 남아 있으면 그것들이 해제될 때까지 매핑 유지)"""
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass
+            self._map = None
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class VoicePackBuilder:
+    """음성 팩 작성기 (항목을 모은 뒤 임시 파일에 기록하고 원자적으로 교체)"""
+    
+    def __init__(self, sample_rate, channels):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.items = []  # (음정, 언어, 버전 이름, PCM 바이트, 재생 속도, 음성 시작 위치)
+    
+    def add(self, pitch, language, variant, pcm, speed=1.0, onset=0.0):
+        """16비트 인터리브 PCM 클립 추가"""
+        if len(pcm) % (2 * self.channels):
+            raise VoicePackError(f"PCM 길이가 프레임 크기의 배수가 아님: {pitch}/{language}/{variant}")
+        self.items.append((pitch, language, variant, bytes(pcm), speed, onset))
+    
+    def write(self, path):
+        """팩 파일 기록, 전체 크기(바이트) 반환"""
+        offset = HEADER.size + len(self.items) * ENTRY.size
+        index = []
+        for pitch, language, variant, pcm, speed, onset in self.items:
+            offset += -offset % DATA_ALIGN
+            index.append(ENTRY.pack(_pack_text(pitch, 16), _pack_text(language, 8), _pack_text(variant, 16),
+                                    offset, len(pcm), speed, onset))
+            offset += len(pcm)
+        
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".rpvp", dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, VERSION, 2, self.sample_rate, self.channels, 0, len(self.items)))
+                f.write(b"".join(index))
+                for _, _, _, pcm, _, _ in self.items:
+                    f.write(b"\0" * (-f.tell() % DATA_ALIGN))
+                    f.write(pcm)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except Exception:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        return offset
+
+
+def build_voice_pack(path, languages=tuple(PACK_TEXTS), engine_preference=None, speeds=TTS_SPEED_BUCKETS,
+                     sample_rate=22050, channels=2):
+    """음성 엔진으로 언어별 음정 클립을 합성해 팩 생성 (무음 제거/시간 압축 버전까지 미리 계산)
+    
+    형식은 TTSManager의 mixer 형식(22050Hz, 16비트, 스테레오)과 같아야 재생 시 변환이 없습니다.
+    """
+    if not clip_processing.is_available():
+        raise VoicePackError("음성 팩 생성에는 numpy 라이브러리가 필요합니다")
+    try:
+        import pygame
+    except ImportError:
+        raise VoicePackError("음성 팩 생성에는 pygame 라이브러리가 필요합니다 (합성 결과 디코딩)")
+    from speech_engines import create_engines
+    
+    if pygame.mixer.get_init() is None:
+        pygame.mixer.pre_init(frequency=sample_rate, size=-16, channels=channels)
+        pygame.mixer.init()
+    if pygame.mixer.get_init() != (sample_rate, -16, channels):
+        raise VoicePackError(f"mixer 형식이 다름: {pygame.mixer.get_init()}")
+    
+    engines = create_engines(engine_preference)
+    builder = VoicePackBuilder(sample_rate, channels)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for language in languages:
+            if language not in PACK_TEXTS:
+                raise VoicePackError(f"알 수 없는 언어: {language}")
+            clips, engine_name = _synthesize_language(pygame, engines, language, temp_dir, channels)
+            for pitch in SCALES:
+                samples, onset = clips[pitch], 0.0
+                if TTS_TRIM_ENABLED:
+                    samples, onset = clip_processing.trim_silence(samples, sample_rate)
+                for speed in speeds:
+                    clip = samples if speed == 1.0 else clip_processing.time_compress(samples, speed, sample_rate)
+                    builder.add(pitch, language, variant_name(speed), clip_processing.mono_to_pcm16(clip, channels),
+                                speed, onset / speed)
+            print(f"[VOICE] {language}: {engine_name}로 {len(SCALES)}개 음정 × {len(speeds)}개 속도 생성")
+    
+    size = builder.write(path)
+    print(f"[VOICE] 음성 팩 저장: {path} ({len(builder.items)}개 클립, {size / 1024:.0f}KB)")
+    return len(builder.items)
+
+
+def _synthesize_language(pygame, engines, language, temp_dir, channels):
+    """한 언어의 모든 음정을 합성 후 디코딩 (실패하면 다음 엔진), ({음정: 모노 버퍼}, 엔진 이름) 반환"""
+    texts = PACK_TEXTS[language]
+    for engine in engines:
+        if not engine.check_online():
+            continue
+        requests = [(texts.get(pitch, pitch), language,
+                     os.path.join(temp_dir, f"{language}-{engine.name}-{pitch}.{engine.audio_format}"))
+                    for pitch in SCALES]
+        try:
+            engine.synthesize_batch(requests)
+            clips = {pitch: clip_processing.pcm16_to_mono(pygame.mixer.Sound(path).get_raw(), channels)
+                     for pitch, (_, _, path) in zip(SCALES, requests)}
+        except Exception as e:
+            print(f"[VOICE] {engine.display_name} 합성 실패 ({language}): {e}")
+            continue
+        return clips, engine.display_name
+    raise VoicePackError(f"{language} 음성을 합성할 수 있는 엔진이 없음")
+
+
+def print_pack_info(path):
+    """팩 헤더/색인 요약 출력 (여는 데 걸린 시간 포함)"""
+    start = time.perf_counter()
+    with VoicePack(path) as pack:
+        elapsed = time.perf_counter() - start
+        print(f"[VOICE] {path}: {pack.sample_rate}Hz, {pack.channels}채널, 클립 {len(pack.entries)}개 "
+              f"(열기 {elapsed * 1000:.2f}ms)")
+        for language in pack.languages():
+            for pitch in SCALES:
+                variants = ", ".join(f"{entry.variant} {pack.duration(entry):.3f}s"
+                                     for entry in pack.find(pitch, language))
+                onset = pack.entries.get((pitch, language, BASE_VARIANT))
+                onset_ms = onset.onset * 1000 if onset is not None else 0.0
+                print(f"  {language} {pitch}: {variants} (음성 시작 {onset_ms:.0f}ms)")
+
+
+def main(argv=None):
+    """음성 팩 생성/확인 진입점"""
+    parser = argparse.ArgumentParser(description="RandomPitchPlayer 음성 팩 도구")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    build_parser = subparsers.add_parser("build", help="음성 팩 생성")
+    build_parser.add_argument("--output", default=default_pack_path(), help="출력 파일 (기본값: 프로그램 폴더의 팩)")
+    build_parser.add_argument("--languages", default=",".join(PACK_TEXTS), help="포함할 언어 (예: ko,en)")
+    build_parser.add_argument("--engine", help="음성 엔진 (auto, gtts, pyttsx3, builtin)")
+    
+    info_parser = subparsers.add_parser("info", help="음성 팩 내용 출력")
+    info_parser.add_argument("path", nargs="?", default=default_pack_path())
+    
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "build":
+            languages = tuple(language.strip() for language in args.languages.split(",") if language.strip())
+            build_voice_pack(args.output, languages, args.engine)
+        elif args.command == "info":
+            print_pack_info(args.path)
+        else:
+            parser.print_help()
+            return 1
+    except (OSError, VoicePackError) as e:
+        print(f"[VOICE] 오류: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())